@@ -0,0 +1 @@
+"""Micro-benchmarks for the matching and scoring hot paths (run with python -m)."""
@@ -0,0 +1,172 @@
+"""Load test: concurrent LLM-backed requests against one event loop and a local stub provider.
+
+Starts a stub that speaks the OpenAI chat-completions and Anthropic
+messages APIs with a fixed delay, points the clients at it, and fires
+concurrent requests at the FastAPI app in-process (a single worker).
+
+Usage: python -m server.benchmarks.async_llm_load [--requests 50] [--latency 0.5]
+"""
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def start_stub_provider(latency: float, completion: str = "Stub completion.",
+                        stream_chunks: int = 20) -> ThreadingHTTPServer:
+    """Serve fake OpenAI and Anthropic responses after `latency` seconds, one thread per request.
+
+    Requests with "stream": true get `completion` as server-sent events in
+    `stream_chunks` pieces spread evenly over `latency`.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        # Keep connections open so clients can reuse them
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def _send(self, body):
+            data = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self._send({"object": "list", "data": []})
+
+        def _stream(self, events):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            size = -(-len(completion) // stream_chunks)
+            pieces = [completion[i:i + size] for i in range(0, len(completion), size)]
+            for piece in pieces:
+                time.sleep(latency / len(pieces))
+                self._write_chunk(events(piece))
+            self._write_chunk(events(None))
+            self.wfile.write(b"0\r\n\r\n")
+
+        def _write_chunk(self, lines):
+            data = "".join(f"{line}\n\n" for line in lines).encode()
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        def _openai_events(self, piece):
+            if piece is None:
+                return ["data: [DONE]"]
+            chunk = {"id": "stub", "object": "chat.completion.chunk", "created": 0, "model": "stub",
+                     "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+            return [f"data: {json.dumps(chunk)}"]
+
+        def _anthropic_events(self, piece):
+            if piece is None:
+                return ['event: message_stop\ndata: {"type": "message_stop"}']
+            event = {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": piece}}
+            return [f"event: content_block_delta\ndata: {json.dumps(event)}"]
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if request.get("stream"):
+                self._stream(self._openai_events if self.path.endswith("/chat/completions") else self._anthropic_events)
+                return
+            time.sleep(latency)
+            if self.path.endswith("/chat/completions"):
+                self._send({
+                    "id": "stub", "object": "chat.completion", "created": 0, "model": "stub",
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": completion}}],
+                    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+                })
+            else:
+                self._send({
+                    "id": "stub", "type": "message", "role": "assistant", "model": "stub",
+                    "content": [{"type": "text", "text": completion}],
+                    "stop_reason": "end_turn", "stop_sequence": None,
+                    "usage": {"input_tokens": 1, "output_tokens": 1},
+                })
+
+        def log_message(self, format, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 1024
+
+    server = Server(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def fire(label: str, count: int, request):
+    start = time.perf_counter()
+    results = await asyncio.gather(*(request(i) for i in range(count)))
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<44} {elapsed:6.2f}s")
+    return results
+
+
+async def run(count: int, latency: float):
+    import httpx
+    from server.llm import llm_router
+    from server.llm.llm_cache import LLMResponseCache
+    from server.routes import api
+
+    # Memory-only cache: stub completions must not reach the app's disk cache, and reruns must not hit it
+    llm_router.llm_cache = LLMResponseCache(None)
+
+    transport = httpx.ASGITransport(app=api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://app", timeout=120) as client:
+        def improve(i):
+            return client.post("/api/improve-section", json={"section_name": "traction", "user_input": f"{i} pilots"})
+
+        print(f"{count} concurrent /api/improve-section requests, stub latency {latency}s:")
+        responses = await fire("async client (one worker)", count, improve)
+        if any(r.status_code != 200 or "Stub completion." not in r.text for r in responses):
+            raise AssertionError("Stub provider was not reached")
+
+        # What the handler did before: a blocking call on the event loop
+        async_complete = api.anthropic_client.complete_async
+        api.anthropic_client.complete_async = lambda *args: asyncio.sleep(0, api.anthropic_client.complete(*args))
+        try:
+            await fire("blocking client (previous behavior)", min(count, 10), improve)
+            print(f"    (only {min(count, 10)} requests; they run one at a time)")
+        finally:
+            api.anthropic_client.complete_async = async_complete
+
+    print(f"{count} concurrent route_llm_call_async calls:")
+    for task_type in ("pitch_block", "improve"):
+        results = await fire(f"task_type={task_type}", count,
+                             lambda i: llm_router.route_llm_call_async(task_type, f"prompt {i}"))
+        served = sum(result == "Stub completion." for result in results)
+        if served < count:
+            print(f"    ({count - served} calls fell back to mock responses; see the client errors above)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    server = start_stub_provider(args.latency)
+    host, port = server.server_address
+    os.environ.update({
+        "OPENAI_API_KEY": "stub",
+        "OPENAI_BASE_URL": f"http://{host}:{port}/v1",
+        "ANTHROPIC_API_KEY": "stub",
+        "ANTHROPIC_BASE_URL": f"http://{host}:{port}",
+    })
+    try:
+        asyncio.run(run(args.requests, args.latency))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Cost of calls to a failing provider with and without its circuit breaker.
+
+Points the OpenAI client at a local server that answers 503 after
+--failure-latency seconds (the SDK also retries), sends sequential
+pitch_block calls through route_llm_call_async, then lets the server
+recover and waits for the half-open probe to close the breaker. The
+Anthropic client, the failover target, is stubbed to answer at once.
+
+Usage: python -m server.benchmarks.circuit_breaker [--calls 20] [--failure-latency 0.3] [--cooldown 1]
+"""
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def start_flaky_provider(failure_latency: float):
+    """OpenAI-compatible server that fails with 503 until `state["healthy"]` is set."""
+    state = {"healthy": False, "requests": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            state["requests"] += 1
+            if state["healthy"]:
+                status, body = 200, {
+                    "id": "stub", "object": "chat.completion", "created": 0, "model": "stub",
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": "Stub completion."}}],
+                    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+                }
+            else:
+                time.sleep(failure_latency)
+                status, body = 503, {"error": {"message": "overloaded", "type": "server_error"}}
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+async def run(args, state):
+    from server.llm import circuit_breaker, llm_router
+    from server.llm.llm_cache import LLMResponseCache
+
+    # Memory-only cache: stub completions must not reach the app's disk cache
+    llm_router.llm_cache = LLMResponseCache(None)
+
+    async def secondary(prompt, system_prompt=None, **settings):
+        return "Secondary completion."
+    llm_router.anthropic_client.complete_async = secondary
+    model = llm_router.task_route("pitch_block")["model"]
+
+    async def calls(label: str, count: int):
+        state["requests"] = 0
+        start = time.perf_counter()
+        answers = [await llm_router.route_llm_call_async("pitch_block", f"{label} {i}", use_cache=False)
+                   for i in range(count)]
+        elapsed = time.perf_counter() - start
+        kinds = {answer[:20]: answers.count(answer) for answer in set(answers)}
+        print(f"  {label:<24} {elapsed:6.2f}s  {elapsed / count * 1000:7.1f} ms/call  "
+              f"provider requests: {state['requests']:3d}  answers: {kinds}")
+
+    print(f"{args.calls} sequential calls while the primary provider fails after {args.failure_latency}s:")
+    circuit_breaker._breakers[f"openai:{model}"] = circuit_breaker.CircuitBreaker(
+        f"openai:{model}", min_calls=10 ** 9)
+    await calls("no breaker", args.calls)
+    breaker = circuit_breaker._breakers[f"openai:{model}"] = circuit_breaker.CircuitBreaker(
+        f"openai:{model}", cooldown_seconds=args.cooldown)
+    await calls("breaker", args.calls)
+    print(f"  breaker: {breaker.stats()}")
+
+    state["healthy"] = True
+    await asyncio.sleep(args.cooldown)
+    print("provider recovered, cooldown elapsed:")
+    await calls("half-open probe", 1)
+    await calls("closed again", 5)
+    print(f"  breaker: {breaker.stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--failure-latency", type=float, default=0.3)
+    parser.add_argument("--cooldown", type=float, default=1.0)
+    args = parser.parse_args()
+
+    server, state = start_flaky_provider(args.failure_latency)
+    host, port = server.server_address
+    os.environ.update({"OPENAI_API_KEY": "stub", "OPENAI_BASE_URL": f"http://{host}:{port}/v1"})
+    try:
+        asyncio.run(run(args, state))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Clarifying questions for a weak pitch: one LLM call per low-confidence section in turn vs. concurrent and merged calls.
+
+The stub stands in for route_llm_call_async and models a completion's
+latency as time-to-first-token plus completion tokens / tokens-per-second
+(rough gpt-4o-mini figures, scaled by --scale). A section's questions
+take about TOKENS_PER_SECTION tokens alone or merged. The last run makes
+one section's call hang to show the deadline.
+
+Usage: python -m server.benchmarks.clarifying_questions [--low 5] [--pitches 5] [--scale 0.2]
+"""
+import argparse
+import asyncio
+import json
+import time
+from server.llm import clarifier
+
+FIRST_TOKEN_SECONDS = 0.35
+TOKENS_PER_SECOND = 90.0
+TOKENS_PER_SECTION = 90
+SECTIONS = ["problem", "solution", "market", "business_model", "competition", "traction", "ask"]
+
+
+def stub_route(scale: float, calls: list, hang: str = None):
+    async def route_llm_call_async(task_type, prompt, max_tokens=None, system_prompt=None, use_cache=True,
+                                   hedge=None, budget=None):
+        if task_type == 'clarify_pitch':
+            names = prompt.rsplit(": ", 1)[1].strip().split(", ")
+            response = json.dumps({name: [f"What numbers back up the {name}?", f"Who is the {name} for?"]
+                                   for name in names})
+            tokens = TOKENS_PER_SECTION * len(names)
+        else:
+            name = prompt.split("Section: ", 1)[1].split("\n", 1)[0]
+            response, tokens = repr([f"What numbers back up the {name}?", f"Who is the {name} for?"]), TOKENS_PER_SECTION
+            if name == hang:
+                tokens *= 100
+        calls.append(tokens)
+        await asyncio.sleep((FIRST_TOKEN_SECONDS + tokens / TOKENS_PER_SECOND) * scale)
+        return response
+    return route_llm_call_async
+
+
+async def serial(analyzed_pitch):
+    """get_clarifying_questions_for_pitch as it was: one section after another."""
+    questions = {}
+    for section_name, section_data in analyzed_pitch.items():
+        if section_data.get('confidence', 1.0) < clarifier.CLARIFY_THRESHOLD:
+            questions[section_name] = await clarifier.get_clarifying_questions_async(
+                section_name, section_data['text'], section_data)
+    return questions
+
+
+async def run(args):
+    pitches = [{name: {"text": f"{name} text {p}", "confidence": 0.5 if i < args.low else 0.9,
+                       "reason": "Contains vague or non-specific language"}
+                for i, name in enumerate(SECTIONS)} for p in range(args.pitches)]
+    deadline = 3 * (FIRST_TOKEN_SECONDS + TOKENS_PER_SECTION / TOKENS_PER_SECOND) * args.scale
+    print(f"{args.pitches} pitches, {args.low} of {len(SECTIONS)} sections below "
+          f"{clarifier.CLARIFY_THRESHOLD}, latencies scaled by {args.scale}:")
+    modes = [
+        ("one call per section, in turn (previous)", None, serial),
+        ("concurrent, cap 4", None, lambda pitch: clarifier.get_clarifying_questions_for_pitch_async(pitch, 4)),
+        ("merged prompt", None, lambda pitch: clarifier.get_clarifying_questions_for_pitch_async(pitch, merged=True)),
+        (f"concurrent, one call hangs, {deadline * 1000:.0f} ms deadline", SECTIONS[0],
+         lambda pitch: clarifier.get_clarifying_questions_for_pitch_async(pitch, 4, deadline)),
+    ]
+    for label, hang, ask in modes:
+        calls = []
+        clarifier.route_llm_call_async = stub_route(args.scale, calls, hang)
+        latencies, answered = [], 0
+        for pitch in pitches:
+            start = time.perf_counter()
+            answered += len(await ask(pitch))
+            latencies.append(time.perf_counter() - start)
+        print(f"  {label:<46} mean {sum(latencies) / len(latencies) * 1000:7.1f} ms  "
+              f"calls/pitch {len(calls) / len(pitches):4.1f}  sections answered {answered / len(pitches):4.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--low", type=int, default=5, help="low-confidence sections per pitch")
+    parser.add_argument("--pitches", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=0.2)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
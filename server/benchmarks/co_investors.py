@@ -0,0 +1,33 @@
+"""Existing-investor detection over the Startup Insights export: per-VC substring checks vs. one automaton pass.
+
+Usage: python -m server.benchmarks.co_investors
+"""
+from server.benchmarks.match_scoring import timed
+from server.llm.co_investors import CoInvestorDetector
+from server.llm.vc_dataset import annotate_existing_investors, get_vc_dataset, load_startup_profiles
+from server.llm.vc_scoring import check_existing_investor_match
+
+
+def main():
+    names = get_vc_dataset().df["Investor Name"].tolist()
+    profiles = load_startup_profiles()
+    texts = [profile["has_investor"] for profile in profiles]
+
+    def legacy():
+        return [[row for row, name in enumerate(names) if check_existing_investor_match(text, name)] for text in texts]
+
+    detector = CoInvestorDetector(names)
+    expected = legacy()
+    if [list(ids) for ids in detector.annotate(texts)] != expected:
+        raise AssertionError("Automaton results differ from check_existing_investor_match")
+
+    print(f"{len(profiles)} startups x {len(names)} investors, "
+          f"{sum(map(len, expected))} startup-investor links, {len(detector.automaton.keywords)} keywords")
+    print(f"  per-VC substring checks: {timed(legacy) * 1000:8.1f} ms")
+    print(f"  build automaton:         {timed(lambda: CoInvestorDetector(names), repeat=3) * 1000:8.1f} ms")
+    print(f"  automaton annotate:      {timed(lambda: detector.annotate(texts), repeat=3) * 1000:8.1f} ms")
+    print(f"  annotate whole export:   {timed(annotate_existing_investors, repeat=3) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Bulk confidence scoring of a pitch corpus: a Python loop over analyze_pitch_confidence vs. iter_score_jsonl.
+
+Writes --pitches random decks as JSON lines, each with its own user
+inputs, turns the grade caches off so reruns are not free, checks that
+every worker count produces the loop's output, and reports pitches per
+second.
+
+Usage: python -m server.benchmarks.confidence_batch [--pitches 400] [--sentences 70] [--workers 1,2,4]
+"""
+import argparse
+import json
+import os
+import random
+import time
+from server.benchmarks.confidence_grading import random_deck
+from server.llm import confidence_scorer
+from server.llm.confidence_batch import iter_score_jsonl
+from server.llm.confidence_scorer import GradeCache, analyze_pitch_confidence
+
+
+def corpus(pitches: int, sentences: int):
+    rng = random.Random(23)
+    lines = []
+    for i in range(pitches):
+        user_inputs = [f"Startup {i}", "Fintech", f"${rng.randint(1, 9)} million", f"{rng.randint(5, 90)}%", "Seed"]
+        lines.append(json.dumps({"id": i, "pitch": random_deck(rng, user_inputs, sentences),
+                                 "user_inputs": user_inputs}))
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pitches", type=int, default=400)
+    parser.add_argument("--sentences", type=int, default=70, help="sentences per pitch")
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated worker counts")
+    args = parser.parse_args()
+
+    # Worker processes inherit these when forked
+    confidence_scorer.sentence_grades = GradeCache(0)
+    confidence_scorer.section_grades = GradeCache(0)
+    lines = corpus(args.pitches, args.sentences)
+    start = time.perf_counter()
+    expected = []
+    for line in lines:
+        record = json.loads(line)
+        expected.append(json.dumps({"id": record["id"],
+                                    "analysis": analyze_pitch_confidence(record["pitch"], record["user_inputs"])}))
+    loop = time.perf_counter() - start
+
+    print(f"{args.pitches} pitches x {args.sentences} sentences, {os.cpu_count()} CPUs:")
+    print(f"  loop over analyze_pitch_confidence: {loop:6.2f} s  {args.pitches / loop:7.1f} pitches/s")
+    for workers in (int(w) for w in args.workers.split(",")):
+        start = time.perf_counter()
+        output = list(iter_score_jsonl(lines, workers=workers))
+        elapsed = time.perf_counter() - start
+        if output != expected:
+            raise AssertionError(f"iter_score_jsonl with {workers} workers differs from the loop")
+        print(f"  iter_score_jsonl, {workers} worker(s):      {elapsed:6.2f} s  {args.pitches / elapsed:7.1f} pitches/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Sentence grading on long pitch decks: the previous grade_sentence vs. SentenceGrader.
+
+Builds random seven-section decks from template sentences, user inputs
+and every phrase the grader knows (overlapping and nested ones
+included), checks that SentenceGrader agrees with the previous
+grade_sentence on every sentence, and times grading each sentence.
+
+Usage: python -m server.benchmarks.confidence_grading [--sentences 200] [--decks 20] [--extra-inputs 40]
+"""
+import argparse
+import random
+import re
+from typing import Any, Dict, List
+from server.benchmarks.match_scoring import timed
+from server.llm import confidence_scorer
+from server.llm.confidence_scorer import (BENEFIT_PHRASES, RED_FLAGS, VAGUE_TERMS, GradeCache, SentenceGrader,
+                                          analyze_pitch_confidence)
+
+SECTIONS = ["problem", "solution", "market", "business_model", "competition", "traction", "ask"]
+FILLER = ("our platform helps teams ship faster with fewer handoffs and clearer ownership across the "
+          "whole customer lifecycle from onboarding to renewal lenders underwrite small business loans in days "
+          "instead of weeks because the copilot reads statements flags risk drafts credit memos and keeps an "
+          "audit trail regulators accept while analysts focus on judgment calls pricing portfolio monitoring "
+          "churn retention expansion revenue grew quarter over quarter as design partners converted to annual "
+          "contracts with usage based pricing tiers").split()
+METRICS = ["40%", "$2 million", "3 billion", "120 hours", "$1.2M ARR", "500 person-hours"]
+
+
+def legacy_grade_sentence(sentence: str, user_inputs: List[str]) -> Dict[str, Any]:
+    """grade_sentence as it was: a substring scan per user input and per phrase."""
+    sentence_lower = sentence.lower()
+    user_matches = [ui for ui in user_inputs if ui and ui.lower() in sentence_lower]
+    if len(user_matches) >= 2 and re.search(r"\d+%|\d+\s*(person-hours|hours|arr|million|billion)", sentence_lower):
+        return {"color": "green", "confidence": 0.9,
+                "reason": "Contains multiple specific data points plus contextual insight"}
+    if len(user_matches) >= 2:
+        return {"color": "green", "confidence": 0.85, "reason": "References multiple user-provided data points"}
+    if len(user_matches) == 1:
+        if any(bp in sentence_lower for bp in BENEFIT_PHRASES):
+            return {"color": "green", "confidence": 0.85,
+                    "reason": "Includes user data and demonstrates a clear benefit or outcome"}
+        return {"color": "orange", "confidence": 0.6,
+                "reason": "References user input but lacks additional insight or context"}
+    if any(flag in sentence_lower for flag in RED_FLAGS):
+        return {"color": "red", "confidence": 0.3, "reason": "Contains hype terms or unsubstantiated claims"}
+    if any(term in sentence_lower for term in VAGUE_TERMS):
+        return {"color": "orange", "confidence": 0.6, "reason": "Contains vague or non-specific language"}
+    return {"color": "orange", "confidence": 0.7, "reason": "General statement without specific backing"}
+
+
+def legacy_analyze(pitch_json: Dict[str, Any], user_inputs: List[str]) -> Dict[str, Any]:
+    """analyze_pitch_confidence as it was, over legacy_grade_sentence."""
+    enhanced_pitch = {}
+    for section, data in pitch_json.items():
+        graded_sentences = []
+        for sentence in re.split(r'(?<=[.!?])\s+', data.get("text", "").strip()):
+            if sentence:
+                graded_sentences.append({"text": sentence, **legacy_grade_sentence(sentence, user_inputs)})
+        total = sum(grade["confidence"] for grade in graded_sentences)
+        enhanced_pitch[section] = {"text": data.get("text", ""),
+                                   "confidence": total / len(graded_sentences) if graded_sentences else 0.0,
+                                   "sentences": graded_sentences}
+    return enhanced_pitch
+
+
+def random_deck(rng: random.Random, user_inputs: List[str], sentences: int) -> Dict[str, Any]:
+    vocabulary = BENEFIT_PHRASES + RED_FLAGS + VAGUE_TERMS + [ui for ui in user_inputs if ui] + METRICS
+    deck = {}
+    for section in SECTIONS:
+        text = []
+        for _ in range(sentences // len(SECTIONS)):
+            words = rng.sample(FILLER, rng.randint(12, 30))
+            for _ in range(rng.choice([0, 0, 0, 1, 1, 2])):
+                phrase = rng.choice(vocabulary)
+                words.insert(rng.randrange(len(words) + 1), phrase.upper() if rng.random() < 0.2 else phrase)
+            text.append(" ".join(words).capitalize() + rng.choice([".", "!", "?"]))
+        deck[section] = {"text": " ".join(text)}
+    return deck
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sentences", type=int, default=200, help="sentences per deck")
+    parser.add_argument("--decks", type=int, default=20)
+    parser.add_argument("--extra-inputs", type=int, default=40)
+    args = parser.parse_args()
+
+    # Time grading itself, not the grade caches
+    confidence_scorer.sentence_grades = GradeCache(0)
+    confidence_scorer.section_grades = GradeCache(0)
+
+    rng = random.Random(11)
+    # The generator's inputs: startup name, industry, product, traction, stage, ask
+    user_inputs = ["Acme AI", "Fintech", "An underwriting copilot that reads bank statements for SMB lenders",
+                   "$1.2M ARR, 40% month-over-month growth, 12 paying lenders", "Seed", "$2 million"]
+    # Nested and overlapping inputs: "Acme" / "Acme AI", "per" (also a benefit phrase), "aim" (also vague)
+    tricky_inputs = ["Acme", "Acme AI", "fintech", "per", "aim", "$2 million", "40%", "Seed", "", "SEED", " "]
+    decks = [random_deck(rng, user_inputs, args.sentences) for _ in range(args.decks)]
+    sentences = [sentence for deck in decks for data in deck.values()
+                 for sentence in re.split(r'(?<=[.!?])\s+', data["text"].strip())]
+    tricky_sentences = [sentence for data in random_deck(rng, tricky_inputs, args.sentences * 5).values()
+                        for sentence in re.split(r'(?<=[.!?])\s+', data["text"].strip())]
+
+    for inputs in (user_inputs, tricky_inputs):
+        grader = SentenceGrader(inputs)
+        for sentence in sentences + tricky_sentences:
+            if grader.grade(sentence) != legacy_grade_sentence(sentence, inputs):
+                raise AssertionError(f"Grades differ for {sentence!r} with {inputs!r}")
+    for deck in decks:
+        if analyze_pitch_confidence(deck, user_inputs) != legacy_analyze(deck, user_inputs):
+            raise AssertionError("analyze_pitch_confidence differs from the previous grader")
+    checked = 2 * (len(sentences) + len(tricky_sentences))
+
+    print(f"{args.decks} decks x {args.sentences} sentences ({checked} grades identical to the previous grader)")
+    # Clarification answers and other extra inputs grow the phrase list
+    extra_inputs = [f"Design partner {i}" if i % 2 else f"Lender{i}" for i in range(args.extra_inputs)]
+    for inputs in (user_inputs, user_inputs + extra_inputs):
+        inputs_decks = [random_deck(random.Random(i), inputs, args.sentences) for i in range(args.decks)]
+        inputs_sentences = [sentence for deck in inputs_decks for data in deck.values()
+                            for sentence in re.split(r'(?<=[.!?])\s+', data["text"].strip()) if sentence]
+        count = len(inputs_sentences)
+        grader = SentenceGrader(inputs)
+        legacy = timed(lambda: [legacy_grade_sentence(sentence, inputs) for sentence in inputs_sentences], repeat=5)
+        graded = timed(lambda: [grader.grade(sentence) for sentence in inputs_sentences], repeat=5)
+        print(f"  {len(inputs)} user inputs:")
+        print(f"    previous grade_sentence:      {legacy * 1000:7.1f} ms  {legacy / count * 1e6:6.2f} us/sentence")
+        print(f"    SentenceGrader.grade:         {graded * 1000:7.1f} ms  {graded / count * 1e6:6.2f} us/sentence")
+    print(f"  build grader: {timed(lambda: SentenceGrader(user_inputs), repeat=3) * 1000:.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Rescoring a pitch after one-section edits: regrading every section vs. the shared grade caches.
+
+Each of --founders founders gets a seven-section deck, then makes --edits
+one-section improvements, each rescored through
+update_pitch_with_improvements. Improved sections keep most of their
+sentences and rewrite one or two, as improvements usually do. Finally
+every founder's deck is analyzed again from a new session.
+
+Usage: python -m server.benchmarks.confidence_rescoring [--founders 50] [--edits 10] [--sentences 6]
+"""
+import argparse
+import random
+import time
+from server.benchmarks.confidence_grading import FILLER, SECTIONS, legacy_analyze
+from server.llm import confidence_scorer
+from server.llm.confidence_scorer import GradeCache, grade_cache_stats
+from server.llm.improver import update_pitch_with_improvements
+
+
+def sentence(rng: random.Random, user_inputs):
+    words = rng.sample(FILLER, rng.randint(12, 30))
+    if rng.random() < 0.5:
+        words.insert(rng.randrange(len(words) + 1), rng.choice(user_inputs))
+    return " ".join(words).capitalize() + "."
+
+
+def founder_inputs(i: int):
+    return [f"Startup{i}", "Fintech", f"A copilot for lender team {i}", f"{10 + i}% month-over-month growth",
+            "Seed", f"${i + 1} million"]
+
+
+def run(args, rescore) -> float:
+    """Seconds spent rescoring every founder's edits and the final reload (not the first analysis)."""
+    rng = random.Random(5)
+    founders = []
+    for i in range(args.founders):
+        inputs = founder_inputs(i)
+        sections = {name: [sentence(rng, inputs) for _ in range(args.sentences)] for name in SECTIONS}
+        founders.append((inputs, sections, rescore({name: {"text": " ".join(text)} for name, text in sections.items()},
+                                                   {}, inputs)))
+    misses = confidence_scorer.sentence_grades.misses
+
+    spent = 0.0
+    decks = []
+    for inputs, sections, deck in founders:
+        for _ in range(args.edits):
+            name = rng.choice(SECTIONS)
+            for position in rng.sample(range(args.sentences), rng.randint(1, 2)):
+                sections[name][position] = sentence(rng, inputs)
+            start = time.perf_counter()
+            deck = rescore(deck, {name: " ".join(sections[name])}, inputs)
+            spent += time.perf_counter() - start
+        decks.append((deck, inputs))
+    start = time.perf_counter()
+    for deck, inputs in decks:
+        rescore(deck, {}, inputs)
+    spent += time.perf_counter() - start
+    return spent, confidence_scorer.sentence_grades.misses - misses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--founders", type=int, default=50)
+    parser.add_argument("--edits", type=int, default=10)
+    parser.add_argument("--sentences", type=int, default=6, help="sentences per section")
+    args = parser.parse_args()
+
+    def regrade_all(pitch, improvements, inputs):
+        updated = {name: {"text": improvements.get(name, data["text"])} for name, data in pitch.items()}
+        return legacy_analyze(updated, inputs)
+
+    rescores = args.founders * (args.edits + 1)
+    print(f"{args.founders} founders x ({args.edits} one-section edits + a reload), "
+          f"{len(SECTIONS)} sections x {args.sentences} sentences:")
+    legacy, _ = run(args, regrade_all)
+    print(f"  regrade every sentence: {legacy * 1000:7.1f} ms  {legacy / rescores * 1e6:6.1f} us/rescore  "
+          f"sentences graded: {rescores * len(SECTIONS) * args.sentences}")
+
+    confidence_scorer.sentence_grades = GradeCache(confidence_scorer.SENTENCE_GRADE_CACHE_SIZE)
+    confidence_scorer.section_grades = GradeCache(confidence_scorer.SECTION_GRADE_CACHE_SIZE)
+    cached, graded = run(args, update_pitch_with_improvements)
+    print(f"  grade caches:           {cached * 1000:7.1f} ms  {cached / rescores * 1e6:6.1f} us/rescore  "
+          f"sentences graded: {graded}")
+    print(f"  stats: {grade_cache_stats()}")
+
+if __name__ == "__main__":
+    main()
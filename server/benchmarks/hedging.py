@@ -0,0 +1,72 @@
+"""Tail latency of route_llm_call_async with and without hedging, against heavy-tailed stub providers.
+
+The primary provider (OpenAI for pitch_block) answers in --fast seconds,
+except for a --slow-share of calls that take --slow seconds. The
+secondary answers in --secondary seconds. Responses are not cached and
+the provider rate limits are lifted.
+
+Usage: python -m server.benchmarks.hedging [--calls 200] [--slow-share 0.08] [--slow 8] [--budget 4]
+"""
+import argparse
+import asyncio
+import random
+import time
+from server.llm import llm_router, rate_limiter
+from server.llm.rate_limiter import ProviderLimiter
+
+
+def stub_complete(fast: float, slow: float, slow_share: float, rng: random.Random):
+    async def complete_async(prompt, system_prompt=None, **settings):
+        await asyncio.sleep(slow if rng.random() < slow_share else fast)
+        return f"Completion for {prompt}"
+    return complete_async
+
+
+def percentiles(latencies):
+    latencies = sorted(latencies)
+    pick = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+    return f"p50 {pick(0.5):5.2f}s  p95 {pick(0.95):5.2f}s  p99 {pick(0.99):5.2f}s  max {latencies[-1]:5.2f}s"
+
+
+async def measure(label: str, calls: int, **kwargs):
+    async def one(i):
+        start = time.perf_counter()
+        await llm_router.route_llm_call_async("pitch_block", f"{label} {i}", use_cache=False, **kwargs)
+        return time.perf_counter() - start
+
+    latencies = await asyncio.gather(*(one(i) for i in range(calls)))
+    print(f"  {label:<26} {percentiles(latencies)}")
+
+
+async def run(args):
+    # Teach the latency tracker what normal looks like
+    await asyncio.gather(*(llm_router.route_llm_call_async("pitch_block", f"warm {i}", use_cache=False, hedge=False)
+                           for i in range(50)))
+    print(f"{args.calls} pitch_block calls, {args.slow_share:.0%} of primary calls take {args.slow}s:")
+    await measure("no hedging", args.calls, hedge=False)
+    await measure(f"no hedging, {args.budget}s budget", args.calls, hedge=False, budget=args.budget)
+    delay = llm_router._latency("openai", llm_router.task_route("pitch_block")["model"]).hedge_delay()
+    await measure(f"hedging after {delay:.2f}s", args.calls, hedge=True)
+    print(f"  stats: {llm_router.hedge_stats.stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--fast", type=float, default=0.3)
+    parser.add_argument("--slow", type=float, default=8.0)
+    parser.add_argument("--slow-share", type=float, default=0.08)
+    parser.add_argument("--secondary", type=float, default=0.4)
+    parser.add_argument("--budget", type=float, default=4.0)
+    args = parser.parse_args()
+
+    for name in ("openai", "anthropic"):
+        rate_limiter._limiters[name] = ProviderLimiter(name, rpm=10 ** 6, tpm=10 ** 9, concurrency=10 ** 4)
+    rng = random.Random(7)
+    llm_router.openai_client.complete_async = stub_complete(args.fast, args.slow, args.slow_share, rng)
+    llm_router.anthropic_client.complete_async = stub_complete(args.secondary, args.secondary, 0.0, rng)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Connection reuse of the pooled raw-HTTP LLM path against a local stub provider.
+
+Usage: python -m server.benchmarks.http_pool [--calls 200]
+"""
+import argparse
+import json
+import os
+import time
+import httpx
+from server.benchmarks.async_llm_load import start_stub_provider
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    server = start_stub_provider(0.0)
+    host, port = server.server_address
+    os.environ.update({"ANTHROPIC_API_KEY": "stub", "ANTHROPIC_BASE_URL": f"http://{host}:{port}"})
+    from server.llm.simple_anthropic import SimpleAnthropicClient
+
+    client = SimpleAnthropicClient()
+    payload = json.dumps(client._payload("prompt"))
+    try:
+        start = time.perf_counter()
+        for _ in range(args.calls):
+            # What every call did before: a new connection per request
+            with httpx.Client() as unpooled:
+                unpooled.post(client.base_url, headers=client.headers, content=payload)
+        unpooled_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(args.calls):
+            if client.complete("prompt") != "Stub completion.":
+                raise AssertionError("Stub provider was not reached")
+        pooled_time = time.perf_counter() - start
+    finally:
+        server.shutdown()
+
+    print(f"{args.calls} sequential calls to a local stub (no TLS, so handshakes are cheaper than in production):")
+    print(f"  new connection per call: {unpooled_time / args.calls * 1000:6.2f} ms/call")
+    print(f"  shared keep-alive pool:  {pooled_time / args.calls * 1000:6.2f} ms/call")
+    print(f"  pool stats: {client.pool.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Validate the n-gram "similar industry" model against the original SequenceMatcher rule.
+
+Usage: python -m server.benchmarks.industry_similarity
+"""
+import os
+import numpy as np
+import pandas as pd
+from server.benchmarks.match_scoring import WORKSPACE_DIR, legacy_match, sequence_similarity, timed
+from server.llm.vc_dataset import load_startup_profiles
+from server.llm.vc_scoring import SIMILARITY_THRESHOLD, VCScoringEngine, clean_column, normalize_industry
+from server.llm.vc_similarity import NGramSimilarityModel
+
+
+def investor_table() -> pd.DataFrame:
+    columns = ["Investor Name", "Fund Focus (Sectors)", "Fund Stage", "Location"]
+    df = pd.concat([
+        pd.read_csv(os.path.join(WORKSPACE_DIR, "VC_FundStage_Location_Sector.csv"))[columns],
+        pd.read_csv(os.path.join(WORKSPACE_DIR, "vc22.csv"))[columns],
+    ], ignore_index=True)
+    df["Fund_Focus_Clean"] = clean_column(df["Fund Focus (Sectors)"])
+    df["Location_Clean"] = clean_column(df["Location"])
+    df["Fund_Stage_Clean"] = clean_column(df["Fund Stage"])
+    return df
+
+
+def main():
+    df = investor_table()
+    profiles = load_startup_profiles()
+    focus_values = sorted(set(df["Fund_Focus_Clean"]))
+    industries = sorted({normalize_industry(profile["industry"]) for profile in profiles})
+    model = NGramSimilarityModel(focus_values)
+
+    # Pairwise decisions, restricted to pairs that actually reach the similarity rule
+    agree = total = both = reference_only = model_only = 0
+    for industry in industries:
+        model_hits = model.similarity(industry) > SIMILARITY_THRESHOLD
+        for focus, model_hit in zip(focus_values, model_hits):
+            needles = [industry] + industry.split()
+            if normalize_industry(focus) == industry or any(needle in focus for needle in needles):
+                continue
+            reference_hit = sequence_similarity(industry, focus) > 0.3
+            total += 1
+            agree += reference_hit == model_hit
+            both += reference_hit and model_hit
+            reference_only += reference_hit and not model_hit
+            model_only += model_hit and not reference_hit
+    print(f"pairs reaching the similarity rule: {total}")
+    print(f"  decision agreement: {agree / total:.1%} "
+          f"(both similar {both}, SequenceMatcher only {reference_only}, n-gram only {model_only})")
+
+    # End-to-end top-5 for every Startup Insights profile
+    engine = VCScoringEngine(df)
+    identical, overlap = 0, []
+    for profile in profiles:
+        query = {key: value for key, value in profile.items() if key != "name"}
+        reference = legacy_match(df, **query)
+        current = engine.match(**query)
+        identical += reference == current
+        overlap.append(len({m["name"] for m in reference} & {m["name"] for m in current}) / len(reference))
+    print(f"top-5 over {len(profiles)} profiles x {len(df)} investors: "
+          f"{identical / len(profiles):.1%} identical, mean name overlap {np.mean(overlap):.1%}")
+    sequence_engine = VCScoringEngine(df, similarity_model="sequence")
+    identical = sum(legacy_match(df, **query) == sequence_engine.match(**query)
+                    for query in ({key: value for key, value in profile.items() if key != "name"} for profile in profiles))
+    print(f"  VC_SIMILARITY_MODEL=sequence: {identical / len(profiles):.1%} identical")
+
+    # Cost of the similarity step for one query over all distinct focus values
+    sequence_time = timed(lambda: [[sequence_similarity(i, f) for f in focus_values] for i in industries])
+    model_time = timed(lambda: model.similarity_matrix(industries), repeat=3)
+    print(f"similarity for {len(industries)} industries x {len(focus_values)} focus values: "
+          f"SequenceMatcher {sequence_time * 1000:.1f} ms, sparse n-gram {model_time * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Latency of an LLM-enhanced match page against a stubbed slow LLM.
+
+Usage: python -m server.benchmarks.insight_enrichment [--latency 0.5]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from server.llm import matching
+from server.llm.insight_cache import InsightCache
+
+QUERY = ("Acme", "AI, fintech", "Series A", "silicon valley")
+
+
+def stub_llm(latency: float, slow_investor: str = "", slow_latency: float = 0.0):
+    async def route_llm_call_async(task_type, prompt, max_tokens=None):
+        route_llm_call_async.calls += 1
+        slow = slow_investor and f"Investor: {slow_investor}\n" in prompt
+        await asyncio.sleep(slow_latency if slow else latency)
+        return "Stubbed insight."
+    route_llm_call_async.calls = 0
+    return route_llm_call_async
+
+
+def timed_page(label: str, **kwargs):
+    start = time.perf_counter()
+    page = matching.match_vc_to_startup_page(*QUERY, limit=5, **kwargs)
+    elapsed = time.perf_counter() - start
+    flagged = [m["name"] for m in page["matches"] if m["insight_fallback"]]
+    print(f"  {label:<28} {elapsed:6.2f}s  LLM calls: {matching.route_llm_call_async.calls}  "
+          f"placeholders: {', '.join(flagged) or 'none'}")
+    matching.route_llm_call_async.calls = 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds per stubbed LLM call")
+    args = parser.parse_args()
+
+    original_llm, original_cache = matching.route_llm_call_async, matching.insight_cache
+    cache_dir = tempfile.TemporaryDirectory()
+    cache_path = os.path.join(cache_dir.name, "insights.jsonl")
+    try:
+        matching.route_llm_call_async = stub_llm(args.latency)
+        print(f"5 insights at {args.latency}s per LLM call:")
+        matching.insight_cache = InsightCache(cache_path)
+        timed_page("sequential (concurrency=1)", insight_concurrency=1, insight_deadline=60)
+        os.remove(cache_path)
+        matching.insight_cache = InsightCache(cache_path)
+        timed_page("concurrent (concurrency=5)", insight_concurrency=5, insight_deadline=60)
+        timed_page("repeat (memory tier)")
+        matching.insight_cache = InsightCache(cache_path)
+        timed_page("after restart (disk tier)")
+        print(f"  cache stats: {matching.insight_cache.stats()}")
+
+        os.remove(cache_path)
+        matching.insight_cache = InsightCache(cache_path)
+        matching.route_llm_call_async = stub_llm(args.latency, "Accel", args.latency * 20)
+        print(f"one call hangs for {args.latency * 20}s:")
+        timed_page(f"deadline {args.latency * 2}s", insight_deadline=args.latency * 2)
+    finally:
+        matching.route_llm_call_async, matching.insight_cache = original_llm, original_cache
+        cache_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Latency of repeated route_llm_call_async requests with and without the LLM response cache.
+
+The provider calls are stubbed with a fixed delay; the cache is a
+temporary one, so nothing under data/ is touched.
+
+Usage: python -m server.benchmarks.llm_cache [--calls 200] [--distinct 20] [--latency 0.2]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from server.llm import llm_router
+from server.llm.llm_cache import LLMResponseCache
+
+
+def stub_complete(latency: float):
+    async def complete_async(prompt, system_prompt=None, **settings):
+        complete_async.calls += 1
+        await asyncio.sleep(latency)
+        return f"Completion for {prompt}"
+    complete_async.calls = 0
+    return complete_async
+
+
+async def timed(label: str, prompts, **kwargs):
+    start = time.perf_counter()
+    for prompt in prompts:
+        await llm_router.route_llm_call_async("pitch_block", prompt, **kwargs)
+    elapsed = time.perf_counter() - start
+    calls = llm_router.openai_client.complete_async.calls
+    print(f"  {label:<32} {elapsed:7.3f}s  {elapsed / len(prompts) * 1e6:10.1f} us/call  provider calls: {calls}")
+    llm_router.openai_client.complete_async.calls = 0
+
+
+async def run(calls: int, distinct: int, latency: float, cache_path: str):
+    prompts = [f"prompt {i % distinct}" for i in range(calls)]
+    print(f"{calls} sequential pitch_block calls over {distinct} distinct prompts, provider latency {latency}s:")
+    await timed("use_cache=False", prompts, use_cache=False)
+    await timed("cold cache", prompts)
+    await timed("warm cache (memory)", prompts)
+
+    # A fresh process: empty memory tier, same disk file
+    llm_router.llm_cache = LLMResponseCache(cache_path)
+    await timed("warm cache (disk)", prompts)
+    print(f"  stats: {llm_router.llm_cache.stats()}")
+
+    fresh = await llm_router.route_llm_call_async("pitch_block", "prompt 0", use_cache=False)
+    if fresh != await llm_router.route_llm_call_async("pitch_block", "prompt 0"):
+        raise AssertionError("Cached response differs from the provider response")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--distinct", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    llm_router.openai_client.complete_async = stub_complete(args.latency)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, "llm_cache.jsonl")
+        llm_router.llm_cache = LLMResponseCache(cache_path)
+        asyncio.run(run(args.calls, args.distinct, args.latency, cache_path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Per-task latency of route_llm_call_async under the routing table versus one model and a 2000-token budget for everything.
+
+The stub provider models a completion's latency as time-to-first-token
+plus completion tokens / tokens-per-second for the requested model, and
+stops at max_tokens or at the first stop sequence. Each task's
+completion is its NATURAL_TOKENS length (the model's own stopping point,
+often longer than the caller wants). Speeds are rough public figures,
+scaled by --scale to keep the run short. Responses are not cached and
+the provider rate limits are lifted.
+
+Usage: python -m server.benchmarks.llm_routing [--calls 20] [--scale 0.05]
+"""
+import argparse
+import asyncio
+import time
+from server.llm import llm_router, rate_limiter
+from server.llm.rate_limiter import ProviderLimiter
+
+# model: (seconds to first token, completion tokens per second)
+MODEL_SPEEDS = {
+    "gpt-4-turbo-preview": (0.6, 30.0),
+    "gpt-4o-mini": (0.35, 90.0),
+    "claude-3-haiku-20240307": (0.4, 120.0),
+}
+
+# Tokens the model would write if left alone; a paragraph break after `break_at`
+NATURAL_TOKENS = {
+    "pitch_block": (1100, None),
+    "clarify_question": (180, None),
+    "generate_email": (260, None),
+    "match_insight": (160, 60),
+    "improve": (380, None),
+    "regenerate": (420, None),
+}
+
+# Caller arguments as used in the app
+CALLER_MAX_TOKENS = {
+    "pitch_block": 1200,
+    "clarify_question": 300,
+    "generate_email": 300,
+    "match_insight": 100,
+    "improve": 500,
+    "regenerate": 500,
+}
+
+# What every call looked like before: the client's default model, 2000 tokens, no stop sequences;
+# the clients ignored the caller's max_tokens
+PREVIOUS_TABLE = {
+    'default': {"provider": "openai", "model": None, "max_tokens": 2000, "temperature": 0.7, "stop": None},
+    'improve': {"provider": "anthropic"},
+    'regenerate': {"provider": "anthropic"},
+}
+
+
+def stub_complete(client, scale: float, usage: dict):
+    async def complete_async(prompt, system_prompt=None, model=None, max_tokens=None, temperature=None, stop=None):
+        model = model or client.model
+        task_type = prompt.split()[0]
+        natural, break_at = NATURAL_TOKENS[task_type]
+        tokens = min(natural, max_tokens)
+        if stop and "\n\n" in stop and break_at is not None:
+            tokens = min(tokens, break_at)
+        first_token, per_second = MODEL_SPEEDS[model]
+        await asyncio.sleep((first_token + tokens / per_second) * scale)
+        usage.setdefault(task_type, []).append(tokens)
+        return f"{model} wrote {tokens} tokens"
+    return complete_async
+
+
+async def measure(label: str, calls: int, usage: dict, caller_max_tokens: bool):
+    print(f"{label}:")
+    for task_type in NATURAL_TOKENS:
+        route = llm_router.task_route(task_type)
+        model = route["model"] or llm_router.providers[route["provider"]].model
+
+        async def one(i):
+            start = time.perf_counter()
+            await llm_router.route_llm_call_async(task_type, f"{task_type} {label} {i}",
+                                                  max_tokens=CALLER_MAX_TOKENS[task_type] if caller_max_tokens else None,
+                                                  use_cache=False)
+            return time.perf_counter() - start
+
+        latencies = sorted(await asyncio.gather(*(one(i) for i in range(calls))))
+        tokens = usage[task_type]
+        print(f"  {task_type:<17} {model:<24} mean {sum(latencies) / calls * 1000:7.1f} ms  "
+              f"p95 {latencies[int(calls * 0.95) - 1] * 1000:7.1f} ms  tokens/call {sum(tokens) / len(tokens):6.0f}")
+    usage.clear()
+
+
+async def run(args):
+    usage = {}
+    llm_router.openai_client.complete_async = stub_complete(llm_router.openai_client, args.scale, usage)
+    llm_router.anthropic_client.complete_async = stub_complete(llm_router.anthropic_client, args.scale, usage)
+    print(f"{args.calls} calls per task type, latencies scaled by {args.scale}:")
+    routing_table = dict(llm_router.ROUTING_TABLE)
+    llm_router.ROUTING_TABLE.clear()
+    llm_router.ROUTING_TABLE.update(PREVIOUS_TABLE)
+    await measure("one model per provider, 2000 tokens (previous)", args.calls, usage, False)
+    llm_router.ROUTING_TABLE.clear()
+    llm_router.ROUTING_TABLE.update(routing_table)
+    await measure("routing table", args.calls, usage, True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--scale", type=float, default=0.05)
+    args = parser.parse_args()
+
+    for name in ("openai", "anthropic"):
+        rate_limiter._limiters[name] = ProviderLimiter(name, rpm=10 ** 6, tpm=10 ** 9, concurrency=10 ** 4)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Time to first content for streamed vs. buffered pitch generation and section improvement.
+
+Starts the stub provider from async_llm_load, which streams a 7-section
+pitch JSON over `--latency` seconds, and serves the FastAPI app with
+uvicorn on a local port (an in-process ASGI transport would buffer the
+whole response). The LLM response cache is cleared before each call,
+and the app's pitch store writes to a temporary directory, not data/.
+
+Usage: python -m server.benchmarks.llm_streaming [--latency 2.0]
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+from server.benchmarks.async_llm_load import start_stub_provider
+
+SECTIONS = ["problem", "solution", "market", "business_model", "competition", "traction", "ask"]
+PITCH = json.dumps({section: {"text": f"The {section} section has 3 concrete metrics.", "confidence": 0.9}
+                    for section in SECTIONS})
+STARTUP = {"startup_name": "Acme", "sector": "fintech", "product": "Payments API",
+           "traction": "40 pilots", "raise_amount": "$2M", "stage": "Seed"}
+
+
+def start_app():
+    """Serve the API app with uvicorn in a background thread; returns its base URL."""
+    import uvicorn
+    from server.routes import api
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(api.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{port}"
+
+
+def isolate_database(directory: str):
+    """Give the app's agent a DatabaseManager that saves under `directory`,
+    so generated pitches never overwrite the tracked data/*.json files."""
+    from server.llm.db import DatabaseManager
+    from server.routes import api
+
+    db = DatabaseManager()
+    for name, path in list(vars(db).items()):
+        if name.endswith("_file"):
+            setattr(db, name, os.path.join(directory, os.path.basename(path)))
+    db.data_dir = directory
+    api.agent.db = db
+
+
+def clear_llm_cache():
+    from server.llm import llm_router
+    from server.llm.llm_cache import LLMResponseCache
+    llm_router.llm_cache = LLMResponseCache(None)
+
+
+async def read_events(client, path: str, body):
+    """(seconds since request, event name, payload) for each server-sent event"""
+    clear_llm_cache()
+    start = time.perf_counter()
+    events = []
+    async with client.stream("POST", path, json=body) as response:
+        event = None
+        async for line in response.aiter_lines():
+            if line.startswith("event:"):
+                event = line[6:].strip()
+            elif line.startswith("data:"):
+                events.append((time.perf_counter() - start, event, json.loads(line[5:])))
+    return events
+
+
+async def run(base_url: str, latency: float):
+    import httpx
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        print(f"generate-pitch, stub streams {len(SECTIONS)} sections over {latency}s:")
+        clear_llm_cache()
+        start = time.perf_counter()
+        response = await client.post("/api/generate-pitch", json=STARTUP)
+        buffered = time.perf_counter() - start
+        if list(response.json()["data"]) != SECTIONS:
+            raise AssertionError("Buffered pitch is incomplete")
+        print(f"  {'buffered: full pitch':<36} {buffered:6.2f}s")
+
+        events = await read_events(client, "/api/generate-pitch/stream", STARTUP)
+        sections = [(at, data["name"]) for at, event, data in events if event == "section"]
+        if [name for _, name in sections] != SECTIONS or events[-1][1] != "done":
+            raise AssertionError(f"Unexpected event stream: {[(event, data) for _, event, data in events]}")
+        for at, name in sections:
+            print(f"  {'streamed: ' + name:<36} {at:6.2f}s")
+
+        body = {"section_name": "traction", "user_input": "40 pilots"}
+        print("improve-section:")
+        start = time.perf_counter()
+        await client.post("/api/improve-section", json=body)
+        print(f"  {'buffered: full text':<36} {time.perf_counter() - start:6.2f}s")
+        events = await read_events(client, "/api/improve-section/stream", body)
+        deltas = [at for at, event, _ in events if event == "delta"]
+        print(f"  {'streamed: first delta':<36} {deltas[0]:6.2f}s  ({len(deltas)} deltas)")
+        print(f"  {'streamed: done':<36} {events[-1][0]:6.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=2.0)
+    args = parser.parse_args()
+
+    server = start_stub_provider(args.latency, completion=PITCH)
+    host, port = server.server_address
+    os.environ.update({
+        "OPENAI_API_KEY": "stub",
+        "OPENAI_BASE_URL": f"http://{host}:{port}/v1",
+        "ANTHROPIC_API_KEY": "stub",
+        "ANTHROPIC_BASE_URL": f"http://{host}:{port}",
+    })
+    try:
+        with tempfile.TemporaryDirectory() as data_dir:
+            base_url = start_app()
+            isolate_database(data_dir)
+            asyncio.run(run(base_url, args.latency))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
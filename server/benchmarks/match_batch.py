@@ -0,0 +1,36 @@
+"""Benchmark batch matching against one /api/match-style call per startup.
+
+Usage: python -m server.benchmarks.match_batch [--sizes 1000 10000] [--startups 940]
+"""
+import argparse
+from server.benchmarks.match_scoring import synthetic_investors, timed
+from server.llm.vc_dataset import load_startup_profiles
+from server.llm.vc_scoring import VCScoringEngine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--startups", type=int, default=None, help="limit the number of startup profiles")
+    args = parser.parse_args()
+
+    profiles = load_startup_profiles()[:args.startups]
+    queries = [{key: value for key, value in profile.items() if key != "name"} for profile in profiles]
+
+    print(f"{'startups':>9} {'investors':>10} {'sequential (s)':>15} {'batch (s)':>10} {'speedup':>8}")
+    for size in args.sizes:
+        df = synthetic_investors(size)
+        engine = VCScoringEngine(df)
+
+        sequential = [engine.match(**query) for query in queries]
+        if engine.match_batch(profiles) != sequential:
+            raise AssertionError("Batch results differ from sequential match()")
+
+        sequential_time = timed(lambda: [engine.match(**query) for query in queries])
+        batch_time = timed(lambda: engine.match_batch(profiles))
+        print(f"{len(profiles):>9} {size:>10} {sequential_time:>15.3f} {batch_time:>10.3f} "
+              f"{sequential_time / batch_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
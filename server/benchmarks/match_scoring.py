@@ -0,0 +1,149 @@
+"""Benchmark the vectorized /api/match scorer against the original iterrows loop.
+
+Usage: python -m server.benchmarks.match_scoring [--sizes 1000 10000 100000]
+"""
+import argparse
+import os
+import time
+from typing import Dict, List, Any
+import numpy as np
+import pandas as pd
+from server.llm.vc_similarity import sequence_similarity
+from server.llm.vc_scoring import (
+    SIMILARITY_THRESHOLD,
+    VCScoringEngine,
+    normalize_industry,
+    calculate_similarity,
+    infer_startup_stage_from_valuation,
+    is_stage_compatible,
+    check_existing_investor_match,
+)
+
+WORKSPACE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+QUERIES = [
+    {"industry": "Artificial intelligence", "city": "Beijing", "country": "China", "valuation": 140, "has_investor": "Sequoia Capital China, SIG Asia Investments"},
+    {"industry": "Fintech", "city": "San Francisco", "country": "United States", "valuation": 4.5, "has_investor": "Accel, Index Ventures"},
+    {"industry": "Supply chain, logistics, & delivery", "city": "Berlin", "country": "Germany", "valuation": 1.2, "has_investor": ""},
+    {"industry": "Quantum sensing", "city": "Boston", "country": "United States", "valuation": 0, "has_investor": "Founders Fund"},
+]
+
+
+def legacy_match(df_vc: pd.DataFrame, industry: str, city: str, country: str, valuation: float,
+                 has_investor: str = "", similarity=sequence_similarity,
+                 threshold: float = 0.3) -> List[Dict[str, Any]]:
+    """The original per-investor loop from /api/match, kept as the baseline.
+
+    `similarity` defaults to the original SequenceMatcher ratio; pass
+    calculate_similarity to reproduce the current rules row by row.
+    """
+    results = []
+    startup_industry = normalize_industry(industry)
+    startup_city = city.lower().strip()
+    startup_country = country.lower().strip()
+    startup_investors = has_investor.lower()
+    startup_stage = infer_startup_stage_from_valuation(valuation)
+
+    for _, vc in df_vc.iterrows():
+        score = 0
+        reasons = []
+
+        vc_focus = str(vc["Fund_Focus_Clean"])
+        vc_industry_normalized = normalize_industry(vc_focus)
+
+        if startup_industry == vc_industry_normalized:
+            score += 4
+            reasons.append(f"perfect industry match ({startup_industry})")
+        elif startup_industry in vc_focus or any(word in vc_focus for word in startup_industry.split()):
+            score += 3
+            reasons.append(f"industry overlap ({startup_industry})")
+        elif similarity(startup_industry, vc_focus) > threshold:
+            score += 2
+            reasons.append("similar industry")
+
+        vc_location = str(vc["Location_Clean"])
+        if startup_country in vc_location:
+            score += 2
+            reasons.append("same country")
+        elif startup_city in vc_location:
+            score += 1
+            reasons.append("same city")
+        elif any(region in vc_location for region in ['asia', 'europe', 'america']) and startup_country != 'united states':
+            score += 1
+            reasons.append("regional match")
+
+        if is_stage_compatible(startup_stage, vc["Fund_Stage_Clean"]):
+            score += 2
+            reasons.append(f"stage fit ({startup_stage})")
+
+        if check_existing_investor_match(startup_investors, vc["Investor Name"]):
+            score += 1
+            reasons.append("existing investor")
+
+        if valuation > 50 and 'seed' in str(vc["Fund_Stage_Clean"]).lower():
+            score -= 1
+            reasons.append("valuation too high for seed-stage VC")
+
+        results.append({
+            "name": vc["Investor Name"],
+            "score": score,
+            "industry": vc["Fund Focus (Sectors)"],
+            "stage": vc["Fund Stage"],
+            "location": vc["Location"],
+            "reason": " | ".join(reasons)
+        })
+
+    return sorted(results, key=lambda x: x["score"], reverse=True)[:5]
+
+
+def synthetic_investors(size: int, seed: int = 0) -> pd.DataFrame:
+    """Resample the shipped investor files up to `size` rows with unique names."""
+    columns = ["Investor Name", "Fund Focus (Sectors)", "Fund Stage", "Location"]
+    base = pd.concat([
+        pd.read_csv(os.path.join(WORKSPACE_DIR, "VC_FundStage_Location_Sector.csv"))[columns],
+        pd.read_csv(os.path.join(WORKSPACE_DIR, "vc22.csv"))[columns],
+    ], ignore_index=True)
+    rng = np.random.default_rng(seed)
+    df = base.iloc[rng.integers(0, len(base), size)].reset_index(drop=True)
+    df["Investor Name"] = df["Investor Name"] + " " + pd.Series(np.arange(size)).astype(str)
+    df["Fund_Focus_Clean"] = df["Fund Focus (Sectors)"].fillna("").str.lower().str.strip()
+    df["Location_Clean"] = df["Location"].fillna("").str.lower().str.strip()
+    df["Fund_Stage_Clean"] = df["Fund Stage"].fillna("").str.lower().str.strip()
+    return df
+
+
+def timed(func, repeat: int = 1) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'investors':>10} {'loop (s)':>10} {'build (s)':>10} {'vector (s)':>11} {'speedup':>8}")
+    for size in args.sizes:
+        df = synthetic_investors(size)
+        build = timed(lambda: VCScoringEngine(df))
+        engine = VCScoringEngine(df)
+
+        loop_total, vector_total = 0.0, 0.0
+        for query in QUERIES:
+            expected = legacy_match(df, **query, similarity=calculate_similarity, threshold=SIMILARITY_THRESHOLD)
+            if engine.match(**query) != expected:
+                raise AssertionError(f"Vectorized results differ for {query}")
+            loop_total += timed(lambda: legacy_match(df, **query))
+            vector_total += timed(lambda: engine.match(**query), repeat=3)
+
+        loop_avg = loop_total / len(QUERIES)
+        vector_avg = vector_total / len(QUERIES)
+        print(f"{size:>10} {loop_avg:>10.4f} {build:>10.4f} {vector_avg:>11.5f} {loop_avg / vector_avg:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""ConfidenceScorer.score_pitch latency: one completion per section in turn vs. one batched completion.
+
+The stub provider models a completion's latency as time-to-first-token
+plus completion tokens / tokens-per-second (rough gpt-4-turbo figures,
+scaled by --scale). A section's scores take about TOKENS_PER_SECTION
+tokens whether they are written alone or in a batch, so the batch saves
+round trips, not generation time. "schema failure" has the batch answer
+with prose, so it pays for the batch and then the concurrent fallback.
+
+Usage: python -m server.benchmarks.pitch_scoring [--sections 9] [--pitches 5] [--scale 0.1]
+"""
+import argparse
+import asyncio
+import json
+import time
+from server.llm.confidence_scorer import SCORING_CRITERIA, ConfidenceScorer
+from server.llm.openai_client import OpenAIClient
+
+FIRST_TOKEN_SECONDS = 0.6
+TOKENS_PER_SECOND = 30.0
+TOKENS_PER_SECTION = 120
+
+STARTUP_INFO = {"startup_name": "Acme AI", "sector": "Fintech", "stage": "Seed"}
+
+
+def section_scores(seed: int):
+    return {criterion: {"score": round(0.5 + (seed * 7 + i * 3) % 10 / 20, 2), "explanation": f"{criterion} note"}
+            for i, criterion in enumerate(SCORING_CRITERIA)}
+
+
+def stub_client(scale: float, calls: list, batch_ok: bool) -> OpenAIClient:
+    client = OpenAIClient()
+    client.initialized, client.use_mock = True, False
+
+    async def complete_async(prompt, system_prompt=None, model=None, max_tokens=None, temperature=None, stop=None):
+        if prompt.startswith("Evaluate these pitch deck sections"):
+            sections = json.loads(prompt[prompt.index("{"):prompt.index("Company Context:")])
+            response = (json.dumps({name: section_scores(len(name)) for name in sections}) if batch_ok
+                        else "Here are the scores you asked for: mostly strong.")
+            tokens = TOKENS_PER_SECTION * len(sections)
+        else:
+            text = prompt.split("Text: ", 1)[1].split("\n", 1)[0]
+            response, tokens = json.dumps(section_scores(len(text.split(" ", 1)[0]))), TOKENS_PER_SECTION
+        calls.append(tokens)
+        await asyncio.sleep((FIRST_TOKEN_SECONDS + tokens / TOKENS_PER_SECOND) * scale)
+        return response
+
+    client.complete_async = complete_async
+    return client
+
+
+async def serial(scorer: ConfidenceScorer, pitch):
+    """score_pitch as it was: one section after another."""
+    return {name: await scorer.score_section_async(name, content, STARTUP_INFO) for name, content in pitch.items()}
+
+
+async def run(args):
+    pitches = [{f"section_{s}": f"section{s}-{p} text for pitch {p} with some numbers like {s * 10}%"
+                for s in range(args.sections)} for p in range(args.pitches)]
+    print(f"{args.pitches} pitches x {args.sections} sections, latencies scaled by {args.scale}:")
+    modes = [
+        ("one call per section, in turn (previous)", True, serial),
+        ("concurrent per-section calls (default)", True, lambda scorer, pitch: scorer.score_pitch_async(pitch, STARTUP_INFO)),
+        ("batched=True", True, lambda scorer, pitch: scorer.score_pitch_async(pitch, STARTUP_INFO, True)),
+        ("batched=True, schema failure -> concurrent", False,
+         lambda scorer, pitch: scorer.score_pitch_async(pitch, STARTUP_INFO, True)),
+    ]
+    for label, batch_ok, score in modes:
+        calls = []
+        scorer = ConfidenceScorer(stub_client(args.scale, calls, batch_ok))
+        latencies = []
+        for pitch in pitches:
+            start = time.perf_counter()
+            result = await score(scorer, pitch)
+            latencies.append(time.perf_counter() - start)
+            if set(result) != set(pitch):
+                raise AssertionError(f"{label} did not score every section")
+        print(f"  {label:<44} mean {sum(latencies) / len(latencies) * 1000:7.1f} ms  "
+              f"calls/pitch {len(calls) / len(pitches):4.1f}  tokens/pitch {sum(calls) / len(pitches):6.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sections", type=int, default=9)
+    parser.add_argument("--pitches", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=0.1)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Queue wait of interactive LLM calls behind a burst of background calls, with per-provider limits.
+
+Provider calls are stubbed with a fixed delay and the response cache is
+bypassed. The openai limiter is replaced by a small one (--concurrency,
+--rpm) so queueing is visible.
+
+Usage: python -m server.benchmarks.rate_limiter [--background 40] [--interactive 5] [--concurrency 4] [--latency 0.2]
+"""
+import argparse
+import asyncio
+import time
+from server.llm import llm_router, rate_limiter
+from server.llm.rate_limiter import ProviderLimiter
+
+
+def stub_complete(latency: float):
+    async def complete_async(prompt, system_prompt=None, **settings):
+        await asyncio.sleep(latency)
+        return f"Completion for {prompt}"
+    return complete_async
+
+
+async def timed_call(task_type: str, prompt: str) -> float:
+    start = time.perf_counter()
+    await llm_router.route_llm_call_async(task_type, prompt, max_tokens=100, use_cache=False)
+    return time.perf_counter() - start
+
+
+async def burst(label: str, background: int, interactive: int, interactive_task: str):
+    start = time.perf_counter()
+    background_calls = [asyncio.create_task(timed_call("match_insight", f"insight {i}")) for i in range(background)]
+    await asyncio.sleep(0.01)
+    interactive_calls = [asyncio.create_task(timed_call(interactive_task, f"{label} {i}")) for i in range(interactive)]
+    interactive_times = await asyncio.gather(*interactive_calls)
+    background_times = await asyncio.gather(*background_calls)
+    print(f"  {label:<30} interactive max {max(interactive_times):5.2f}s  "
+          f"background max {max(background_times):5.2f}s  total {time.perf_counter() - start:5.2f}s")
+
+
+async def run(args):
+    print(f"{args.background} background calls, then {args.interactive} interactive ones, "
+          f"concurrency {args.concurrency}, stub latency {args.latency}s:")
+    # Same priority as the background work: plain arrival order
+    await burst("FIFO (both background)", args.background, args.interactive, "match_insight")
+    await burst("priority queue", args.background, args.interactive, "pitch_block")
+    print(f"  stats: {rate_limiter.limiter_stats()['openai']}")
+
+    limiter = rate_limiter._limiters["openai"] = ProviderLimiter("openai", rpm=args.rpm, tpm=10 ** 9,
+                                                                  concurrency=args.concurrency)
+    limiter.requests.level = 0
+    count = max(1, args.rpm // 30)
+    start = time.perf_counter()
+    await asyncio.gather(*(timed_call("pitch_block", f"rpm {i}") for i in range(count)))
+    elapsed = time.perf_counter() - start
+    print(f"{count} calls at {args.rpm} requests/min from an empty bucket: {elapsed:5.2f}s "
+          f"(expected ~{count * 60 / args.rpm:.2f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--background", type=int, default=40)
+    parser.add_argument("--interactive", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rpm", type=int, default=600)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    llm_router.openai_client.complete_async = stub_complete(args.latency)
+    rate_limiter._limiters["openai"] = ProviderLimiter("openai", rpm=10 ** 6, tpm=10 ** 9,
+                                                       concurrency=args.concurrency)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
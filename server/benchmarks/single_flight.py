@@ -0,0 +1,67 @@
+"""Provider calls made for bursts of identical concurrent route_llm_call_async requests.
+
+The provider call is stubbed with a fixed delay and the response cache
+is bypassed, so every saved call comes from single-flight coalescing.
+
+Usage: python -m server.benchmarks.single_flight [--callers 50] [--latency 0.2]
+"""
+import argparse
+import asyncio
+import time
+from server.llm import llm_router
+
+
+def stub_complete(latency: float):
+    async def complete_async(prompt, system_prompt=None, **settings):
+        complete_async.calls += 1
+        await asyncio.sleep(latency)
+        if prompt == "fail":
+            raise RuntimeError("stub provider error")
+        return f"Completion for {prompt}"
+    complete_async.calls = 0
+    return complete_async
+
+
+async def burst(label: str, callers: int, prompt_for, cancel_first: bool = False):
+    stub = llm_router.openai_client.complete_async
+    stub.calls = 0
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(llm_router.route_llm_call_async("pitch_block", prompt_for(i), use_cache=False))
+             for i in range(callers)]
+    if cancel_first:
+        await asyncio.sleep(0)
+        tasks[0].cancel()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    errors = sum(isinstance(result, Exception) for result in results)
+    cancelled = sum(isinstance(result, asyncio.CancelledError) for result in results)
+    print(f"  {label:<34} {elapsed:6.2f}s  provider calls: {stub.calls:3d}  "
+          f"errors: {errors}  cancelled: {cancelled}")
+    return results
+
+
+async def run(callers: int):
+    print(f"{callers} concurrent callers:")
+    await burst("distinct prompts", callers, lambda i: f"prompt {i}")
+    results = await burst("identical prompts", callers, lambda i: "same prompt")
+    if len(set(results)) != 1:
+        raise AssertionError("Coalesced callers received different results")
+    await burst("identical prompts, provider fails", callers, lambda i: "fail")
+    results = await burst("identical prompts, first cancelled", callers, lambda i: "same prompt", cancel_first=True)
+    if any(result != "Completion for same prompt" for result in results[1:]):
+        raise AssertionError("Cancelling one waiter disturbed the others")
+    print(f"  stats: {llm_router.llm_flights.stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--callers", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    llm_router.openai_client.complete_async = stub_complete(args.latency)
+    asyncio.run(run(args.callers))
+
+
+if __name__ == "__main__":
+    main()
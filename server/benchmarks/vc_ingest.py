@@ -0,0 +1,33 @@
+"""Startup cost of the unified investor table: CSV ingestion vs. the binary snapshot.
+
+Usage: python -m server.benchmarks.vc_ingest
+"""
+import os
+import tempfile
+from server.benchmarks.match_scoring import timed
+from server.llm.vc_dataset import INVESTOR_SOURCES, VCDatasetRegistry
+from server.llm.vc_ingest import build_investor_table, load_investor_table, source_signature
+
+
+def main():
+    signature = source_signature(INVESTOR_SOURCES)
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        snapshot_path = os.path.join(snapshot_dir, "vc_snapshot.pkl")
+        df = load_investor_table(INVESTOR_SOURCES, signature, snapshot_path)
+        print(f"{len(df)} investors from {len(INVESTOR_SOURCES)} files, "
+              f"{df.memory_usage(deep=True).sum() / 1024:.0f} KiB in memory, "
+              f"snapshot {os.path.getsize(snapshot_path) / 1024:.0f} KiB")
+
+        parse = timed(lambda: build_investor_table(INVESTOR_SOURCES), repeat=5)
+        load = timed(lambda: load_investor_table(INVESTOR_SOURCES, signature, snapshot_path), repeat=5)
+        print(f"  parse + normalize CSVs: {parse * 1000:7.2f} ms")
+        print(f"  load snapshot:          {load * 1000:7.2f} ms")
+
+        cold = timed(lambda: VCDatasetRegistry(snapshot_path=os.path.join(snapshot_dir, "missing.pkl")).get())
+        warm = timed(lambda: VCDatasetRegistry(snapshot_path=snapshot_path).get(), repeat=5)
+        print(f"  first get_vc_dataset(), no snapshot:   {cold * 1000:7.2f} ms")
+        print(f"  first get_vc_dataset(), with snapshot: {warm * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
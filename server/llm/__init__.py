@@ -4,7 +4,7 @@ from .confidence_scorer import grade_sentence, analyze_pitch_confidence
 from .clarifier import get_clarifying_questions, get_clarifying_questions_for_pitch
 from .generator import generate_pitch_json, generate_email
 from .improver import improve_pitch_section, regenerate_pitch_section
-from .matching import match_vc_to_startup_enhanced
-from .llm_router import route_llm_call
+from .matching import match_vc_to_startup_enhanced, match_vc_to_startup_page, match_vc_to_startup_page_async
+from .llm_router import route_llm_call, route_llm_call_async, stream_llm_call, stream_llm_call_async
 
 __all__ = ['PitchAgent']
@@ -1,10 +1,11 @@
-from typing import Dict, List, Any, Optional
-from .confidence_scorer import grade_sentence
-from .clarifier import get_clarifying_questions
-from .generator import generate_pitch_json, generate_email
-from .improver import improve_pitch_section
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
+from .confidence_scorer import analyze_section_confidence, grade_sentence
+from .clarifier import flatten_questions, get_clarifying_questions_for_pitch_async
+from .generator import generate_pitch_json_async, generate_email_async, stream_pitch_json_async
+from .improver import improve_pitch_section_async
 from .llm_router import route_llm_call
-from .matching import match_vc_to_startup_enhanced
+from .match_pagination import InvalidCursorError
+from .matching import match_vc_to_startup_page_async
 from .db import DatabaseManager
 
 class PitchAgent:
@@ -46,39 +47,61 @@ class PitchAgent:
             print(f"Startup info received: {self.startup_info}")
             
             # Generate pitch sections with proper field mapping
-            self.pitch_data = generate_pitch_json(
-                startup_name=self.startup_info.get('startup_name', ''),
-                industry=self.startup_info.get('sector', ''),
-                product=self.startup_info.get('product', ''),
-                traction=self.startup_info.get('traction', ''),
-                ask=self.startup_info.get('raise_amount', ''),  # Fixed field name
-                stage=self.startup_info.get('stage', '')
-            )
-            
-            # Save to database
-            if self.startup_id:
-                try:
-                    await self.db.save_pitch_deck(
-                        self.startup_id,
-                        self.pitch_data
-                    )
-                except Exception as db_error:
-                    print(f"Database save error (non-critical): {str(db_error)}")
+            self.pitch_data = await generate_pitch_json_async(**self._pitch_inputs())
             
+            await self._save_pitch_data()
             return self.pitch_data
         except Exception as e:
             print(f"Detailed error in generate_initial_pitch: {str(e)}")
             raise Exception(f"Error generating pitch: {str(e)}")
+    
+    async def stream_initial_pitch(self) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """generate_initial_pitch, yielding each section as soon as it is generated"""
+        try:
+            self.pitch_data = {}
+            async for section, data in stream_pitch_json_async(**self._pitch_inputs()):
+                self.pitch_data[section] = data
+                yield section, data
+            
+            await self._save_pitch_data()
+        except Exception as e:
+            print(f"Detailed error in stream_initial_pitch: {str(e)}")
+            raise Exception(f"Error generating pitch: {str(e)}")
+    
+    def _pitch_inputs(self) -> Dict[str, str]:
+        return dict(
+            startup_name=self.startup_info.get('startup_name', ''),
+            industry=self.startup_info.get('sector', ''),
+            product=self.startup_info.get('product', ''),
+            traction=self.startup_info.get('traction', ''),
+            ask=self.startup_info.get('raise_amount', ''),  # Fixed field name
+            stage=self.startup_info.get('stage', '')
+        )
+    
+    def _user_inputs(self) -> List[str]:
+        """The inputs the pitch was generated from, as confidence scoring sees them"""
+        return list(self._pitch_inputs().values())
+    
+    async def _save_pitch_data(self):
+        # Save to database
+        if self.startup_id:
+            try:
+                await self.db.save_pitch_deck(
+                    self.startup_id,
+                    self.pitch_data
+                )
+            except Exception as db_error:
+                print(f"Database save error (non-critical): {str(db_error)}")
 
     
-    async def get_clarifying_questions(self) -> List[Dict[str, str]]:
+    async def get_clarifying_questions(self) -> Dict[str, List[str]]:
         """Get clarifying questions for low-confidence sections"""
         try:
             if not self.pitch_data:
                 print("No pitch data available for generating questions")
-                return []
+                return {}
                 
-            questions = get_clarifying_questions(self.pitch_data)
+            questions = await get_clarifying_questions_for_pitch_async(self.pitch_data)
             
             # Save feedback to database
             try:
@@ -104,8 +127,8 @@ class PitchAgent:
             return questions
         except Exception as e:
             print(f"Error getting clarifying questions: {str(e)}")
-            # Return empty list instead of failing
-            return []
+            # Return no questions instead of failing
+            return {}
     
     async def improve_section(self, section_name: str, user_input: str) -> Dict[str, Any]:
         """Improve a specific section based on user input"""
@@ -161,14 +184,17 @@ class PitchAgent:
             print(f"Found matching section: {matching_section}")
             
             # Now improve the section
-            improved_section = improve_pitch_section(
+            improved_section = await improve_pitch_section_async(
                 matching_section,
                 self.pitch_data[matching_section]['text'],
                 user_input
             )
             
-            # Update the pitch data
-            self.pitch_data[matching_section] = improved_section
+            # Update the pitch data, rescoring only the changed section
+            self.pitch_data[matching_section] = {
+                **improved_section,
+                **analyze_section_confidence(improved_section['text'], self._user_inputs())
+            }
             
             # Save updated pitch to database
             if self.startup_id:
@@ -187,13 +213,21 @@ class PitchAgent:
     
     async def match_investors(self) -> List[Dict[str, Any]]:
         """Find matching investors based on startup profile"""
+        page = await self.match_investors_page()
+        return page['matches']
+    
+    async def match_investors_page(self, limit: int = 5, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Find one page of matching investors and the cursor for the next page"""
         try:
-            matches = match_vc_to_startup_enhanced(
+            page = await match_vc_to_startup_page_async(
                 self.startup_info.get('startup_name', ''),
                 self.startup_info.get('sector', ''),
                 self.startup_info.get('stage', ''),
-                self.startup_info.get('location', '')
+                self.startup_info.get('location', ''),
+                limit=limit,
+                cursor=cursor
             )
+            matches = page['matches']
             
             # Save matches to database
             if self.startup_id:
@@ -205,14 +239,16 @@ class PitchAgent:
                         match.get('reasons', [])
                     )
             
-            return matches
+            return page
+        except InvalidCursorError:
+            raise
         except Exception as e:
             raise Exception(f"Error matching investors: {str(e)}")
     
     async def generate_email(self, investor: Dict[str, str]) -> str:
         """Generate a personalized email for an investor"""
         try:
-            email_content = generate_email(
+            email_content = await generate_email_async(
                 self.pitch_data,
                 investor.get('name', ''),
                 self.startup_info.get('your_name', ''),
@@ -246,7 +282,7 @@ class PitchAgent:
         try:
             status = {
                 'pitch_data': self.pitch_data,
-                'clarifying_questions': await self.get_clarifying_questions()
+                'clarifying_questions': flatten_questions(await self.get_clarifying_questions())
             }
             
             # Add analytics if available
@@ -1,6 +1,12 @@
 import os
-from anthropic import Anthropic
-from typing import Dict, Any, Optional
+import asyncio
+import time
+import weakref
+from anthropic import Anthropic, AsyncAnthropic
+from typing import Dict, Any, AsyncIterator, List
+from .llm_fallback import FallbackText
+from .openai_client import HEALTH_CHECK_TIMEOUT
+from .circuit_breaker import get_breaker
 
 class AnthropicClient:
     def __init__(self):
@@ -9,25 +15,130 @@ class AnthropicClient:
         if api_key:
             api_key = api_key.strip()
         
+        self.api_key = api_key
         self.client = Anthropic(api_key=api_key)
+        # One AsyncAnthropic per event loop; its connection pool is bound to the loop
+        self._async_clients = weakref.WeakKeyDictionary()
         self.model = "claude-3-haiku-20240307"
+        self.temperature = 0.7
+        self.max_tokens = 2000
+        # Readiness as seen by the last health_check()
+        self.status = "pending"
+        self.status_detail = None
+        self.checked_at = None
         print("Using real Anthropic API client")
     
-    def complete(self, prompt: str, system_prompt: str = None) -> str:
+    async def health_check(self, timeout: float = HEALTH_CHECK_TIMEOUT) -> Dict[str, Any]:
+        """Probe the API once, off the request path, and record readiness.
+        
+        Also opens a pooled connection on the running loop's async client.
+        """
+        if not self.api_key:
+            self.status, self.status_detail = "mock", "ANTHROPIC_API_KEY is not set"
+        else:
+            try:
+                await asyncio.wait_for(self._get_async_client().models.list(limit=1), timeout)
+                self.status, self.status_detail = "ready", None
+            except Exception as e:
+                self.status, self.status_detail = "degraded", f"{type(e).__name__}: {e}"
+                print(f"Anthropic health check failed: {self.status_detail}")
+        self.checked_at = time.time()
+        return self.readiness()
+    
+    def readiness(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "detail": self.status_detail,
+            "checked_at": self.checked_at,
+            "model": self.model,
+        }
+    
+    def complete(self, prompt: str, system_prompt: str = None, model: str = None, max_tokens: int = None,
+                 temperature: float = None, stop: List[str] = None) -> str:
+        # Don't even try while the API is known to be failing
+        breaker = get_breaker("anthropic", model or self.model)
+        if not breaker.allow():
+            return self._mock_response(prompt)
+        
         try:
             message = self.client.messages.create(
-                model=self.model,
-                max_tokens=2000,
-                temperature=0.7,
-                system=system_prompt if system_prompt else None,
-                messages=[{"role": "user", "content": prompt}]
+                **self._request(prompt, system_prompt, model, max_tokens, temperature, stop)
+            )
+            breaker.record_success()
+            return message.content[0].text
+        except Exception as e:
+            breaker.record_failure()
+            print(f"Error with Anthropic API: {str(e)}")
+            # Fallback to a simple mock response
+            return self._mock_response(prompt)
+    
+    async def complete_async(self, prompt: str, system_prompt: str = None, model: str = None, max_tokens: int = None,
+                             temperature: float = None, stop: List[str] = None) -> str:
+        """Awaitable complete(); the request itself never blocks the event loop."""
+        breaker = get_breaker("anthropic", model or self.model)
+        if not breaker.allow():
+            return self._mock_response(prompt)
+        
+        try:
+            message = await self._get_async_client().messages.create(
+                **self._request(prompt, system_prompt, model, max_tokens, temperature, stop)
             )
+            breaker.record_success()
             return message.content[0].text
         except Exception as e:
+            breaker.record_failure()
             print(f"Error with Anthropic API: {str(e)}")
             # Fallback to a simple mock response
             return self._mock_response(prompt)
     
+    async def stream_async(self, prompt: str, system_prompt: str = None, model: str = None, max_tokens: int = None,
+                           temperature: float = None, stop: List[str] = None) -> AsyncIterator[str]:
+        """complete_async() as a stream of text deltas."""
+        breaker = get_breaker("anthropic", model or self.model)
+        if not breaker.allow():
+            yield self._mock_response(prompt)
+            return
+        
+        streamed = False
+        try:
+            stream = await self._get_async_client().messages.create(
+                **self._request(prompt, system_prompt, model, max_tokens, temperature, stop), stream=True
+            )
+            async for event in stream:
+                if event.type == "content_block_delta" and event.delta.type == "text_delta":
+                    streamed = True
+                    yield event.delta.text
+            breaker.record_success()
+        except Exception as e:
+            breaker.record_failure()
+            print(f"Error with Anthropic API: {str(e)}")
+            # Text already sent cannot be taken back; only fall back before the first delta
+            if streamed:
+                raise
+            yield self._mock_response(prompt)
+    
+    def _request(self, prompt: str, system_prompt: str = None, model: str = None, max_tokens: int = None,
+                 temperature: float = None, stop: List[str] = None) -> Dict[str, Any]:
+        """messages.create arguments; unset settings use the client defaults"""
+        request = {
+            "model": model or self.model,
+            "max_tokens": max_tokens or self.max_tokens,
+            "temperature": self.temperature if temperature is None else temperature,
+            "system": system_prompt if system_prompt else None,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        if stop:
+            request["stop_sequences"] = stop
+        return request
+    
+    def _get_async_client(self) -> AsyncAnthropic:
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = AsyncAnthropic(api_key=self.api_key)
+            self._async_clients[loop] = client
+        return client
+    
     def improve(self, text: str, feedback: str) -> str:
         try:
             prompt = f"""I need to improve this text based on feedback:
@@ -49,6 +160,10 @@ class AnthropicClient:
             print(f"Error improving text: {str(e)}")
             return self._mock_response(feedback)
     
+    def fallback_response(self, prompt: str) -> str:
+        """Canned response used when no real answer is available in time."""
+        return self._mock_response(prompt)
+    
     def _mock_response(self, input_text: str) -> str:
         """Provide a simple mock response when the API is unavailable"""
-        return f"I've analyzed your input about '{input_text[:30]}...' and here's an improved version: This is an enhanced version that addresses your feedback with more compelling and specific language, incorporating metrics and strong narrative elements."
+        return FallbackText(f"I've analyzed your input about '{input_text[:30]}...' and here's an improved version: This is an enhanced version that addresses your feedback with more compelling and specific language, incorporating metrics and strong narrative elements.")
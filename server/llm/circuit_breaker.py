@@ -0,0 +1,131 @@
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+# Error rate over the last BREAKER_WINDOW_SECONDS that opens a breaker, once it has seen BREAKER_MIN_CALLS calls
+BREAKER_WINDOW_SECONDS = float(os.getenv("LLM_BREAKER_WINDOW_SECONDS", "60"))
+BREAKER_MIN_CALLS = int(os.getenv("LLM_BREAKER_MIN_CALLS", "5"))
+BREAKER_ERROR_RATE = float(os.getenv("LLM_BREAKER_ERROR_RATE", "0.5"))
+# Seconds an open breaker rejects calls before letting a probe through
+BREAKER_COOLDOWN_SECONDS = float(os.getenv("LLM_BREAKER_COOLDOWN_SECONDS", "30"))
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker for one provider and model.
+
+    Closed: calls go through and their outcomes fill a sliding time window;
+    when the window's error rate reaches the threshold the breaker opens.
+    Open: allow() is False until the cooldown has passed. Half-open: one
+    probe call is allowed (another only if the probe has not reported back
+    within a cooldown); its success closes the breaker, its failure opens
+    it again.
+    """
+
+    def __init__(self, name: str, window_seconds: float = BREAKER_WINDOW_SECONDS,
+                 min_calls: int = BREAKER_MIN_CALLS, error_rate: float = BREAKER_ERROR_RATE,
+                 cooldown_seconds: float = BREAKER_COOLDOWN_SECONDS):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.cooldown_seconds = cooldown_seconds
+        self.state = CLOSED
+        self.opened_at: Optional[float] = None
+        self.probe_started: Optional[float] = None
+        self.outcomes = deque()
+        self._lock = threading.Lock()
+        self.times_opened = 0
+        self.short_circuited = 0
+
+    def allow(self) -> bool:
+        """Whether a call may go to the provider now; counts rejected calls."""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN and now - self.opened_at >= self.cooldown_seconds:
+                self.state = HALF_OPEN
+                self.probe_started = None
+            if self.state == HALF_OPEN:
+                if self.probe_started is None or now - self.probe_started >= self.cooldown_seconds:
+                    self.probe_started = now
+                    return True
+            elif self.state == CLOSED:
+                return True
+            self.short_circuited += 1
+            return False
+
+    def is_open(self) -> bool:
+        """True while the breaker rejects every call (open and still cooling down)."""
+        with self._lock:
+            return self.state == OPEN and time.monotonic() - self.opened_at < self.cooldown_seconds
+
+    def record_success(self):
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self.state = CLOSED
+                self.outcomes.clear()
+            self._record(True)
+
+    def record_failure(self):
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._open()
+                return
+            self._record(False)
+            if self.state == CLOSED:
+                calls, failures = self._window()
+                if calls >= self.min_calls and failures / calls >= self.error_rate:
+                    self._open()
+
+    def _record(self, ok: bool):
+        self.outcomes.append((time.monotonic(), ok))
+
+    def _window(self):
+        cutoff = time.monotonic() - self.window_seconds
+        while self.outcomes and self.outcomes[0][0] < cutoff:
+            self.outcomes.popleft()
+        failures = sum(1 for _, ok in self.outcomes if not ok)
+        return len(self.outcomes), failures
+
+    def _open(self):
+        print(f"Circuit breaker {self.name} opened; calls short-circuit for {self.cooldown_seconds}s")
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            calls, failures = self._window()
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = round(max(0.0, self.opened_at + self.cooldown_seconds - time.monotonic()), 2)
+            return {
+                "state": self.state,
+                "calls_in_window": calls,
+                "failures_in_window": failures,
+                "error_rate": round(failures / calls, 3) if calls else 0.0,
+                "retry_in_seconds": retry_in,
+                "times_opened": self.times_opened,
+                "short_circuited": self.short_circuited,
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(provider: str, model: str) -> CircuitBreaker:
+    """Shared breaker for a provider and model, created on first use."""
+    name = f"{provider}:{model}"
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name)
+        return breaker
+
+def breaker_stats() -> Dict[str, Dict[str, Any]]:
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.stats() for breaker in breakers}
@@ -1,10 +1,26 @@
-from typing import List, Dict, Any
-from .llm_router import route_llm_call
+import asyncio
+import os
+import time
+from typing import List, Dict, Any, Optional
+from .llm_fallback import FallbackText
+from .llm_router import route_llm_call_async, run_sync
 from .openai_client import OpenAIClient
 import json
 
+# Sections scoring below this get clarifying questions
+CLARIFY_THRESHOLD = 0.7
+# Bounds for generating questions across a pitch's low-confidence sections
+CLARIFY_CONCURRENCY = 4
+CLARIFY_DEADLINE_SECONDS = 15.0
+# CLARIFY_MERGED=1 asks for every section's questions in one prompt by default
+CLARIFY_MERGED = os.getenv("CLARIFY_MERGED", "0") == "1"
+
 def get_clarifying_questions(section_name: str, section_text: str, confidence_score: Dict[str, Any]) -> List[str]:
     """Generate clarifying questions for a pitch section marked as red."""
+    return run_sync(get_clarifying_questions_async(section_name, section_text, confidence_score))
+
+async def get_clarifying_questions_async(section_name: str, section_text: str, confidence_score: Dict[str, Any]) -> List[str]:
+    """Awaitable get_clarifying_questions."""
     prompt = f"""You are an AI pitch advisor helping improve a startup pitch. A section of the pitch has been marked as needing clarification.
 
 Section: {section_name}
@@ -20,7 +36,7 @@ Generate 2-3 specific questions that would help gather information to improve th
 Format your response as a Python list of questions only.
 """
 
-    response = route_llm_call(
+    response = await route_llm_call_async(
         task_type='clarify_question',
         prompt=prompt,
         max_tokens=300
@@ -41,20 +57,115 @@ Format your response as a Python list of questions only.
         questions = response.split('\n')
         return [q.strip('- ').strip() for q in questions if q.strip('- ').strip()]
 
-def get_clarifying_questions_for_pitch(analyzed_pitch: Dict[str, Any]) -> Dict[str, List[str]]:
+def section_reason(section_data: Dict[str, Any]) -> str:
+    """Why a section needs clarification: its own 'reason', else those of its low-confidence sentences."""
+    if section_data.get('reason'):
+        return section_data['reason']
+    reasons = sorted({
+        sentence['reason'] for sentence in section_data.get('sentences', [])
+        if sentence.get('reason') and sentence.get('confidence', 1.0) < CLARIFY_THRESHOLD
+    })
+    return "; ".join(reasons) or f"its confidence score is below {CLARIFY_THRESHOLD}"
+
+async def get_merged_clarifying_questions_async(sections: Dict[str, Dict[str, Any]],
+                                                budget: Optional[float] = None) -> Optional[Dict[str, List[str]]]:
+    """Questions for several sections from one prompt, or None if the response
+    is a fallback or not a JSON object mapping every section to a list of questions."""
+    section_details = {
+        section_name: {"text": section_data['text'], "reason": section_reason(section_data)}
+        for section_name, section_data in sections.items()
+    }
+    prompt = f"""You are an AI pitch advisor helping improve a startup pitch. These sections of the pitch have been marked as needing clarification, each with its current text and the reason:
+
+{json.dumps(section_details, indent=2)}
+
+For each section, generate 2-3 specific questions that would help gather information to improve it. Focus on:
+1. Requesting concrete data and metrics
+2. Clarifying vague or generic statements
+3. Getting specific examples or proof points
+
+Format your response as a JSON object only, mapping each of these section names to its list of questions: {', '.join(sections)}
+"""
+
+    response = await route_llm_call_async(
+        task_type='clarify_pitch',
+        prompt=prompt,
+        max_tokens=300 * len(sections),
+        budget=budget
+    )
+    if isinstance(response, FallbackText):
+        return None
+    
+    try:
+        questions = json.loads(response.strip().replace('```json', '').replace('```', '').strip())
+    except ValueError:
+        return None
+    if not isinstance(questions, dict) or any(not isinstance(questions.get(section_name), list) for section_name in sections):
+        return None
+    return {
+        section_name: [q.strip() for q in questions[section_name] if isinstance(q, str) and q.strip()]
+        for section_name in sections
+    }
+
+def flatten_questions(questions: Dict[str, List[str]]) -> List[str]:
+    """Every section's questions as one list, in section order."""
+    return [question for section_questions in questions.values() for question in section_questions]
+
+def get_clarifying_questions_for_pitch(analyzed_pitch: Dict[str, Any], concurrency: int = CLARIFY_CONCURRENCY,
+                                       deadline: float = CLARIFY_DEADLINE_SECONDS,
+                                       merged: bool = CLARIFY_MERGED) -> Dict[str, List[str]]:
     """Generate clarifying questions for all sections with low confidence scores."""
-    clarifying_questions = {}
+    return run_sync(get_clarifying_questions_for_pitch_async(analyzed_pitch, concurrency, deadline, merged))
+
+async def get_clarifying_questions_for_pitch_async(analyzed_pitch: Dict[str, Any],
+                                                   concurrency: int = CLARIFY_CONCURRENCY,
+                                                   deadline: float = CLARIFY_DEADLINE_SECONDS,
+                                                   merged: bool = CLARIFY_MERGED) -> Dict[str, List[str]]:
+    """Awaitable get_clarifying_questions_for_pitch.
     
-    for section_name, section_data in analyzed_pitch.items():
-        # Check if section has confidence score and it's below threshold
-        if section_data.get('confidence', 1.0) < 0.7:
-            questions = get_clarifying_questions(
-                section_name,
-                section_data['text'],
-                section_data
-            )
-            if questions:
-                clarifying_questions[section_name] = questions
+    Sections below CLARIFY_THRESHOLD get questions from at most
+    `concurrency` LLM calls at once, and the whole step waits no longer
+    than `deadline` seconds; sections whose call is late or failed are left
+    out. With `merged`, all of them are asked about in one prompt instead,
+    falling back to the per-section calls for what is left of the deadline
+    if that response is unusable.
+    """
+    # Check if section has confidence score and it's below threshold
+    sections = {
+        section_name: section_data
+        for section_name, section_data in analyzed_pitch.items()
+        if section_data.get('confidence', 1.0) < CLARIFY_THRESHOLD
+    }
+    if not sections:
+        return {}
+    
+    started = time.monotonic()
+    if merged:
+        questions = await get_merged_clarifying_questions_async(sections, budget=deadline)
+        if questions is not None:
+            return {section_name: qs for section_name, qs in questions.items() if qs}
+        print("Merged clarifying questions were unusable; asking about each section separately")
+    
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def ask(section_name: str, section_data: Dict[str, Any]) -> List[str]:
+        async with semaphore:
+            return await get_clarifying_questions_async(section_name, section_data['text'],
+                                                        {**section_data, 'reason': section_reason(section_data)})
+
+    tasks = [asyncio.ensure_future(ask(section_name, section_data)) for section_name, section_data in sections.items()]
+    done, pending = await asyncio.wait(tasks, timeout=max(0.0, deadline - (time.monotonic() - started)))
+    for task in pending:
+        task.cancel()
+    
+    clarifying_questions = {}
+    for section_name, task in zip(sections, tasks):
+        if task in pending:
+            print(f"Clarifying questions for {section_name} missed the {deadline}s deadline")
+        elif task.exception() is not None:
+            print(f"Clarifying questions failed for {section_name}: {str(task.exception())}")
+        elif task.result():
+            clarifying_questions[section_name] = task.result()
     
     return clarifying_questions
 
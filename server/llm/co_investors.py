@@ -0,0 +1,119 @@
+from collections import deque
+from typing import Dict, Iterable, List
+import numpy as np
+import pandas as pd
+
+
+def investor_name_keywords(vc_name) -> List[str]:
+    """Keywords of a VC name that identify it in a startup's investor list."""
+    if pd.isna(vc_name):
+        return []
+    vc_name = str(vc_name).lower()
+    vc_keywords = vc_name.replace('ventures', '').replace('capital', '').replace('partners', '').strip().split()
+    return [keyword for keyword in vc_keywords if len(keyword) > 2]
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over a fixed list of keywords.
+
+    One left-to-right pass over a text reports every keyword occurring in
+    it as a substring, however many keywords there are. States are a trie
+    of the keywords; each state's failure link points to the longest
+    proper suffix that is also a trie path, and its outputs include the
+    outputs of that suffix.
+    """
+
+    def __init__(self, keywords: List[str]):
+        self.keywords = list(keywords)
+        self.goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for keyword_id, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(keyword_id)
+
+        # Breadth-first, so a state's failure target is finished before the state
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[child] = target if target != child else 0
+                outputs[child].extend(outputs[self.fail[child]])
+                queue.append(child)
+        self.outputs = [tuple(dict.fromkeys(output)) for output in outputs]
+
+    def find(self, text: str) -> np.ndarray:
+        """Boolean array: which keywords occur in `text`."""
+        present = np.zeros(len(self.keywords), dtype=bool)
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                present[list(outputs[state])] = True
+        return present
+
+
+class CoInvestorDetector:
+    """Finds which known investors appear in a startup's investor list.
+
+    Uses the same rule as check_existing_investor_match: an investor is
+    present if any of its name keywords (name minus ventures/capital/
+    partners, words longer than two characters) occurs in the lowercased
+    text. Investor ids are positions in the `names` passed in.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        names = list(names)
+        self.size = len(names)
+        keyword_ids: Dict[str, int] = {}
+        pair_rows, pair_keywords = [], []
+        for row, name in enumerate(names):
+            for keyword in investor_name_keywords(name):
+                pair_rows.append(row)
+                pair_keywords.append(keyword_ids.setdefault(keyword, len(keyword_ids)))
+        self.automaton = KeywordAutomaton(list(keyword_ids))
+        self.keyword_rows = np.array(pair_rows, dtype=np.int64)
+        self.keyword_ids = np.array(pair_keywords, dtype=np.int64)
+
+    def present(self, startup_investors: str) -> np.ndarray:
+        """Boolean array over investor ids: which investors the text mentions."""
+        hits = np.zeros(self.size, dtype=bool)
+        if not startup_investors or not self.automaton.keywords:
+            return hits
+        present = self.automaton.find(startup_investors.lower())
+        hits[self.keyword_rows[present[self.keyword_ids]]] = True
+        return hits
+
+    def investor_ids(self, startup_investors: str) -> np.ndarray:
+        """Sorted ids of every investor the text mentions."""
+        return np.flatnonzero(self.present(startup_investors))
+
+    def annotate(self, investor_lists: Iterable[str]) -> List[np.ndarray]:
+        """investor_ids for each of many startups' investor lists.
+
+        Identical lists (common in exports) are scanned once.
+        """
+        cache: Dict[str, np.ndarray] = {}
+        results = []
+        for text in investor_lists:
+            text = "" if pd.isna(text) else str(text).lower()
+            ids = cache.get(text)
+            if ids is None:
+                ids = cache[text] = self.investor_ids(text)
+            results.append(ids)
+        return results
@@ -0,0 +1,99 @@
+"""Bulk confidence scoring of pitch corpora: JSON lines in, graded JSON lines out.
+
+Each input line is a pitch:
+
+    {"id": "...", "pitch": {"problem": {"text": "..."} or "...", ...}, "user_inputs": ["...", ...]}
+
+and each output line is {"id": ..., "analysis": <analyze_pitch_confidence result>},
+or {"id": ..., "error": "..."} for a line that could not be graded. Output
+is in input order.
+
+Usage: python -m server.llm.confidence_batch [input.jsonl|-] -o output.jsonl [--workers N] [--chunk-size N]
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from .confidence_scorer import analyze_pitch_confidence
+
+# Lines per task sent to a worker process
+DEFAULT_CHUNK_SIZE = 64
+# Chunks queued or running per worker; bounds memory to about workers * this * chunk_size lines
+CHUNKS_PER_WORKER = 4
+
+
+def score_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Output record for one parsed input record."""
+    pitch = {
+        section: data if isinstance(data, dict) else {"text": str(data)}
+        for section, data in record["pitch"].items()
+    }
+    return {"id": record.get("id"), "analysis": analyze_pitch_confidence(pitch, record.get("user_inputs") or [])}
+
+
+def score_lines(lines: List[str]) -> List[str]:
+    """Output lines for a chunk of input lines; runs in the worker processes."""
+    scored = []
+    for line in lines:
+        record: Dict[str, Any] = {}
+        try:
+            record = json.loads(line)
+            result = score_record(record)
+        except Exception as e:
+            result = {"id": record.get("id") if isinstance(record, dict) else None, "error": str(e)}
+        scored.append(json.dumps(result))
+    return scored
+
+
+def iter_score_jsonl(lines: Iterable[str], workers: Optional[int] = None,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """Score JSON lines across `workers` processes (default: one per CPU) and yield output lines in order.
+
+    Input is read lazily, `chunk_size` non-blank lines per task, and only
+    CHUNKS_PER_WORKER chunks per worker are in flight at once, so memory
+    stays bounded however long the input is. workers=1 scores in this
+    process.
+    """
+    workers = workers or os.cpu_count() or 1
+    lines = (line for line in lines if line.strip())
+    chunks = iter(lambda: list(itertools.islice(lines, chunk_size)), [])
+    if workers == 1:
+        for chunk in chunks:
+            yield from score_lines(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(score_lines, chunk))
+            if len(pending) >= workers * CHUNKS_PER_WORKER:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", nargs="?", default="-", help="JSONL file of pitches, or - for stdin")
+    # Not stdout: importing server.llm prints client status lines there
+    parser.add_argument("-o", "--output", required=True, help="JSONL file for graded pitches")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        with open(args.output, "w", encoding="utf-8") as sink:
+            for line in iter_score_jsonl(source, args.workers, args.chunk_size):
+                sink.write(line + "\n")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+
+if __name__ == "__main__":
+    main()
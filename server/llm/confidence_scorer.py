@@ -1,6 +1,14 @@
+import asyncio
+import json
+import os
 import re
-from typing import Dict, List, Any
-from .openai_client import OpenAIClient
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Hashable, List, Any, Optional, Tuple
+from .openai_client import OpenAIClient, parse_json_response, valid_criterion_scores
+from .llm_fallback import FallbackText
+from .llm_router import run_sync
 
 
 def contains_user_input(sentence: str, user_inputs: List[str]) -> bool:
@@ -11,107 +19,195 @@ def contains_user_input(sentence: str, user_inputs: List[str]) -> bool:
     return any(user_input.lower() in sentence_lower for user_input in user_inputs if user_input)
 
 
-def grade_sentence(sentence: str, user_inputs: List[str]) -> Dict[str, Any]:
-    """
-    Grade a sentence based on content analysis and return color code and confidence score.
+# Phrases whose presence decides a sentence's grade (matched case-insensitively as substrings)
+BENEFIT_PHRASES = ["per", "resulted in", "led to", "enabled", "enabling", "unlock", "unlocking"]
+RED_FLAGS = [
+    "we believe", "we imagine", "we're redefining", "we aim to", "revolutionize",
+    "game-changing", "disrupt", "visionary", "transforming", "we think",
+    "cutting-edge", "next-generation", "state-of-the-art", "innovative",
+    "groundbreaking", "paradigm shift"
+]
+VAGUE_TERMS = [
+    "some", "many", "various", "aim", "target", "expected",
+    "potential", "several", "multiple", "numerous", "significant"
+]
+# Metrics with context (e.g. '%', 'ARR', 'million', 'billion')
+CONTEXT_DATA_PATTERN = re.compile(r"\d+%|\d+\s*(person-hours|hours|arr|million|billion)")
 
-    Returns:
-        Dict with keys:
-        - color: 'green', 'orange', or 'red'
-        - confidence: float between 0 and 1
-        - reason: explanation for the grading
-    """
-    sentence_lower = sentence.lower()
-    user_matches = [ui for ui in user_inputs if ui and ui.lower() in sentence_lower]
+# Sentences split on sentence endings
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+# Sentence and section grades remembered across sessions (template sentences repeat across founders)
+SENTENCE_GRADE_CACHE_SIZE = int(os.getenv("SENTENCE_GRADE_CACHE_SIZE", "100000"))
+SECTION_GRADE_CACHE_SIZE = int(os.getenv("SECTION_GRADE_CACHE_SIZE", "10000"))
 
-    # 1. Green: multiple data points plus context (e.g., '%', 'ARR', 'million', 'billion')
-    if len(user_matches) >= 2 and re.search(r"\d+%|\d+\s*(person-hours|hours|arr|million|billion)", sentence_lower):
-        return {
-            "color": "green",
-            "confidence": 0.9,
-            "reason": "Contains multiple specific data points plus contextual insight"
-        }
 
-    # 2. Green: references multiple specific user inputs
-    if len(user_matches) >= 2:
-        return {
-            "color": "green",
-            "confidence": 0.85,
-            "reason": "References multiple user-provided data points"
-        }
+def user_inputs_key(user_inputs: List[str]) -> Tuple[str, ...]:
+    """The user-input set as grading sees it: non-empty inputs, lowercased, in any order."""
+    return tuple(sorted(user_input.lower() for user_input in user_inputs if user_input))
 
-    # 3. Orange: single data point; check for benefit/outcome phrasing
-    if len(user_matches) == 1:
-        benefit_phrases = ["per", "resulted in", "led to", "enabled", "enabling", "unlock", "unlocking"]
-        if any(bp in sentence_lower for bp in benefit_phrases):
+
+class GradeCache:
+    """Thread-safe LRU of grades keyed by (user_inputs_key, text)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+sentence_grades = GradeCache(SENTENCE_GRADE_CACHE_SIZE)
+section_grades = GradeCache(SECTION_GRADE_CACHE_SIZE)
+
+
+class SentenceGrader:
+    """grade_sentence for a fixed set of user inputs, lowercased once rather than for every sentence."""
+    
+    def __init__(self, user_inputs: List[str]):
+        self.user_inputs = list(user_inputs)
+        self.key = user_inputs_key(self.user_inputs)
+        self.user_phrases = tuple(user_input.lower() for user_input in self.user_inputs if user_input)
+    
+    def grade_text(self, text: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """(sentence, grade) for every sentence of a text; grades come from sentence_grades when known."""
+        graded = []
+        for sentence in SENTENCE_BOUNDARY.split(text.strip()):
+            if not sentence:
+                continue
+            key = (self.key, sentence)
+            grade = sentence_grades.get(key)
+            if grade is None:
+                grade = self.grade(sentence)
+                sentence_grades.put(key, grade)
+            graded.append((sentence, grade))
+        return graded
+    
+    def grade(self, sentence: str) -> Dict[str, Any]:
+        """Same result as grade_sentence(sentence, user_inputs)."""
+        sentence_lower = sentence.lower()
+        user_matches = sum(1 for phrase in self.user_phrases if phrase in sentence_lower)
+        
+        # 1. Green: multiple data points plus context (e.g., '%', 'ARR', 'million', 'billion')
+        if user_matches >= 2 and CONTEXT_DATA_PATTERN.search(sentence_lower):
+            return {
+                "color": "green",
+                "confidence": 0.9,
+                "reason": "Contains multiple specific data points plus contextual insight"
+            }
+        
+        # 2. Green: references multiple specific user inputs
+        if user_matches >= 2:
             return {
                 "color": "green",
                 "confidence": 0.85,
-                "reason": "Includes user data and demonstrates a clear benefit or outcome"
+                "reason": "References multiple user-provided data points"
+            }
+        
+        # 3. Orange: single data point; check for benefit/outcome phrasing
+        if user_matches == 1:
+            if any(bp in sentence_lower for bp in BENEFIT_PHRASES):
+                return {
+                    "color": "green",
+                    "confidence": 0.85,
+                    "reason": "Includes user data and demonstrates a clear benefit or outcome"
+                }
+            return {
+                "color": "orange",
+                "confidence": 0.6,
+                "reason": "References user input but lacks additional insight or context"
+            }
+        
+        # 4. Red flags: hype terms or unsubstantiated claims
+        if any(flag in sentence_lower for flag in RED_FLAGS):
+            return {
+                "color": "red",
+                "confidence": 0.3,
+                "reason": "Contains hype terms or unsubstantiated claims"
+            }
+        
+        # 5. Orange: vague or non-specific language
+        if any(term in sentence_lower for term in VAGUE_TERMS):
+            return {
+                "color": "orange",
+                "confidence": 0.6,
+                "reason": "Contains vague or non-specific language"
             }
+        
+        # 6. Default to orange for any other general statements
         return {
             "color": "orange",
-            "confidence": 0.6,
-            "reason": "References user input but lacks additional insight or context"
+            "confidence": 0.7,
+            "reason": "General statement without specific backing"
         }
 
-    # 4. Red flags: hype terms or unsubstantiated claims
-    red_flags = [
-        "we believe", "we imagine", "we're redefining", "we aim to", "revolutionize",
-        "game-changing", "disrupt", "visionary", "transforming", "we think",
-        "cutting-edge", "next-generation", "state-of-the-art", "innovative",
-        "groundbreaking", "paradigm shift"
-    ]
-    if any(flag in sentence_lower for flag in red_flags):
-        return {
-            "color": "red",
-            "confidence": 0.3,
-            "reason": "Contains hype terms or unsubstantiated claims"
-        }
 
-    # 5. Orange: vague or non-specific language
-    vague_terms = [
-        "some", "many", "various", "aim", "target", "expected",
-        "potential", "several", "multiple", "numerous", "significant"
-    ]
-    if any(term in sentence_lower for term in vague_terms):
-        return {
-            "color": "orange",
-            "confidence": 0.6,
-            "reason": "Contains vague or non-specific language"
-        }
+@lru_cache(maxsize=64)
+def _cached_grader(user_inputs: tuple) -> SentenceGrader:
+    return SentenceGrader(list(user_inputs))
 
-    # 6. Default to orange for any other general statements
-    return {
-        "color": "orange",
-        "confidence": 0.7,
-        "reason": "General statement without specific backing"
-    }
 
+def sentence_grader(user_inputs: List[str]) -> SentenceGrader:
+    """Shared SentenceGrader for a list of user inputs, built on first use."""
+    return _cached_grader(tuple(user_inputs))
 
-def analyze_pitch_confidence(pitch_json: Dict[str, Any], user_inputs: List[str]) -> Dict[str, Any]:
-    """
-    Analyze confidence for each section and sentence in the pitch JSON.
 
-    Args:
-        pitch_json: The pitch JSON with 'text' fields per section
-        user_inputs: List of user inputs to evaluate specificity
+def grade_sentence(sentence: str, user_inputs: List[str]) -> Dict[str, Any]:
+    """
+    Grade a sentence based on content analysis and return color code and confidence score.
 
     Returns:
-        Enhanced pitch JSON with per-sentence grading and section-level averages
+        Dict with keys:
+        - color: 'green', 'orange', or 'red'
+        - confidence: float between 0 and 1
+        - reason: explanation for the grading
+    """
+    return sentence_grader(user_inputs).grade(sentence)
+
+
+def analyze_section_confidence(section_text: str, user_inputs: List[str]) -> Dict[str, Any]:
+    """
+    Per-sentence grading and the average confidence of one section's text.
+
+    Sections already analyzed with the same user inputs (in this or any
+    other session) come from section_grades; otherwise only sentences not
+    in sentence_grades are graded.
     """
-    enhanced_pitch: Dict[str, Any] = {}
-    for section, data in pitch_json.items():
-        section_text = data.get("text", "")
-        # Split on sentence endings
-        sentences = re.split(r'(?<=[.!?])\s+', section_text.strip())
+    grader = sentence_grader(user_inputs)
+    key = (grader.key, section_text)
+    analyzed = section_grades.get(key)
+    if analyzed is None:
         graded_sentences = []
         total_confidence = 0.0
 
-        for sentence in sentences:
-            if not sentence:
-                continue
-            grade = grade_sentence(sentence, user_inputs)
+        for sentence, grade in grader.grade_text(section_text):
             graded_sentences.append({
                 "text": sentence,
                 "color": grade["color"],
@@ -121,64 +217,145 @@ def analyze_pitch_confidence(pitch_json: Dict[str, Any], user_inputs: List[str])
             total_confidence += grade["confidence"]
 
         avg_confidence = (total_confidence / len(graded_sentences)) if graded_sentences else 0.0
-        enhanced_pitch[section] = {
+        analyzed = {
             "text": section_text,
             "confidence": avg_confidence,
             "sentences": graded_sentences
         }
+        section_grades.put(key, analyzed)
+
+    # Callers own their copy
+    return {**analyzed, "sentences": [dict(sentence) for sentence in analyzed["sentences"]]}
+
+
+def analyze_pitch_confidence(pitch_json: Dict[str, Any], user_inputs: List[str]) -> Dict[str, Any]:
+    """
+    Analyze confidence for each section and sentence in the pitch JSON.
+
+    Unchanged sections and sentences reuse earlier grades, so rescoring
+    after a one-section edit only grades that section's new sentences.
+
+    Args:
+        pitch_json: The pitch JSON with 'text' fields per section
+        user_inputs: List of user inputs to evaluate specificity
 
-    return enhanced_pitch
+    Returns:
+        Enhanced pitch JSON with per-sentence grading and section-level averages
+    """
+    return {section: analyze_section_confidence(data.get("text", ""), user_inputs)
+            for section, data in pitch_json.items()}
+
+
+def grade_cache_stats() -> Dict[str, Dict[str, Any]]:
+    return {"sentences": sentence_grades.stats(), "sections": section_grades.stats()}
+
+
+# What ConfidenceScorer grades each section on, each scored 0.0-1.0
+SCORING_CRITERIA = ["specificity", "credibility", "relevance", "impact"]
+# Completion budget per section for a batched scoring call
+BATCH_TOKENS_PER_SECTION = int(os.getenv("CONFIDENCE_BATCH_TOKENS_PER_SECTION", "250"))
+
+
+def parse_batch_scores(response: str, sections: List[str]) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Per-section criterion scores from a batched scoring response, or None
+    unless it is a JSON object with every section and, for each, every
+    criterion as {"score": 0.0-1.0, "explanation": str}.
+    """
+    data = parse_json_response(response)
+    if not isinstance(data, dict) or set(data) != set(sections):
+        return None
+    if not all(valid_criterion_scores(scores, SCORING_CRITERIA) for scores in data.values()):
+        return None
+    return data
+
+
+def _section_result(scores: Dict[str, Any]) -> Dict[str, Any]:
+    # Calculate overall confidence from the per-criterion {"score", "explanation"} dicts
+    confidence = sum(value["score"] for value in scores.values()) / len(scores)
+    
+    return {
+        'confidence': confidence,
+        'scores': scores,
+        'color': 'green' if confidence >= 0.8 else 'yellow' if confidence >= 0.6 else 'red'
+    }
 
 
 class ConfidenceScorer:
     def __init__(self, openai_client: OpenAIClient):
         self.openai = openai_client
     
-    def score_pitch(self, pitch_data: Dict[str, Any], startup_info: Dict[str, Any]) -> Dict[str, Any]:
+    def score_pitch(self, pitch_data: Dict[str, Any], startup_info: Dict[str, Any],
+                    batched: bool = False) -> Dict[str, Any]:
         """Score the confidence of each section in the pitch"""
-        scores = {}
-        for section_name, content in pitch_data.items():
-            scores[section_name] = self.score_section(section_name, content, startup_info)
-        return scores
+        return run_sync(self.score_pitch_async(pitch_data, startup_info, batched))
     
-    def score_section(self, section_name: str, content: str, startup_info: Dict[str, Any]) -> Dict[str, Any]:
-        """Score a single section of the pitch"""
-        system_prompt = """You are an expert at evaluating pitch deck content.
-        Analyze the given section for:
+    async def score_pitch_async(self, pitch_data: Dict[str, Any], startup_info: Dict[str, Any],
+                                batched: bool = False) -> Dict[str, Any]:
+        """Awaitable score_pitch.
+        
+        By default the sections are scored with concurrent per-section calls,
+        so the latency is about that of the slowest single section. With
+        batched=True, every section is scored in one completion instead: one
+        request rather than one per section, for callers bound by request
+        rate limits. That completion has to write every section's scores, so
+        it is slower. If its response does not pass parse_batch_scores, the
+        concurrent calls run after it.
+        """
+        if batched and pitch_data:
+            scores = await self.score_batch_async(pitch_data, startup_info)
+            if scores is not None:
+                return {section_name: _section_result(scores[section_name]) for section_name in pitch_data}
+        
+        results = await asyncio.gather(*(
+            self.score_section_async(section_name, content, startup_info)
+            for section_name, content in pitch_data.items()
+        ))
+        return dict(zip(pitch_data, results))
+    
+    async def score_batch_async(self, pitch_data: Dict[str, Any],
+                                startup_info: Dict[str, Any]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Criterion scores for every section from one completion, or None if
+        the response was a fallback or failed the schema check."""
+        system_prompt = f"""You are an expert at evaluating pitch deck content.
+        Analyze each given section for:
         1. Specificity (concrete details vs. vague claims)
         2. Credibility (data/metrics to support claims)
         3. Relevance (alignment with company stage/sector)
         4. Impact (compelling for investors)
         
-        Score each criterion from 0.0 to 1.0 and provide brief explanations."""
+        Score each criterion from 0.0 to 1.0 and provide brief explanations.
+        Respond with JSON only."""
         
-        prompt = f"""Evaluate this pitch deck section:
+        prompt = f"""Evaluate these pitch deck sections:
         
-        Section: {section_name}
-        Content: {content}
+        {json.dumps(pitch_data, indent=2)}
         
         Company Context:
         Name: {startup_info.get('startup_name', '')}
         Sector: {startup_info.get('sector', '')}
         Stage: {startup_info.get('stage', '')}
         
-        Return a JSON object with scores and explanations."""
+        Return one JSON object with exactly these keys: {', '.join(pitch_data)}.
+        Each value is an object with exactly these keys: {', '.join(SCORING_CRITERIA)},
+        each {{"score": <0.0-1.0>, "explanation": "<one sentence>"}}."""
         
+        response = await self.openai.complete_async(prompt, system_prompt,
+                                                    max_tokens=BATCH_TOKENS_PER_SECTION * len(pitch_data))
+        if isinstance(response, FallbackText):
+            return None
+        scores = parse_batch_scores(response, list(pitch_data))
+        if scores is None:
+            print("Batched confidence scores failed the schema check; scoring each section separately")
+        return scores
+    
+    def score_section(self, section_name: str, content: str, startup_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Score a single section of the pitch"""
+        return run_sync(self.score_section_async(section_name, content, startup_info))
+    
+    async def score_section_async(self, section_name: str, content: str, startup_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Awaitable score_section."""
         try:
-            scores = self.openai.analyze(content, [
-                "specificity",
-                "credibility",
-                "relevance",
-                "impact"
-            ])
-            
-            # Calculate overall confidence
-            confidence = sum(scores.values()) / len(scores)
-            
-            return {
-                'confidence': confidence,
-                'scores': scores,
-                'color': 'green' if confidence >= 0.8 else 'yellow' if confidence >= 0.6 else 'red'
-            }
+            scores = await self.openai.analyze_async(content, SCORING_CRITERIA)
+            return _section_result(scores)
         except Exception as e:
             raise Exception(f"Error scoring section: {str(e)}")
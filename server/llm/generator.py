@@ -1,14 +1,15 @@
 import json
 import re
-from typing import Dict, Any, Optional
-from .llm_router import route_llm_call
+from typing import Dict, Any, AsyncIterator, Optional, Tuple
+from .llm_router import route_llm_call_async, run_sync, stream_llm_call_async
+from .json_stream import JSONMemberStream
 from .confidence_scorer import analyze_pitch_confidence
 from .clarifier import get_clarifying_questions_for_pitch
 from .openai_client import OpenAIClient
 
-def generate_pitch_json(startup_name: str, industry: str, product: str, traction: str, ask: str, stage: str,
-                       investor_name: str = "", investor_focus: Optional[str] = None) -> Dict[str, Any]:
-    """Generate a JSON-formatted investor pitch tailored for VC audiences."""
+def _pitch_prompt(startup_name: str, industry: str, product: str, traction: str, ask: str, stage: str,
+                  investor_name: str = "", investor_focus: Optional[str] = None) -> str:
+    """Prompt asking the LLM for the 7-section pitch as JSON."""
     # Construct investor context
     investor_info = f"Investor Name: {investor_name}" + (f", Focus: {investor_focus}" if investor_focus else "")
 
@@ -44,9 +45,33 @@ Traction: {traction}
 Stage: {stage}
 Funding Ask: {ask}
 """
+    return prompt
+
+def _fallback_pitch(startup_name: str, industry: str, traction: str, ask: str) -> Dict[str, Any]:
+    """Generic pitch used when the LLM response cannot be parsed."""
+    return {
+        "problem": {"text": "Many startups struggle with finding the right investors, often spending months on outreach with low success rates.", "confidence": 0.9},
+        "solution": {"text": f"{startup_name} helps startups connect with investors more efficiently, saving time and increasing success rates.", "confidence": 0.9},
+        "market": {"text": f"The {industry} market is growing rapidly with significant potential for disruption and innovation.", "confidence": 0.85},
+        "business_model": {"text": "Our business model is based on a combination of subscription fees and success-based commissions.", "confidence": 0.85},
+        "competition": {"text": "We differentiate from competitors through our proprietary matching algorithm and focus on quality over quantity.", "confidence": 0.85},
+        "traction": {"text": f"We have achieved {traction} and are positioned for accelerated growth.", "confidence": 0.9},
+        "ask": {"text": f"We're seeking {ask} to scale our operations and expand our market reach.", "confidence": 0.9}
+    }
+
+def generate_pitch_json(startup_name: str, industry: str, product: str, traction: str, ask: str, stage: str,
+                       investor_name: str = "", investor_focus: Optional[str] = None) -> Dict[str, Any]:
+    """Generate a JSON-formatted investor pitch tailored for VC audiences."""
+    return run_sync(generate_pitch_json_async(startup_name, industry, product, traction, ask, stage,
+                                              investor_name, investor_focus))
+
+async def generate_pitch_json_async(startup_name: str, industry: str, product: str, traction: str, ask: str, stage: str,
+                                    investor_name: str = "", investor_focus: Optional[str] = None) -> Dict[str, Any]:
+    """Awaitable generate_pitch_json."""
+    prompt = _pitch_prompt(startup_name, industry, product, traction, ask, stage, investor_name, investor_focus)
 
     # Call the LLM
-    raw_content = route_llm_call(
+    raw_content = await route_llm_call_async(
         task_type='pitch_block',
         prompt=prompt,
         max_tokens=1200
@@ -67,21 +92,47 @@ Funding Ask: {ask}
         print(f"JSON parsing error: {str(e)}")
         print(f"Raw content: {raw_content}")
         # Provide a fallback pitch if parsing fails
-        raw_pitch = {
-            "problem": {"text": "Many startups struggle with finding the right investors, often spending months on outreach with low success rates.", "confidence": 0.9},
-            "solution": {"text": f"{startup_name} helps startups connect with investors more efficiently, saving time and increasing success rates.", "confidence": 0.9},
-            "market": {"text": f"The {industry} market is growing rapidly with significant potential for disruption and innovation.", "confidence": 0.85},
-            "business_model": {"text": "Our business model is based on a combination of subscription fees and success-based commissions.", "confidence": 0.85},
-            "competition": {"text": "We differentiate from competitors through our proprietary matching algorithm and focus on quality over quantity.", "confidence": 0.85},
-            "traction": {"text": f"We have achieved {traction} and are positioned for accelerated growth.", "confidence": 0.9},
-            "ask": {"text": f"We're seeking {ask} to scale our operations and expand our market reach.", "confidence": 0.9}
-        }
+        raw_pitch = _fallback_pitch(startup_name, industry, traction, ask)
     
     # Analyze confidence using user inputs
     user_inputs = [startup_name, industry, product, traction, stage, ask]
     analyzed_pitch = analyze_pitch_confidence(raw_pitch, user_inputs)
     return analyzed_pitch
 
+async def stream_pitch_json_async(startup_name: str, industry: str, product: str, traction: str, ask: str, stage: str,
+                                  investor_name: str = "", investor_focus: Optional[str] = None
+                                  ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """generate_pitch_json_async that yields (section name, analyzed section) pairs
+    as soon as each section is complete in the LLM's streamed response.
+    
+    If the response stops being valid JSON, the sections of the fallback
+    pitch that were not sent yet follow.
+    """
+    prompt = _pitch_prompt(startup_name, industry, product, traction, ask, stage, investor_name, investor_focus)
+    user_inputs = [startup_name, industry, product, traction, stage, ask]
+    
+    parser = JSONMemberStream()
+    sent = set()
+    stream = stream_llm_call_async('pitch_block', prompt, max_tokens=1200)
+    try:
+        async for chunk in stream:
+            for section, data in parser.feed(chunk):
+                sent.add(section)
+                yield section, analyze_pitch_confidence({section: data}, user_inputs)[section]
+    except json.JSONDecodeError as e:
+        print(f"JSON parsing error: {str(e)}")
+        print(f"Raw content: {parser.buffer}")
+    finally:
+        await stream.aclose()
+    
+    if not parser.buffer.strip():
+        raise ValueError("Empty response from LLM in generate_pitch")
+    if not parser.done:
+        fallback = analyze_pitch_confidence(_fallback_pitch(startup_name, industry, traction, ask), user_inputs)
+        for section, data in fallback.items():
+            if section not in sent:
+                yield section, data
+
 def generate_clarifying_questions(pitch_json: Dict[str, Any]) -> Dict[str, Any]:
     """Generate clarifying questions for sections with low confidence."""
     return get_clarifying_questions_for_pitch(pitch_json)
@@ -90,6 +141,12 @@ def generate_email(pitch_json: Dict[str, Any], investor_name: str = "Alex",
                   your_name: str = "Lily Zhang", startup_name: str = "FlowPay", 
                   your_email: str = "you@example.com") -> str:
     """Generate a cold email to an investor based on the pitch."""
+    return run_sync(generate_email_async(pitch_json, investor_name, your_name, startup_name, your_email))
+
+async def generate_email_async(pitch_json: Dict[str, Any], investor_name: str = "Alex", 
+                               your_name: str = "Lily Zhang", startup_name: str = "FlowPay", 
+                               your_email: str = "you@example.com") -> str:
+    """Awaitable generate_email."""
     traction_summary = pitch_json.get("traction", {}).get("text", "")
     ask_summary = pitch_json.get("ask", {}).get("text", "")
 
@@ -110,7 +167,7 @@ Use these details:
 
 Avoid any repetition in the content. Each piece of information should appear exactly once."""
 
-    email_content = route_llm_call(
+    email_content = await route_llm_call_async(
         task_type='generate_email',
         prompt=prompt,
         max_tokens=300
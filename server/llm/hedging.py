@@ -0,0 +1,118 @@
+import asyncio
+import os
+import threading
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+# Hedging is opt-in: LLM_HEDGING=1 enables it for every call
+HEDGING_ENABLED = os.getenv("LLM_HEDGING", "0") == "1"
+# The secondary provider is tried once the primary is slower than this percentile of its recent calls
+HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "90"))
+# Until a provider has this many samples, hedge after HEDGE_INITIAL_DELAY seconds
+HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+HEDGE_INITIAL_DELAY = float(os.getenv("LLM_HEDGE_INITIAL_DELAY", "5"))
+# Never hedge sooner than this, however fast the provider usually is
+HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", "0.5"))
+
+# Overall seconds a task may take, hedging included, before it gets the fallback response
+TASK_LATENCY_BUDGETS = {
+    'pitch_block': 30.0,
+    'improve': 20.0,
+    'regenerate': 20.0,
+    'clarify_question': 15.0,
+    'clarify_pitch': 15.0,
+    'generate_email': 15.0,
+    'match_insight': 10.0,
+}
+DEFAULT_LATENCY_BUDGET = float(os.getenv("LLM_LATENCY_BUDGET", "30"))
+
+
+def latency_budget(task_type: str) -> float:
+    return TASK_LATENCY_BUDGETS.get(task_type, DEFAULT_LATENCY_BUDGET)
+
+
+class LatencyTracker:
+    """Latencies of a provider's recent successful calls."""
+
+    def __init__(self, window: int = 200):
+        self.samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.samples.append(seconds)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self.samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * percent / 100))
+        return samples[index]
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait for this provider before hedging to another."""
+        with self._lock:
+            count = len(self.samples)
+        if count < HEDGE_MIN_SAMPLES:
+            return HEDGE_INITIAL_DELAY
+        return max(HEDGE_MIN_DELAY, self.percentile(HEDGE_PERCENTILE))
+
+
+class HedgeStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.hedged = 0
+        self.secondary_wins = 0
+        self.failovers = 0
+        self.budget_exceeded = 0
+
+    def add(self, **counts: int):
+        with self._lock:
+            for name, count in counts.items():
+                setattr(self, name, getattr(self, name) + count)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "hedged": self.hedged,
+                "secondary_wins": self.secondary_wins,
+                "failovers": self.failovers,
+                "budget_exceeded": self.budget_exceeded,
+            }
+
+
+async def first_good(primary: Callable[[], Awaitable[Any]], secondary: Callable[[], Awaitable[Any]],
+                     delay: float, is_good: Callable[[Any], bool]) -> Tuple[Any, bool]:
+    """Run primary(); start secondary() too if primary is still running after
+    `delay` seconds or has finished without a good result.
+
+    Returns (result, came_from_secondary) for the first good result and
+    cancels the other call. If neither result is good, the primary's
+    outcome is returned (or raised).
+    """
+    primary_task = asyncio.ensure_future(primary())
+    secondary_task = None
+    try:
+        done, _ = await asyncio.wait({primary_task}, timeout=delay)
+        if done and _is_good(primary_task, is_good):
+            return primary_task.result(), False
+
+        secondary_task = asyncio.ensure_future(secondary())
+        pending = {primary_task, secondary_task}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if _is_good(task, is_good):
+                    return task.result(), task is secondary_task
+        return primary_task.result(), False
+    finally:
+        for task in (primary_task, secondary_task):
+            if task is not None and not task.done():
+                task.cancel()
+
+
+def _is_good(task: asyncio.Future, is_good: Callable[[Any], bool]) -> bool:
+    return not task.cancelled() and task.exception() is None and is_good(task.result())
@@ -0,0 +1,131 @@
+import asyncio
+import os
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+import httpx
+
+try:
+    import h2  # noqa: F401 - httpx negotiates HTTP/2 only when h2 is installed
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Pool settings shared by every provider unless overridden
+POOL_MAX_CONNECTIONS = int(os.getenv("LLM_POOL_MAX_CONNECTIONS", "50"))
+POOL_MAX_KEEPALIVE = int(os.getenv("LLM_POOL_MAX_KEEPALIVE", "20"))
+POOL_KEEPALIVE_EXPIRY = float(os.getenv("LLM_POOL_KEEPALIVE_EXPIRY", "60"))
+CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "10"))
+READ_TIMEOUT = float(os.getenv("LLM_READ_TIMEOUT", "60"))
+USE_HTTP2 = os.getenv("LLM_HTTP2", "1") != "0"
+
+
+class ProviderPool:
+    """Keep-alive HTTP connection pool for one LLM provider.
+
+    Wraps one httpx.Client for sync callers and one httpx.AsyncClient per
+    event loop, all with the same bounded pool, timeouts and HTTP/2 setting
+    (used when the h2 package is installed). Each response carries
+    extensions["connection_reused"], and stats() aggregates them.
+    """
+
+    def __init__(self, name: str, max_connections: int = POOL_MAX_CONNECTIONS,
+                 max_keepalive: int = POOL_MAX_KEEPALIVE, keepalive_expiry: float = POOL_KEEPALIVE_EXPIRY,
+                 connect_timeout: float = CONNECT_TIMEOUT, read_timeout: float = READ_TIMEOUT,
+                 http2: bool = USE_HTTP2):
+        self.name = name
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive,
+                                   keepalive_expiry=keepalive_expiry)
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self._client: Optional[httpx.Client] = None
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.http2_requests = 0
+
+    def client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(limits=self.limits, timeout=self.timeout, http2=self.http2)
+            return self._client
+
+    def async_client(self) -> httpx.AsyncClient:
+        """The AsyncClient for the running event loop (connections cannot be shared across loops)."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout, http2=self.http2)
+                self._async_clients[loop] = client
+            return client
+
+    def _record(self, response: httpx.Response, opened: bool) -> httpx.Response:
+        response.extensions["connection_reused"] = not opened
+        with self._lock:
+            self.requests += 1
+            self.new_connections += opened
+            self.http2_requests += response.http_version == "HTTP/2"
+        return response
+
+    def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        opened = []
+
+        def trace(event_name, info):
+            if event_name == "connection.connect_tcp.started":
+                opened.append(True)
+
+        response = self.client().post(url, extensions={"trace": trace}, **kwargs)
+        return self._record(response, bool(opened))
+
+    async def post_async(self, url: str, **kwargs: Any) -> httpx.Response:
+        opened = []
+
+        async def trace(event_name, info):
+            if event_name == "connection.connect_tcp.started":
+                opened.append(True)
+
+        response = await self.async_client().post(url, extensions={"trace": trace}, **kwargs)
+        return self._record(response, bool(opened))
+
+    @asynccontextmanager
+    async def stream_async(self, url: str, **kwargs: Any) -> AsyncIterator[httpx.Response]:
+        """POST whose response body is read incrementally (for server-sent events)."""
+        opened = []
+
+        async def trace(event_name, info):
+            if event_name == "connection.connect_tcp.started":
+                opened.append(True)
+
+        async with self.async_client().stream("POST", url, extensions={"trace": trace}, **kwargs) as response:
+            yield self._record(response, bool(opened))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reused_connections": self.requests - self.new_connections,
+                "reuse_ratio": round((self.requests - self.new_connections) / self.requests, 3) if self.requests else 0.0,
+                "http2_requests": self.http2_requests,
+                "http2_enabled": self.http2,
+            }
+
+
+_pools: Dict[str, ProviderPool] = {}
+_pools_lock = threading.Lock()
+
+def get_pool(provider: str) -> ProviderPool:
+    """Shared connection pool for a provider ("anthropic", "openai"), created on first use."""
+    with _pools_lock:
+        pool = _pools.get(provider)
+        if pool is None:
+            pool = _pools[provider] = ProviderPool(provider)
+        return pool
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {pool.name: pool.stats() for pool in pools}
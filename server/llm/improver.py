@@ -1,12 +1,16 @@
 from typing import Dict, Any
 from .confidence_scorer import analyze_pitch_confidence
-from .llm_router import route_llm_call
+from .llm_router import route_llm_call_async, run_sync
 from .anthropic_client import AnthropicClient
 import json
 import re
 
 def improve_pitch_section(section_name: str, current_text: str, user_input: str) -> Dict[str, Any]:
     """Improve a specific section of the pitch based on user input."""
+    return run_sync(improve_pitch_section_async(section_name, current_text, user_input))
+
+async def improve_pitch_section_async(section_name: str, current_text: str, user_input: str) -> Dict[str, Any]:
+    """Awaitable improve_pitch_section."""
     prompt = f"""You are a world-class startup storyteller helping to improve a pitch for investors.
 
 I need to improve the '{section_name}' section of my pitch based on additional information.
@@ -26,7 +30,7 @@ Include concrete details, metrics, and specific examples wherever possible.
 Return only the improved text without any explanations or formatting."""
     
     # Call LLM for improving the section
-    improved_text = route_llm_call("pitch_block", prompt, max_tokens=500)
+    improved_text = await route_llm_call_async("pitch_block", prompt, max_tokens=500)
     
     # Check if the improved text might be JSON and clean it up
     improved_text = improved_text.strip()
@@ -63,6 +67,10 @@ Return only the improved text without any explanations or formatting."""
 
 def regenerate_pitch_section(section_name: str, current_text: str) -> Dict[str, Any]:
     """Completely regenerate a section of the pitch to improve its quality."""
+    return run_sync(regenerate_pitch_section_async(section_name, current_text))
+
+async def regenerate_pitch_section_async(section_name: str, current_text: str) -> Dict[str, Any]:
+    """Awaitable regenerate_pitch_section."""
     prompt = f"""You are a world-class startup storyteller helping to improve a pitch for investors.
 
 I need to completely regenerate the '{section_name}' section of my pitch to make it more compelling and specific.
@@ -79,7 +87,7 @@ Please rewrite this section to make it:
 Return only the improved text without any explanations or formatting."""
     
     # Call LLM for regenerating the section
-    regenerated_text = route_llm_call("regenerate", prompt, max_tokens=500)
+    regenerated_text = await route_llm_call_async("regenerate", prompt, max_tokens=500)
     
     # Clean up the text similar to improve_pitch_section
     regenerated_text = regenerated_text.strip()
@@ -91,7 +99,11 @@ Return only the improved text without any explanations or formatting."""
     }
 
 def update_pitch_with_improvements(pitch_json: Dict[str, Any], improvements: Dict[str, str], user_inputs: list) -> Dict[str, Any]:
-    """Update the pitch JSON with improvements and recalculate confidence scores."""
+    """Update the pitch JSON with improvements and recalculate confidence scores.
+    
+    Sections whose text is unchanged keep their cached grades; only the
+    improved sections' new sentences are graded.
+    """
     # Create a copy of the original pitch structure
     updated_pitch = {}
     
@@ -0,0 +1,26 @@
+import os
+import re
+from typing import Tuple
+from .two_tier_cache import TwoTierCache
+
+WORKSPACE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+INSIGHT_CACHE_PATH = os.getenv("INSIGHT_CACHE_PATH", os.path.join(WORKSPACE_DIR, "data", "insight_cache.jsonl"))
+INSIGHT_CACHE_TTL_SECONDS = float(os.getenv("INSIGHT_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+InsightKey = Tuple[str, str, str]
+
+
+def insight_key(startup_name: str, industry: str, investor: str) -> InsightKey:
+    """Case- and whitespace-insensitive (startup_name, industry, investor) key."""
+    return tuple(re.sub(r"\s+", " ", str(part)).strip().lower() for part in (startup_name, industry, investor))
+
+
+class InsightCache(TwoTierCache):
+    """Persistent cache of personalized match insights keyed by insight_key()."""
+
+    def __init__(self, path: str = INSIGHT_CACHE_PATH, max_entries: int = 2048,
+                 ttl: float = INSIGHT_CACHE_TTL_SECONDS):
+        super().__init__(path, max_entries, ttl)
+
+
+insight_cache = InsightCache()
@@ -0,0 +1,72 @@
+import json
+from typing import Any, List, Optional, Tuple
+
+
+class JSONMemberStream:
+    """Incremental parser for the members of a streamed top-level JSON object.
+
+    feed() takes the next chunk of text and returns the (key, value) pairs
+    of every member that became complete with it, so a pitch section can
+    be used as soon as its closing brace arrives instead of after the whole
+    object. Text before the opening brace (such as a ```json fence) is
+    skipped; text after the closing brace is ignored.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.member_start: Optional[int] = None
+        self.value_start: Optional[int] = None
+        self.key: Optional[str] = None
+        self.done = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        members = []
+        if self.done:
+            return members
+        self.buffer += chunk
+        buffer = self.buffer
+        for pos in range(self.pos, len(buffer)):
+            char = buffer[pos]
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                continue
+            if char == '"':
+                if self.depth:
+                    self.in_string = True
+            elif char in "{[":
+                self.depth += 1
+                if self.depth == 1:
+                    self.member_start = pos + 1
+            elif char in "}]":
+                self.depth -= 1
+                if self.depth == 1 and self.value_start is not None:
+                    # A nested value just closed
+                    self._emit(members, pos + 1)
+                elif self.depth == 0:
+                    self._emit(members, pos)
+                    self.done = True
+                    break
+            elif self.depth == 1:
+                if char == ":" and self.key is None:
+                    self.key = json.loads(buffer[self.member_start:pos])
+                    self.value_start = pos + 1
+                elif char == ",":
+                    self._emit(members, pos)
+                    self.member_start = pos + 1
+        self.pos = len(buffer)
+        return members
+
+    def _emit(self, members: List[Tuple[str, Any]], end: int):
+        if self.value_start is not None:
+            members.append((self.key, json.loads(self.buffer[self.value_start:end])))
+        self.key = None
+        self.value_start = None
@@ -0,0 +1,63 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+from .two_tier_cache import TwoTierCache
+
+WORKSPACE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+LLM_CACHE_PATH = os.path.join(WORKSPACE_DIR, "data", "llm_cache.jsonl")
+# The disk tier is optional: LLM_CACHE_DISK=0 keeps responses in memory only
+LLM_CACHE_DISK = os.getenv("LLM_CACHE_DISK", "1") != "0"
+
+# Seconds a cached response stays valid, per task type
+LLM_CACHE_TTLS = {
+    'pitch_block': 24 * 3600,
+    'clarify_question': 24 * 3600,
+    'clarify_pitch': 24 * 3600,
+    'generate_email': 6 * 3600,
+    'improve': 3600,
+}
+DEFAULT_LLM_CACHE_TTL = 3600
+# Tasks whose whole point is a fresh answer are never served from the cache
+BYPASS_TASKS = {'regenerate'}
+
+
+def llm_cache_key(provider: str, model: str, task_type: str, prompt: str, system_prompt: Optional[str],
+                  max_tokens: Optional[int], temperature: float, stop: Optional[List[str]] = None) -> str:
+    """Content address of an LLM request: SHA-256 over every input that shapes the response."""
+    request = [provider, model, task_type, prompt, system_prompt, max_tokens, temperature, stop]
+    return hashlib.sha256(json.dumps(request, separators=(",", ":")).encode()).hexdigest()
+
+
+class LLMResponseCache:
+    """Content-addressed cache of LLM responses with per-task TTLs."""
+
+    def __init__(self, path: Optional[str] = LLM_CACHE_PATH if LLM_CACHE_DISK else None,
+                 max_entries: int = 4096):
+        self.store = TwoTierCache(path, max_entries, DEFAULT_LLM_CACHE_TTL)
+        self._lock = threading.Lock()
+        self.bypassed = 0
+
+    def cacheable(self, task_type: str) -> bool:
+        if task_type in BYPASS_TASKS:
+            with self._lock:
+                self.bypassed += 1
+            return False
+        return True
+
+    def get(self, key: str) -> Optional[str]:
+        return self.store.get(key)
+
+    def put(self, key: str, response: str, task_type: str):
+        self.store.put(key, response, ttl=LLM_CACHE_TTLS.get(task_type, DEFAULT_LLM_CACHE_TTL))
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.store.stats()
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        stats["bypassed"] = self.bypassed
+        stats["hit_ratio"] = round((stats["hits"] + stats["disk_hits"]) / lookups, 3) if lookups else 0.0
+        return stats
+
+
+llm_cache = LLMResponseCache()
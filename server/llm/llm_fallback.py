@@ -0,0 +1,6 @@
+class FallbackText(str):
+    """A canned response that a client returned instead of a real completion.
+
+    Clients fall back to mock text when a provider is unavailable; wrapping
+    it lets callers such as the response cache tell it apart.
+    """
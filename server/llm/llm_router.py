@@ -1,10 +1,48 @@
-from typing import Optional
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Dict, Iterator, Optional
 from .openai_client import OpenAIClient
 from .anthropic_client import AnthropicClient
+from .llm_cache import llm_cache, llm_cache_key
+from .llm_fallback import FallbackText
+from .single_flight import SingleFlight
+from .rate_limiter import estimate_tokens, get_limiter, task_priority
+from .hedging import HEDGING_ENABLED, HedgeStats, LatencyTracker, first_good, latency_budget
+from .circuit_breaker import get_breaker
+
+# Provider, model and limits per task type. Short tasks run on a small,
+# fast model; "default" covers any task type not listed.
+ROUTING_TABLE: Dict[str, Dict[str, Any]] = {
+    'default': {"provider": "openai", "model": "gpt-4-turbo-preview", "max_tokens": 2000, "temperature": 0.7, "stop": None},
+    'pitch_block': {"provider": "openai", "model": "gpt-4-turbo-preview", "max_tokens": 1200},
+    'clarify_question': {"provider": "openai", "model": "gpt-4o-mini", "max_tokens": 300},
+    'clarify_pitch': {"provider": "openai", "model": "gpt-4o-mini", "max_tokens": 1200},
+    'generate_email': {"provider": "openai", "model": "gpt-4o-mini", "max_tokens": 300},
+    'match_insight': {"provider": "openai", "model": "gpt-4o-mini", "max_tokens": 100, "stop": ["\n\n"]},
+    'improve': {"provider": "anthropic", "model": "claude-3-haiku-20240307", "max_tokens": 500},
+    'regenerate': {"provider": "anthropic", "model": "claude-3-haiku-20240307", "max_tokens": 500},
+}
+
+# Per-task overrides from a JSON file: {"task_type": {"model": ..., "max_tokens": ...}, ...}
+LLM_ROUTING_CONFIG = os.getenv("LLM_ROUTING_CONFIG")
+if LLM_ROUTING_CONFIG and os.path.exists(LLM_ROUTING_CONFIG):
+    with open(LLM_ROUTING_CONFIG) as f:
+        for task_type, overrides in json.load(f).items():
+            ROUTING_TABLE[task_type] = {**ROUTING_TABLE.get(task_type, {}), **overrides}
 
 # Initialize clients
 openai_client = OpenAIClient()
 anthropic_client = AnthropicClient()
+providers = {"openai": openai_client, "anthropic": anthropic_client}
+# Concurrent identical requests share one provider call
+llm_flights = SingleFlight()
+# Recent successful call latencies per provider and model, for hedging
+provider_latency: Dict[str, LatencyTracker] = {}
+_latency_lock = threading.Lock()
+hedge_stats = HedgeStats()
 
 def deduplicate_response(response: str) -> str:
     """Remove duplicate lines and paragraphs from LLM response."""
@@ -37,19 +75,219 @@ def deduplicate_response(response: str) -> str:
     
     return '\n'.join(deduped_lines)
 
-def route_llm_call(task_type: str, prompt: str, max_tokens: Optional[int] = None) -> str:
-    """Route LLM calls to appropriate service based on task type"""
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_loop_lock = threading.Lock()
+
+def _get_sync_loop() -> asyncio.AbstractEventLoop:
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(target=_sync_loop.run_forever, name="llm-sync-loop", daemon=True).start()
+    return _sync_loop
+
+def run_sync(coro: Awaitable[Any]) -> Any:
+    """Run a coroutine from synchronous code and return its result.
+
+    Coroutines run on one long-lived background event loop, so the async
+    clients' connection pools are reused across sync calls. Safe to call
+    from any thread, including one that is running its own event loop.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_sync_loop()).result()
+
+async def warm_up_providers() -> Dict[str, Dict[str, Any]]:
+    """Initialize and health-check every provider concurrently; run once at startup."""
+    states = await asyncio.gather(*(client.health_check() for client in providers.values()))
+    return dict(zip(providers, states))
+
+def provider_readiness() -> Dict[str, Any]:
+    """Readiness of the providers as recorded by the last warm-up.
+    
+    ready: every provider has been checked. healthy: every provider
+    answered its probe (rather than being degraded or in mock mode).
+    """
+    states = {name: client.readiness() for name, client in providers.items()}
+    return {
+        "ready": all(state["status"] != "pending" for state in states.values()),
+        "healthy": all(state["status"] == "ready" for state in states.values()),
+        "providers": states,
+    }
+
+def task_route(task_type: str) -> Dict[str, Any]:
+    """Provider, model, max_tokens, temperature and stop sequences for a task type"""
+    return {**ROUTING_TABLE['default'], **ROUTING_TABLE.get(task_type, {})}
+
+def _route(task_type: str, max_tokens: Optional[int] = None):
+    """(provider name, client, call settings) serving a task type.
+    
+    A caller's max_tokens can lower the task's budget but not raise it.
+    """
+    route = task_route(task_type)
+    settings = {key: route[key] for key in ("model", "max_tokens", "temperature", "stop")}
+    if max_tokens:
+        settings["max_tokens"] = min(max_tokens, route["max_tokens"])
+    return route["provider"], providers[route["provider"]], settings
+
+def _secondary(provider: str, settings: Dict[str, Any]):
+    """(provider name, client, call settings) a hedged call falls back to; the secondary uses its own default model"""
+    name = "anthropic" if provider == "openai" else "openai"
+    return name, providers[name], {**settings, "model": None}
+
+def _model(client, settings: Dict[str, Any]) -> str:
+    return settings["model"] or client.model
+
+def _latency(provider: str, model: str) -> LatencyTracker:
+    with _latency_lock:
+        return provider_latency.setdefault(f"{provider}:{model}", LatencyTracker())
+
+def _available(provider: str, client, settings: Dict[str, Any]):
+    """The provider to call: the routed one, or the secondary while the routed one's breaker is open"""
+    if get_breaker(provider, _model(client, settings)).is_open():
+        name, other, other_settings = _secondary(provider, settings)
+        if not get_breaker(name, other.model).is_open():
+            hedge_stats.add(failovers=1)
+            return name, other, other_settings
+    return provider, client, settings
+
+async def _call_provider(provider: str, client, settings: Dict[str, Any], task_type: str, prompt: str,
+                         system_prompt: Optional[str]) -> str:
+    """One rate-limited provider call; records its latency when it succeeds."""
+    tokens = estimate_tokens(prompt, system_prompt, settings["max_tokens"])
+    async with get_limiter(provider).slot(task_priority(task_type), tokens):
+        start = time.perf_counter()
+        response = await client.complete_async(prompt, system_prompt, **settings)
+    if not isinstance(response, FallbackText):
+        _latency(provider, _model(client, settings)).record(time.perf_counter() - start)
+    return response
+
+async def _answer(provider: str, client, settings: Dict[str, Any], task_type: str, prompt: str,
+                  system_prompt: Optional[str], hedge: bool, budget: float) -> str:
+    """The provider's response, hedged to the secondary provider if asked, within the latency budget."""
+    hedge_stats.add(calls=1)
+    provider, client, settings = _available(provider, client, settings)
+    
+    async def primary():
+        return await _call_provider(provider, client, settings, task_type, prompt, system_prompt)
+    
+    async def secondary():
+        hedge_stats.add(hedged=1)
+        return await _call_provider(*_secondary(provider, settings), task_type, prompt, system_prompt)
+    
+    try:
+        if not hedge:
+            return await asyncio.wait_for(primary(), budget)
+        response, from_secondary = await asyncio.wait_for(
+            first_good(primary, secondary, _latency(provider, _model(client, settings)).hedge_delay(),
+                       lambda response: not isinstance(response, FallbackText)),
+            budget
+        )
+        hedge_stats.add(secondary_wins=int(from_secondary))
+        return response
+    except asyncio.TimeoutError:
+        hedge_stats.add(budget_exceeded=1)
+        print(f"LLM call for {task_type} exceeded its {budget}s latency budget; using the fallback response")
+        return client.fallback_response(prompt)
+
+async def route_llm_call_async(task_type: str, prompt: str, max_tokens: Optional[int] = None,
+                               system_prompt: Optional[str] = None, use_cache: bool = True,
+                               hedge: Optional[bool] = None, budget: Optional[float] = None) -> str:
+    """Route LLM calls to appropriate service based on task type, without blocking the event loop.
+    
+    ROUTING_TABLE picks the provider, model, temperature, stop sequences
+    and max_tokens for the task type; a caller's max_tokens can only lower
+    the table's.
+    
+    Identical requests are answered from the LLM response cache unless
+    use_cache is False or the task type always wants a fresh answer.
+    Canned fallback responses are never cached and come back as
+    FallbackText. Identical requests that
+    arrive while one is in flight wait for it instead of calling the
+    provider again. Provider calls go through the provider's rate limiter,
+    where interactive task types are admitted before batch and background
+    ones.
+    
+    With hedging (hedge=True, or LLM_HEDGING=1 when hedge is None), a
+    primary provider slower than its usual latency percentile races the
+    secondary provider and the first real answer wins. The whole call gets
+    `budget` seconds (default: the task type's latency budget) before the
+    fallback response is returned instead.
+    """
     try:
-        if task_type in ['pitch_block', 'clarify_question']:
-            # Use OpenAI for core pitch generation and clarification
-            response = openai_client.complete(prompt)
-        elif task_type in ['improve', 'regenerate']:
-            # Use Anthropic for improvements and regeneration
-            response = anthropic_client.complete(prompt)
-        else:
-            # Default to OpenAI
-            response = openai_client.complete(prompt)
+        provider, client, settings = _route(task_type, max_tokens)
+        key = llm_cache_key(provider, _model(client, settings), task_type, prompt, system_prompt, settings["max_tokens"],
+                            settings["temperature"], settings["stop"])
+        cache = use_cache and llm_cache.cacheable(task_type)
+        if cache:
+            cached = llm_cache.get(key)
+            if cached is not None:
+                return cached
+        
+        async def call_provider():
+            response = await _answer(provider, client, settings, task_type, prompt, system_prompt,
+                                     HEDGING_ENABLED if hedge is None else hedge,
+                                     latency_budget(task_type) if budget is None else budget)
+            result = deduplicate_response(response)
+            if isinstance(response, FallbackText):
+                # Keep the marker so callers can tell canned text from a real answer
+                return FallbackText(result)
+            if cache:
+                llm_cache.put(key, result, task_type)
+            return result
         
-        return deduplicate_response(response)
+        return await llm_flights.do((key, cache), call_provider)
     except Exception as e:
         raise Exception(f"LLM routing error: {str(e)}")
+
+def route_llm_call(task_type: str, prompt: str, max_tokens: Optional[int] = None,
+                   system_prompt: Optional[str] = None, use_cache: bool = True,
+                   hedge: Optional[bool] = None, budget: Optional[float] = None) -> str:
+    """Route LLM calls to appropriate service based on task type"""
+    return run_sync(route_llm_call_async(task_type, prompt, max_tokens, system_prompt, use_cache, hedge, budget))
+
+
+async def stream_llm_call_async(task_type: str, prompt: str, max_tokens: Optional[int] = None,
+                                system_prompt: Optional[str] = None, use_cache: bool = True) -> AsyncIterator[str]:
+    """route_llm_call_async as a stream of text deltas, yielded as the provider produces them.
+    
+    A cached response is yielded whole. Deltas are the raw provider text;
+    the deduplicated full response is what gets cached. Streams are not
+    coalesced with concurrent identical calls.
+    """
+    provider, client, settings = _route(task_type, max_tokens)
+    key = llm_cache_key(provider, _model(client, settings), task_type, prompt, system_prompt, settings["max_tokens"],
+                        settings["temperature"], settings["stop"])
+    cache = use_cache and llm_cache.cacheable(task_type)
+    if cache:
+        cached = llm_cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+    
+    provider, client, settings = _available(provider, client, settings)
+    chunks = []
+    fallback = False
+    try:
+        async with get_limiter(provider).slot(task_priority(task_type),
+                                              estimate_tokens(prompt, system_prompt, settings["max_tokens"])):
+            async for chunk in client.stream_async(prompt, system_prompt, **settings):
+                fallback = fallback or isinstance(chunk, FallbackText)
+                chunks.append(chunk)
+                yield chunk
+    except Exception as e:
+        raise Exception(f"LLM routing error: {str(e)}")
+    
+    if cache and not fallback:
+        llm_cache.put(key, deduplicate_response("".join(chunks)), task_type)
+
+def stream_llm_call(task_type: str, prompt: str, max_tokens: Optional[int] = None,
+                    system_prompt: Optional[str] = None, use_cache: bool = True) -> Iterator[str]:
+    """stream_llm_call_async for synchronous callers"""
+    stream = stream_llm_call_async(task_type, prompt, max_tokens, system_prompt, use_cache)
+    try:
+        while True:
+            try:
+                yield run_sync(stream.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        run_sync(stream.aclose())
@@ -0,0 +1,173 @@
+import base64
+import binascii
+import json
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+import numpy as np
+
+# Memory the cursor rankings of one process may hold
+RANKING_CACHE_BYTES = int(os.getenv("RANKING_CACHE_BYTES", str(64 * 1024 * 1024)))
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def _narrow(values: np.ndarray) -> np.ndarray:
+    """`values` in the smallest signed integer type that holds them."""
+    if not len(values):
+        return values
+    low, high = values.min(), values.max()
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return values.astype(dtype)
+    return values
+
+
+class RankedResults:
+    """Integer scores ranked best-first on demand, ties broken by position.
+
+    Only as much of the ranking as has been asked for is materialized:
+    `np.argpartition` selects the leading block and just that block is
+    sorted, so serving the first pages never sorts the whole array.
+
+    `rows` is the investor row of each position when the scores cover a
+    subset of the table (None when position i is row i). `payload` holds
+    whatever the caller needs to build results; compact() drops it.
+    """
+
+    def __init__(self, scores: np.ndarray, payload: Any = None, rows: Optional[np.ndarray] = None):
+        self.scores = np.asarray(scores)
+        self.payload = payload
+        self.rows = rows
+        self.total = len(self.scores)
+        self._order = np.empty(0, dtype=np.int64)
+
+    def _extend(self, count: int):
+        size = len(self.scores)
+        count = min(count, size)
+        if count <= len(self._order):
+            return
+        # Grow geometrically so paging forward costs amortized O(size) per doubling
+        target = min(size, max(count, 2 * len(self._order)))
+        key = -self.scores.astype(np.int64, copy=False) * size + np.arange(size, dtype=np.int64)
+        if target < size:
+            selected = np.argpartition(key, target - 1)[:target]
+        else:
+            selected = np.arange(size, dtype=np.int64)
+        self._order = selected[np.argsort(key[selected])]
+
+    def page(self, offset: int, limit: int) -> np.ndarray:
+        """Positions ranked [offset, offset + limit)."""
+        self._extend(offset + limit)
+        return self._order[offset:offset + limit]
+
+    def row_ids(self, positions: np.ndarray) -> np.ndarray:
+        return positions if self.rows is None else self.rows[positions]
+
+    def compact(self) -> "RankedResults":
+        """The same ranking without its payload, in the narrowest integer types that hold it."""
+        compact = RankedResults(_narrow(self.scores), rows=None if self.rows is None else _narrow(self.rows))
+        compact._order = self._order
+        return compact
+
+    def nbytes(self) -> int:
+        arrays = (self.scores, self._order, self.rows)
+        return sum(array.nbytes for array in arrays if array is not None)
+
+
+class RankingCache:
+    """Thread-safe LRU of compact rankings behind pagination cursors, with a TTL and a byte budget."""
+
+    def __init__(self, max_bytes: int = RANKING_CACHE_BYTES, ttl: float = 600.0):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[str, RankedResults, float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+
+    def _drop(self, session_id: str):
+        self.bytes -= self._entries.pop(session_id)[3]
+
+    def get(self, session_id: str, fingerprint: str) -> Optional[RankedResults]:
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+            entry_fingerprint, ranked, expires, _ = entry
+            if expires < time.time() or entry_fingerprint != fingerprint:
+                self._drop(session_id)
+                return None
+            self._entries.move_to_end(session_id)
+            return ranked
+
+    def put(self, ranked: RankedResults, fingerprint: str, session_id: Optional[str] = None) -> str:
+        session_id = session_id or secrets.token_urlsafe(9)
+        size = ranked.nbytes()
+        with self._lock:
+            if session_id in self._entries:
+                self._drop(session_id)
+            self._entries[session_id] = (fingerprint, ranked, time.time() + self.ttl, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes and self._entries:
+                self._drop(next(iter(self._entries)))
+        return session_id
+
+    def discard(self, session_id: str):
+        with self._lock:
+            if session_id in self._entries:
+                self._drop(session_id)
+
+
+def encode_cursor(session_id: str, offset: int) -> str:
+    raw = json.dumps({"s": session_id, "o": offset}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        session_id, offset = str(data["s"]), int(data["o"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise InvalidCursorError("Invalid pagination cursor")
+    if offset < 0:
+        raise InvalidCursorError("Invalid pagination cursor")
+    return session_id, offset
+
+
+ranking_cache = RankingCache()
+
+def paginate(fingerprint: str, limit: int, cursor: Optional[str], rank: Callable[[], RankedResults],
+             rescore: Callable[[np.ndarray], Any]) -> Tuple[Any, np.ndarray, Optional[str]]:
+    """Resolve one page of a ranking, reusing the cached ranking behind `cursor`.
+
+    `rank()` builds the ranking and its payload when there is no cached
+    one. Only a ranking with a next page is cached, and only in compact
+    form, so a page served from the cache gets its payload from
+    `rescore(rows)`, which scores just the page's investor rows.
+    `fingerprint` identifies the query and dataset version, so a cursor
+    never pages through a stale ranking.
+
+    Returns the payload, the page's positions in it, and the next cursor.
+    """
+    session_id, offset = decode_cursor(cursor) if cursor else (None, 0)
+    cached = ranking_cache.get(session_id, fingerprint) if session_id else None
+    ranked = cached if cached is not None else rank()
+    positions = ranked.page(offset, limit)
+
+    end = offset + len(positions)
+    next_cursor = None
+    if len(positions) and end < ranked.total:
+        session_id = ranking_cache.put(ranked if cached is not None else ranked.compact(), fingerprint, session_id)
+        next_cursor = encode_cursor(session_id, end)
+    elif cached is not None:
+        ranking_cache.discard(session_id)
+
+    if cached is None:
+        return ranked.payload, positions, next_cursor
+    return rescore(ranked.row_ids(positions)), np.arange(len(positions)), next_cursor
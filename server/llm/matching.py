@@ -1,60 +1,58 @@
-from typing import List, Dict, Any
-import pandas as pd
-import os
-from .llm_router import route_llm_call
+import asyncio
+from typing import List, Dict, Any, Optional
+import numpy as np
+from .insight_cache import insight_cache, insight_key
+from .llm_fallback import FallbackText
+from .llm_router import route_llm_call_async, run_sync
+from .match_pagination import RankedResults, paginate
 from .openai_client import OpenAIClient
+from .vc_dataset import get_vc_dataset
 
-def match_vc_to_startup_enhanced(startup_name: str, industry: str, stage: str = "", location: str = "") -> List[Dict[str, Any]]:
-    """Match startup to VCs using both data-driven and LLM-enhanced matching."""
-    # Load VC dataset
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    workspace_dir = os.path.dirname(os.path.dirname(current_dir))
-    df_vc = pd.read_csv(os.path.join(workspace_dir, "VC_FundStage_Location_Sector.csv"))
-    
-    # Clean and normalize data
-    df_vc["Fund_Focus_Clean"] = df_vc["Fund Focus (Sectors)"].fillna("").str.lower().str.strip()
-    df_vc["Location_Clean"] = df_vc["Location"].fillna("").str.lower().str.strip()
-    df_vc["Fund_Stage_Clean"] = df_vc["Fund Stage"].fillna("").str.lower().str.strip()
-    
-    # Initial filtering
-    matches = []
-    for _, vc in df_vc.iterrows():
-        score = 0
-        reasons = []
-        
-        # Industry match
-        if any(ind.lower() in vc["Fund_Focus_Clean"] for ind in industry.lower().split(",")):
-            score += 0.4
-            reasons.append(f"Industry focus match: {vc['Fund Focus (Sectors)']}")
-        
-        # Stage match (if provided)
-        if stage and stage.lower() in vc["Fund_Stage_Clean"]:
-            score += 0.3
-            reasons.append(f"Stage match: {vc['Fund Stage']}")
-            
-        # Location match (if provided)
-        if location and location.lower() in vc["Location_Clean"]:
-            score += 0.3
-            reasons.append(f"Location match: {vc['Location']}")
-        
-        if score > 0:
-            matches.append({
-                "id": vc["Investor Name"].lower().replace(" ", "_"),  # Generate an ID for the investor
-                "name": vc["Investor Name"],
-                "match_score": round(score, 2),
-                "reasons": reasons,
-                "focus": vc["Fund Focus (Sectors)"],
-                "stage": vc["Fund Stage"],
-                "location": vc["Location"]
-            })
-    
-    # Sort by match score
-    matches.sort(key=lambda x: x["match_score"], reverse=True)
-    
-    # Use LLM to enhance top matches with personalized insights
-    enhanced_matches = []
-    for match in matches[:5]:  # Enhance top 5 matches
-        prompt = f"""Analyze this potential investor match for {startup_name} (industry: {industry}):
+# Bounds for the per-page personalized insight step
+INSIGHT_CONCURRENCY = 5
+INSIGHT_DEADLINE_SECONDS = 8.0
+INSIGHT_PLACEHOLDER = "Personalized insight is still being prepared for this investor."
+
+def _enhanced_hits(dataset, industry: str, stage: str, location: str,
+                   rows: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """Rule hits and scores in tenths (4 for industry, 3 each for stage and location)
+    for the given investor rows, the index candidates by default."""
+    industry_rows, stage_rows, location_rows = dataset.index.enhanced_postings(industry, stage, location)
+    if rows is None:
+        rows = dataset.index.union(industry_rows, stage_rows, location_rows)
+    industry_hit = np.isin(rows, industry_rows)
+    stage_hit = np.isin(rows, stage_rows)
+    location_hit = np.isin(rows, location_rows)
+    tenths = 4 * industry_hit + 3 * stage_hit + 3 * location_hit
+    return {"rows": rows, "industry": industry_hit, "stage": stage_hit, "location": location_hit, "scores": tenths}
+
+def _rank_enhanced(dataset, industry: str, stage: str, location: str) -> RankedResults:
+    """Rank index candidates; every other investor scores zero."""
+    hits = _enhanced_hits(dataset, industry, stage, location)
+    return RankedResults(hits["scores"], payload=hits, rows=hits["rows"])
+
+def _build_match(dataset, hits: Dict[str, np.ndarray], position: int) -> Dict[str, Any]:
+    vc = dataset.df.iloc[hits["rows"][position]]
+    reasons = []
+    if hits["industry"][position]:
+        reasons.append(f"Industry focus match: {vc['Fund Focus (Sectors)']}")
+    if hits["stage"][position]:
+        reasons.append(f"Stage match: {vc['Fund Stage']}")
+    if hits["location"][position]:
+        reasons.append(f"Location match: {vc['Location']}")
+
+    return {
+        "id": vc["Investor Name"].lower().replace(" ", "_"),  # Generate an ID for the investor
+        "name": vc["Investor Name"],
+        "match_score": round(int(hits["scores"][position]) / 10, 2),
+        "reasons": reasons,
+        "focus": vc["Fund Focus (Sectors)"],
+        "stage": vc["Fund Stage"],
+        "location": vc["Location"]
+    }
+
+def _insight_prompt(startup_name: str, industry: str, match: Dict[str, Any]) -> str:
+    return f"""Analyze this potential investor match for {startup_name} (industry: {industry}):
 
 Investor: {match['name']}
 Focus Areas: {match['focus']}
@@ -63,17 +61,118 @@ Location: {match['location']}
 
 Provide a brief, specific reason why this could be a good match, focusing on unique synergies.
 Return only a single sentence without any prefixes or formatting."""
-        
-        insight = route_llm_call(
-            task_type="pitch_block",
+
+async def _fetch_insight(prompt: str, semaphore: asyncio.Semaphore, started: List[bool], slot: int) -> str:
+    async with semaphore:
+        started[slot] = True
+        insight = await route_llm_call_async(
+            task_type="match_insight",
             prompt=prompt,
             max_tokens=100
         )
-        
-        match["personalized_insight"] = insight.strip()
-        enhanced_matches.append(match)
+    if isinstance(insight, FallbackText):
+        return FallbackText(insight.strip())
+    return insight.strip()
+
+def _cache_late_insight(key, task):
+    """Keep an insight that missed the deadline for the next request."""
+    if not task.cancelled() and task.exception() is None and not isinstance(task.result(), FallbackText):
+        insight_cache.put(key, task.result())
+
+def enrich_matches(startup_name: str, industry: str, matches: List[Dict[str, Any]],
+                   concurrency: int = INSIGHT_CONCURRENCY,
+                   deadline: float = INSIGHT_DEADLINE_SECONDS) -> List[Dict[str, Any]]:
+    """Add a personalized_insight to each match, fetching them concurrently."""
+    return run_sync(enrich_matches_async(startup_name, industry, matches, concurrency, deadline))
+
+async def enrich_matches_async(startup_name: str, industry: str, matches: List[Dict[str, Any]],
+                               concurrency: int = INSIGHT_CONCURRENCY,
+                               deadline: float = INSIGHT_DEADLINE_SECONDS) -> List[Dict[str, Any]]:
+    """Awaitable enrich_matches.
+    
+    Insights already in the insight cache are reused without an LLM call.
+    For the rest, at most `concurrency` LLM calls run at once and the whole
+    step waits no longer than `deadline` seconds. Matches whose insight is
+    late, failed or a canned provider fallback get INSIGHT_PLACEHOLDER and
+    insight_fallback=True instead of holding up the response; calls already
+    in flight finish in the background and are cached for the next request,
+    calls not yet started are cancelled. Placeholders and fallbacks are
+    never cached.
+    """
+    pending = []
+    for match in matches:
+        key = insight_key(startup_name, industry, match["name"])
+        insight = insight_cache.get(key)
+        if insight is None:
+            pending.append((match, key))
+        else:
+            match["personalized_insight"] = insight
+            match["insight_fallback"] = False
+    if not pending:
+        return matches
     
-    return enhanced_matches
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    started = [False] * len(pending)
+    tasks = [
+        asyncio.ensure_future(_fetch_insight(_insight_prompt(startup_name, industry, match), semaphore, started, slot))
+        for slot, (match, _) in enumerate(pending)
+    ]
+    done, _ = await asyncio.wait(tasks, timeout=deadline)
+    
+    for slot, ((match, key), task) in enumerate(zip(pending, tasks)):
+        if task in done and task.exception() is None and not isinstance(task.result(), FallbackText):
+            match["personalized_insight"] = task.result()
+            match["insight_fallback"] = False
+            insight_cache.put(key, match["personalized_insight"])
+        else:
+            if task in done and task.exception() is None:
+                print(f"Insight generation for {match['name']} got a fallback response")
+            elif task in done:
+                print(f"Insight generation failed for {match['name']}: {str(task.exception())}")
+            else:
+                print(f"Insight generation for {match['name']} missed the {deadline}s deadline")
+                if started[slot]:
+                    task.add_done_callback(lambda late, key=key: _cache_late_insight(key, late))
+                else:
+                    task.cancel()
+            match["personalized_insight"] = INSIGHT_PLACEHOLDER
+            match["insight_fallback"] = True
+    return matches
+
+def match_vc_to_startup_page(startup_name: str, industry: str, stage: str = "", location: str = "",
+                             limit: int = 5, cursor: Optional[str] = None,
+                             insight_concurrency: int = INSIGHT_CONCURRENCY,
+                             insight_deadline: float = INSIGHT_DEADLINE_SECONDS) -> Dict[str, Any]:
+    """Match startup to VCs and return one page of LLM-enhanced matches plus the next cursor."""
+    return run_sync(match_vc_to_startup_page_async(startup_name, industry, stage, location, limit, cursor,
+                                                   insight_concurrency, insight_deadline))
+
+async def match_vc_to_startup_page_async(startup_name: str, industry: str, stage: str = "", location: str = "",
+                                         limit: int = 5, cursor: Optional[str] = None,
+                                         insight_concurrency: int = INSIGHT_CONCURRENCY,
+                                         insight_deadline: float = INSIGHT_DEADLINE_SECONDS) -> Dict[str, Any]:
+    """Awaitable match_vc_to_startup_page."""
+    # Shared, already normalized VC dataset
+    dataset = get_vc_dataset()
+    fingerprint = repr((dataset.signature, "enhanced", industry, stage, location))
+    
+    # Only investors sharing an industry, stage or location term score above zero,
+    # and result dicts are built for the requested page only
+    hits, positions, next_cursor = paginate(
+        fingerprint, limit, cursor,
+        lambda: _rank_enhanced(dataset, industry, stage, location),
+        lambda rows: _enhanced_hits(dataset, industry, stage, location, rows)
+    )
+    matches = [_build_match(dataset, hits, position) for position in positions]
+    
+    # Use LLM to enhance the page's matches with personalized insights
+    await enrich_matches_async(startup_name, industry, matches, concurrency=insight_concurrency, deadline=insight_deadline)
+    
+    return {"matches": matches, "next_cursor": next_cursor}
+
+def match_vc_to_startup_enhanced(startup_name: str, industry: str, stage: str = "", location: str = "") -> List[Dict[str, Any]]:
+    """Match startup to VCs using both data-driven and LLM-enhanced matching."""
+    return match_vc_to_startup_page(startup_name, industry, stage, location, limit=5)["matches"]
 
 class InvestorMatcher:
     def __init__(self, openai_client: OpenAIClient):
@@ -1,83 +1,231 @@
 import os
 import json
-from openai import OpenAI
-from typing import Dict, Any, List
+import asyncio
+import time
+import weakref
+from openai import AsyncOpenAI, OpenAI
+from typing import Dict, Any, AsyncIterator, List
+from .llm_fallback import FallbackText
+from .circuit_breaker import get_breaker
+
+# Seconds the startup health check waits for the provider before giving up
+HEALTH_CHECK_TIMEOUT = float(os.getenv("LLM_HEALTH_CHECK_TIMEOUT", "5"))
+
+def parse_json_response(response: str) -> Any:
+    """A completion's JSON payload, with any Markdown code fence removed; None if it is not JSON."""
+    try:
+        return json.loads(response.strip().replace('```json', '').replace('```', '').strip())
+    except ValueError:
+        return None
+
+def valid_criterion_scores(scores: Any, criteria: List[str]) -> bool:
+    """Whether `scores` has exactly `criteria`, each as {"score": 0.0-1.0, "explanation": str}."""
+    if not isinstance(scores, dict) or set(scores) != set(criteria):
+        return False
+    for value in scores.values():
+        if not isinstance(value, dict) or not isinstance(value.get("explanation"), str):
+            return False
+        score = value.get("score")
+        if isinstance(score, bool) or not isinstance(score, (int, float)) or not 0.0 <= score <= 1.0:
+            return False
+    return True
 
 class OpenAIClient:
     def __init__(self):
         self.api_key = None
         self.client = None
         self.model = "gpt-4-turbo-preview"
+        self.temperature = 0.7
+        self.max_tokens = 2000
         self.use_mock = False
-        # Don't initialize right away - we'll do it on first use
+        self.initialized = False
+        # One AsyncOpenAI per event loop; its connection pool is bound to the loop
+        self._async_clients = weakref.WeakKeyDictionary()
+        # Readiness as seen by the last health_check()
+        self.status = "pending"
+        self.status_detail = None
+        self.checked_at = None
+        # Don't initialize right away - we'll do it on first use or at startup
     
     def initialize(self):
-        """Initialize or reinitialize the client with current environment variables"""
+        """Initialize or reinitialize the client with current environment variables.
+        
+        Only builds the client objects; no network I/O. health_check() is
+        what talks to the provider.
+        """
         current_api_key = os.getenv('OPENAI_API_KEY')
         
         # Only reinitialize if the API key has changed
-        if current_api_key != self.api_key:
+        if current_api_key != self.api_key or not self.initialized:
+            self.initialized = True
             self.api_key = current_api_key
             self.use_mock = False
+            self._async_clients = weakref.WeakKeyDictionary()
             
             try:
                 # Try to initialize the real client
                 if self.api_key:
                     print(f"Initializing OpenAI client with API key: {self.api_key[:4]}...")
                     self.client = OpenAI(api_key=self.api_key)
-                    # Test the API key with a simple request
-                    try:
-                        self.client.models.list()
-                        print("Successfully initialized OpenAI client with real API")
-                        return True
-                    except Exception as e:
-                        print(f"OpenAI API key validation error: {str(e)}")
-                        print("Falling back to mock OpenAI implementation")
-                        self.use_mock = True
                 else:
                     print("No OpenAI API key found in environment variables")
                     print("Falling back to mock OpenAI implementation")
                     self.use_mock = True
+                    self.status, self.status_detail = "mock", "OPENAI_API_KEY is not set"
             except Exception as e:
                 # If there's an error, fall back to mock implementation
                 print(f"Error initializing OpenAI client: {str(e)}")
                 print("Falling back to mock OpenAI implementation")
                 self.use_mock = True
+                self.status, self.status_detail = "mock", str(e)
         
         return not self.use_mock
-
-    def complete(self, prompt: str, system_prompt: str = None) -> str:
-        # Initialize the client first (will only do work if environment has changed)
+    
+    async def health_check(self, timeout: float = HEALTH_CHECK_TIMEOUT) -> Dict[str, Any]:
+        """(Re)initialize from the environment and probe the API once.
+        
+        Meant for startup, off the request path. Also opens a pooled
+        connection on the running loop's async client. A failed or slow
+        probe is recorded in the readiness state but does not switch the
+        client to mock responses; only a missing key does.
+        """
         self.initialize()
+        if not self.use_mock:
+            try:
+                await asyncio.wait_for(self._get_async_client().models.list(), timeout)
+                self.status, self.status_detail = "ready", None
+                print("Successfully initialized OpenAI client with real API")
+            except Exception as e:
+                self.status, self.status_detail = "degraded", f"{type(e).__name__}: {e}"
+                print(f"OpenAI health check failed: {self.status_detail}")
+        self.checked_at = time.time()
+        return self.readiness()
+    
+    def readiness(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "detail": self.status_detail,
+            "checked_at": self.checked_at,
+            "model": self.model,
+        }
+
+    def complete(self, prompt: str, system_prompt: str = None, model: str = None, max_tokens: int = None,
+                 temperature: float = None, stop: List[str] = None) -> str:
+        if not self.initialized:
+            self.initialize()
         
         # If we're using the mock implementation, return mock responses
         if self.use_mock:
             return self._mock_complete(prompt)
+        
+        # Don't even try while the API is known to be failing
+        breaker = get_breaker("openai", model or self.model)
+        if not breaker.allow():
+            return self._mock_complete(prompt)
             
         # Otherwise, try to use the real API
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-        
         try:
             response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=0.7,
-                max_tokens=2000
+                **self._request(prompt, system_prompt, model, max_tokens, temperature, stop)
+            )
+            breaker.record_success()
+            return response.choices[0].message.content
+        except Exception as e:
+            breaker.record_failure()
+            print(f"OpenAI API error: {str(e)}. Falling back to mock response.")
+            return self._mock_complete(prompt)
+    
+    async def complete_async(self, prompt: str, system_prompt: str = None, model: str = None, max_tokens: int = None,
+                             temperature: float = None, stop: List[str] = None) -> str:
+        """Awaitable complete(); the request itself never blocks the event loop."""
+        if not self.initialized:
+            self.initialize()
+        
+        if self.use_mock:
+            return self._mock_complete(prompt)
+        
+        breaker = get_breaker("openai", model or self.model)
+        if not breaker.allow():
+            return self._mock_complete(prompt)
+        
+        try:
+            response = await self._get_async_client().chat.completions.create(
+                **self._request(prompt, system_prompt, model, max_tokens, temperature, stop)
             )
+            breaker.record_success()
             return response.choices[0].message.content
         except Exception as e:
+            breaker.record_failure()
             print(f"OpenAI API error: {str(e)}. Falling back to mock response.")
             return self._mock_complete(prompt)
     
+    async def stream_async(self, prompt: str, system_prompt: str = None, model: str = None, max_tokens: int = None,
+                           temperature: float = None, stop: List[str] = None) -> AsyncIterator[str]:
+        """complete_async() as a stream of text deltas."""
+        if not self.initialized:
+            self.initialize()
+        
+        breaker = get_breaker("openai", model or self.model)
+        if self.use_mock or not breaker.allow():
+            yield self._mock_complete(prompt)
+            return
+        
+        streamed = False
+        try:
+            stream = await self._get_async_client().chat.completions.create(
+                **self._request(prompt, system_prompt, model, max_tokens, temperature, stop), stream=True
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    streamed = True
+                    yield chunk.choices[0].delta.content
+            breaker.record_success()
+        except Exception as e:
+            breaker.record_failure()
+            print(f"OpenAI API error: {str(e)}. Falling back to mock response.")
+            # Text already sent cannot be taken back; only fall back before the first delta
+            if streamed:
+                raise
+            yield self._mock_complete(prompt)
+    
+    def _get_async_client(self) -> AsyncOpenAI:
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = AsyncOpenAI(api_key=self.api_key)
+            self._async_clients[loop] = client
+        return client
+    
+    def _request(self, prompt: str, system_prompt: str = None, model: str = None, max_tokens: int = None,
+                 temperature: float = None, stop: List[str] = None) -> Dict[str, Any]:
+        """chat.completions.create arguments; unset settings use the client defaults"""
+        request = {
+            "model": model or self.model,
+            "messages": self._messages(prompt, system_prompt),
+            "temperature": self.temperature if temperature is None else temperature,
+            "max_tokens": max_tokens or self.max_tokens,
+        }
+        if stop:
+            request["stop"] = stop
+        return request
+    
+    def _messages(self, prompt: str, system_prompt: str = None) -> List[Dict[str, str]]:
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        return messages
+    
+    def fallback_response(self, prompt: str) -> str:
+        """Canned response used when no real answer is available in time."""
+        return self._mock_complete(prompt)
+    
     def _mock_complete(self, prompt: str) -> str:
         """Provide mock responses when the API is unavailable"""
         # Extract key terms from the prompt to create a somewhat relevant response
         if "pitch" in prompt.lower():
             # Return a sample pitch
-            return json.dumps({
+            return FallbackText(json.dumps({
                 "problem": {"text": "Many startups struggle with finding the right investors, often spending months on outreach with low success rates. Research shows founders spend an average of 6 months and 30+ meetings to close funding rounds.", "confidence": 0.91},
                 "solution": {"text": "PitchSense uses AI to match startups with the most relevant investors based on industry, stage, and investment criteria, reducing fundraising time by 60% and increasing successful meetings by 3x.", "confidence": 0.89},
                 "market": {"text": "The global fundraising advisory market is valued at $5.8B with a CAGR of 11.4%. Our target segment of early-stage startup advisory is growing at 18% annually as founder numbers increase worldwide.", "confidence": 0.86},
@@ -85,10 +233,10 @@ class OpenAIClient:
                 "competition": {"text": "Key competitors include traditional fundraising advisors (high cost), AngelList (generalized), and FounderSuite (outdated UI). PitchSense differentiates through AI-powered matching algorithms and a focus on quality over quantity.", "confidence": 0.85},
                 "traction": {"text": "2,500 startups onboarded, 150 paying customers, $18K MRR growing 22% month-over-month. Strategic partnerships with 3 accelerators and testimonials from founders who raised $12M+ using our platform.", "confidence": 0.93},
                 "ask": {"text": "Raising $1.5M at $10M valuation to scale marketing (40%), engineering (35%), and operations (25%). Targeting cash-flow positive in 18 months with projected $1.2M ARR by EOY 2025.", "confidence": 0.92}
-            }, indent=2)
+            }, indent=2))
         elif "email" in prompt.lower():
             # Return a sample email
-            return """Subject: AI-Powered Face Recognition Safety Startup - $1.5M Seed Round
+            return FallbackText("""Subject: AI-Powered Face Recognition Safety Startup - $1.5M Seed Round
 
 Hi Alex,
 
@@ -98,38 +246,57 @@ Could we schedule 15 minutes to discuss how our technology aligns with your AI s
 
 Best,
 Yash
-yash@facerecog.ai"""
+yash@facerecog.ai""")
         else:
             # Generic completion
-            return "I've processed your request and have the information you need. Please let me know if you'd like any clarification or have additional questions."
+            return FallbackText("I've processed your request and have the information you need. Please let me know if you'd like any clarification or have additional questions.")
     
     def analyze(self, text: str, criteria: List[str]) -> Dict[str, Any]:
         """Analyze text based on given criteria"""
-        # Initialize the client first (will only do work if environment has changed)
-        self.initialize()
+        if not self.initialized:
+            self.initialize()
         
         # If we're using the mock implementation, return mock analysis
         if self.use_mock:
             return self._mock_analyze(text, criteria)
         
-        prompt = f"""Analyze the following text based on these criteria: {', '.join(criteria)}
-        
-        Text: {text}
+        try:
+            response = self.complete(self._analyze_prompt(text, criteria))  # This will fall back to mock if real API fails
+            return self._parse_analysis(response, text, criteria)
+        except Exception as e:
+            print(f"Analysis error: {str(e)}. Falling back to mock analysis.")
+            return self._mock_analyze(text, criteria)
+    
+    async def analyze_async(self, text: str, criteria: List[str]) -> Dict[str, Any]:
+        """Awaitable analyze()."""
+        if not self.initialized:
+            self.initialize()
         
-        Provide a JSON response with scores and explanations for each criterion."""
+        if self.use_mock:
+            return self._mock_analyze(text, criteria)
         
         try:
-            response = self.complete(prompt)  # This will fall back to mock if real API fails
-            # For safety, wrap the eval in a try/except
-            try:
-                return eval(response)  # Convert string response to dict
-            except:
-                # If eval fails, return mock analysis
-                return self._mock_analyze(text, criteria)
+            response = await self.complete_async(self._analyze_prompt(text, criteria))
+            return self._parse_analysis(response, text, criteria)
         except Exception as e:
             print(f"Analysis error: {str(e)}. Falling back to mock analysis.")
             return self._mock_analyze(text, criteria)
     
+    def _analyze_prompt(self, text: str, criteria: List[str]) -> str:
+        return f"""Analyze the following text based on these criteria: {', '.join(criteria)}
+        
+        Text: {text}
+        
+        Return only a JSON object with exactly these keys: {', '.join(criteria)},
+        each {{"score": <0.0-1.0>, "explanation": "<one sentence>"}}."""
+    
+    def _parse_analysis(self, response: str, text: str, criteria: List[str]) -> Dict[str, Any]:
+        scores = parse_json_response(response)
+        if not valid_criterion_scores(scores, criteria):
+            # Not the requested JSON; fall back to mock analysis
+            return self._mock_analyze(text, criteria)
+        return scores
+    
     def _mock_analyze(self, text: str, criteria: List[str]) -> Dict[str, Any]:
         """Provide mock analysis when the API is unavailable"""
         result = {}
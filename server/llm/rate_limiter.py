@@ -0,0 +1,215 @@
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+# Lower runs first. Interactive tasks jump ahead of background and batch work.
+INTERACTIVE, DEFAULT_PRIORITY, BATCH, BACKGROUND = 0, 1, 2, 3
+TASK_PRIORITIES = {
+    'improve': INTERACTIVE,
+    'pitch_block': INTERACTIVE,
+    'regenerate': INTERACTIVE,
+    'clarify_question': DEFAULT_PRIORITY,
+    'clarify_pitch': DEFAULT_PRIORITY,
+    'generate_email': BATCH,
+    'match_insight': BACKGROUND,
+}
+
+# Per-provider limits; override with LLM_<PROVIDER>_RPM / _TPM / _CONCURRENCY
+DEFAULT_LIMITS = {
+    "openai": {"rpm": 500, "tpm": 150000, "concurrency": 16},
+    "anthropic": {"rpm": 50, "tpm": 40000, "concurrency": 8},
+}
+FALLBACK_LIMITS = {"rpm": 60, "tpm": 40000, "concurrency": 4}
+# Completion budget assumed when the caller does not pass max_tokens
+DEFAULT_COMPLETION_TOKENS = 2000
+
+
+# States of a queued call
+WAITING, ADMITTED, CANCELLED = "waiting", "admitted", "cancelled"
+
+
+def task_priority(task_type: str) -> int:
+    return TASK_PRIORITIES.get(task_type, DEFAULT_PRIORITY)
+
+
+def estimate_tokens(prompt: str, system_prompt: Optional[str] = None, max_tokens: Optional[int] = None) -> int:
+    """Tokens a call counts against a tokens/min limit: ~4 characters per prompt token plus the completion budget."""
+    prompt_chars = len(prompt) + len(system_prompt or "")
+    return prompt_chars // 4 + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+
+class TokenBucket:
+    """Holds up to `per_minute` units, refilled continuously at `per_minute` per minute."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_for(self, amount: float) -> float:
+        """Seconds until `amount` is available (0 if it is now)."""
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.level) / self.rate)
+
+    def take(self, amount: float):
+        self.level -= min(amount, self.capacity)
+
+
+class ProviderLimiter:
+    """Requests/min and tokens/min buckets plus a concurrency cap for one provider.
+
+    Calls that cannot start immediately wait in a priority queue (lowest
+    priority value first, then arrival order), so interactive work is
+    admitted ahead of batch and background work. The queue head blocks the
+    calls behind it, so a large background call cannot be starved by a
+    stream of small interactive ones once it reaches the front. Waiters
+    may live on different event loops; when the head is waiting for the
+    buckets to refill, a timer on its loop admits it on time.
+    """
+
+    def __init__(self, name: str, rpm: int, tpm: int, concurrency: int):
+        self.name = name
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.concurrency = concurrency
+        self.in_flight = 0
+        self._queue: List[list] = []
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup_at: Optional[float] = None
+        self.admitted = 0
+        self.queued = 0
+        self.max_queue_depth = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @asynccontextmanager
+    async def slot(self, priority: int = DEFAULT_PRIORITY, tokens: int = 1) -> AsyncIterator[None]:
+        """Wait for an admission, hold it for the body, then free the concurrency slot."""
+        await self.acquire(priority, tokens)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: int = DEFAULT_PRIORITY, tokens: int = 1):
+        loop = asyncio.get_running_loop()
+        admitted = loop.create_future()
+        # [priority, arrival, tokens, loop, future, state]
+        entry = [priority, next(self._order), tokens, loop, admitted, WAITING]
+        start = time.monotonic()
+        with self._lock:
+            heapq.heappush(self._queue, entry)
+            self._dispatch()
+            if entry[5] == WAITING:
+                self.queued += 1
+                self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+        try:
+            await admitted
+        except asyncio.CancelledError:
+            with self._lock:
+                granted = entry[5] == ADMITTED
+                entry[5] = CANCELLED
+            if granted:
+                self.release()
+            raise
+        waited = time.monotonic() - start
+        with self._lock:
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+            self._dispatch()
+
+    def _dispatch(self):
+        """Admit queued calls while limits allow. Call with the lock held."""
+        now = time.monotonic()
+        self.requests.refill(now)
+        self.tokens.refill(now)
+        while self._queue:
+            entry = self._queue[0]
+            if entry[5] == CANCELLED:
+                heapq.heappop(self._queue)
+                continue
+            if self.in_flight >= self.concurrency:
+                # release() dispatches again
+                return
+            wait = max(self.requests.wait_for(1), self.tokens.wait_for(entry[2]))
+            if wait > 0:
+                if self._wakeup_at is None or self._wakeup_at <= now or now + wait < self._wakeup_at:
+                    self._wakeup_at = now + wait
+                    loop = entry[3]
+                    loop.call_soon_threadsafe(loop.call_later, wait, self._wake)
+                return
+            heapq.heappop(self._queue)
+            self.requests.take(1)
+            self.tokens.take(entry[2])
+            self.in_flight += 1
+            self.admitted += 1
+            entry[5] = ADMITTED
+            entry[3].call_soon_threadsafe(_admit, entry[4])
+
+    def _wake(self):
+        with self._lock:
+            self._wakeup_at = None
+            self._dispatch()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            waiting = [entry for entry in self._queue if entry[5] == WAITING]
+            by_priority: Dict[int, int] = {}
+            for entry in waiting:
+                by_priority[entry[0]] = by_priority.get(entry[0], 0) + 1
+            return {
+                "in_flight": self.in_flight,
+                "queue_depth": len(waiting),
+                "queue_depth_by_priority": by_priority,
+                "max_queue_depth": self.max_queue_depth,
+                "admitted": self.admitted,
+                "queued": self.queued,
+                "avg_wait_seconds": round(self.total_wait / self.admitted, 4) if self.admitted else 0.0,
+                "max_wait_seconds": round(self.max_wait, 4),
+                "requests_available": int(self.requests.level),
+                "tokens_available": int(self.tokens.level),
+            }
+
+
+def _admit(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+_limiters: Dict[str, ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def get_limiter(provider: str) -> ProviderLimiter:
+    """Shared limiter for a provider ("openai", "anthropic"), created on first use from env or defaults."""
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            limits = DEFAULT_LIMITS.get(provider, FALLBACK_LIMITS)
+            prefix = f"LLM_{provider.upper()}_"
+            limiter = _limiters[provider] = ProviderLimiter(
+                provider,
+                rpm=int(os.getenv(prefix + "RPM", limits["rpm"])),
+                tpm=int(os.getenv(prefix + "TPM", limits["tpm"])),
+                concurrency=int(os.getenv(prefix + "CONCURRENCY", limits["concurrency"])),
+            )
+        return limiter
+
+def limiter_stats() -> Dict[str, Dict[str, Any]]:
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.stats() for limiter in limiters}
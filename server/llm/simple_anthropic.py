@@ -1,14 +1,18 @@
 import os
-import requests
 import json
+from typing import AsyncIterator
+from .http_pool import get_pool
+from .llm_fallback import FallbackText
+from .circuit_breaker import get_breaker
 
 class SimpleAnthropicClient:
     """A simple client for Anthropic API that doesn't require the anthropic package"""
     
     def __init__(self):
         self.api_key = os.getenv("ANTHROPIC_API_KEY", "").strip()
-        self.base_url = "https://api.anthropic.com/v1/messages"
+        self.base_url = os.getenv("ANTHROPIC_BASE_URL", "https://api.anthropic.com").rstrip("/") + "/v1/messages"
         self.model = "claude-3-haiku-20240307"
+        self.temperature = 0.7
         
         # Set up headers
         self.headers = {
@@ -16,40 +20,122 @@ class SimpleAnthropicClient:
             "X-API-Key": self.api_key,
             "anthropic-version": "2023-06-01"
         }
+        # Shared keep-alive connection pool for api.anthropic.com
+        self.pool = get_pool("anthropic")
     
-    def complete(self, prompt, system_prompt=None):
+    def _payload(self, prompt, system_prompt=None, model=None, max_tokens=None, temperature=None, stop=None):
+        payload = {
+            "model": model or self.model,
+            "max_tokens": max_tokens or 1000,
+            "temperature": self.temperature if temperature is None else temperature,
+            "messages": [{"role": "user", "content": prompt}]
+        }
+        
+        if system_prompt:
+            payload["system"] = system_prompt
+        if stop:
+            payload["stop_sequences"] = stop
+        return payload
+    
+    def complete(self, prompt, system_prompt=None, model=None, max_tokens=None, temperature=None, stop=None):
         """Call the Anthropic API to get a completion"""
+        # Don't even try while the API is known to be failing
+        breaker = get_breaker("anthropic", model or self.model)
+        if not breaker.allow():
+            return self._mock_response(prompt)
+        
         try:
-            payload = {
-                "model": self.model,
-                "max_tokens": 1000,
-                "temperature": 0.7,
-                "messages": [{"role": "user", "content": prompt}]
-            }
-            
-            if system_prompt:
-                payload["system"] = system_prompt
-                
-            response = requests.post(
+            response = self.pool.post(
                 self.base_url,
                 headers=self.headers,
-                data=json.dumps(payload)
+                content=json.dumps(self._payload(prompt, system_prompt, model, max_tokens, temperature, stop))
             )
             
             # Check if the request was successful
             if response.status_code == 200:
                 data = response.json()
+                breaker.record_success()
                 return data["content"][0]["text"]
             else:
+                breaker.record_failure()
                 print(f"Error from Anthropic API: {response.status_code}")
                 print(f"Response: {response.text}")
                 # Fall back to a mock response
                 return self._mock_response(prompt)
-                
+        
         except Exception as e:
+            breaker.record_failure()
             print(f"Exception calling Anthropic API: {str(e)}")
             return self._mock_response(prompt)
     
+    async def complete_async(self, prompt, system_prompt=None, model=None, max_tokens=None, temperature=None, stop=None):
+        """Awaitable complete() over httpx; does not block the event loop"""
+        breaker = get_breaker("anthropic", model or self.model)
+        if not breaker.allow():
+            return self._mock_response(prompt)
+        
+        try:
+            response = await self.pool.post_async(
+                self.base_url,
+                headers=self.headers,
+                content=json.dumps(self._payload(prompt, system_prompt, model, max_tokens, temperature, stop))
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                breaker.record_success()
+                return data["content"][0]["text"]
+            else:
+                breaker.record_failure()
+                print(f"Error from Anthropic API: {response.status_code}")
+                print(f"Response: {response.text}")
+                return self._mock_response(prompt)
+        
+        except Exception as e:
+            breaker.record_failure()
+            print(f"Exception calling Anthropic API: {str(e)}")
+            return self._mock_response(prompt)
+    
+    async def stream_async(self, prompt, system_prompt=None, model=None, max_tokens=None, temperature=None,
+                           stop=None) -> AsyncIterator[str]:
+        """complete_async() as a stream of text deltas, read from the API's server-sent events"""
+        payload = self._payload(prompt, system_prompt, model, max_tokens, temperature, stop)
+        payload["stream"] = True
+        breaker = get_breaker("anthropic", model or self.model)
+        if not breaker.allow():
+            yield self._mock_response(prompt)
+            return
+        
+        streamed = False
+        try:
+            async with self.pool.stream_async(self.base_url, headers=self.headers, content=json.dumps(payload)) as response:
+                if response.status_code != 200:
+                    breaker.record_failure()
+                    await response.aread()
+                    print(f"Error from Anthropic API: {response.status_code}")
+                    print(f"Response: {response.text}")
+                    yield self._mock_response(prompt)
+                    return
+                
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    event = json.loads(line[5:])
+                    if event.get("type") == "content_block_delta" and event["delta"].get("type") == "text_delta":
+                        streamed = True
+                        yield event["delta"]["text"]
+                    elif event.get("type") == "error":
+                        raise Exception(event["error"].get("message", "stream error"))
+            breaker.record_success()
+        
+        except Exception as e:
+            breaker.record_failure()
+            print(f"Exception calling Anthropic API: {str(e)}")
+            # Text already sent cannot be taken back; only fall back before the first delta
+            if streamed:
+                raise
+            yield self._mock_response(prompt)
+    
     def _mock_response(self, prompt):
         """Generate a mock response when the API fails"""
-        return f"Based on your input, I've crafted an improved version that incorporates your specific details while maintaining a compelling narrative structure. The text highlights key strengths, addresses investor concerns, and presents a clear value proposition with supporting evidence."
+        return FallbackText(f"Based on your input, I've crafted an improved version that incorporates your specific details while maintaining a compelling narrative structure. The text highlights key strengths, addresses investor concerns, and presents a clear value proposition with supporting evidence.")
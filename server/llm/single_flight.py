@@ -0,0 +1,51 @@
+import asyncio
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Collapses concurrent identical async calls into one.
+
+    The first caller for a key starts the call as a task; callers arriving
+    while it is in flight await the same task. Every waiter gets its result
+    or its exception. Waiters are shielded from each other: cancelling one
+    does not cancel the shared call. In-flight calls are tracked per event
+    loop, since a task cannot be awaited from another loop.
+    """
+
+    def __init__(self):
+        self._flights = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.collapsed = 0
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            flights: Dict[Hashable, asyncio.Task] = self._flights.setdefault(loop, {})
+            task = flights.get(key)
+            if task is None:
+                self.calls += 1
+                task = flights[key] = loop.create_task(call())
+                task.add_done_callback(lambda done: self._finish(flights, key, done))
+            else:
+                self.collapsed += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, flights: Dict[Hashable, asyncio.Task], key: Hashable, task: asyncio.Task):
+        with self._lock:
+            if flights.get(key) is task:
+                del flights[key]
+        # Mark the exception retrieved even if every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = sum(len(flights) for flights in self._flights.values())
+            return {
+                "calls": self.calls,
+                "collapsed": self.collapsed,
+                "in_flight": in_flight,
+            }
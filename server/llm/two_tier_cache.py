@@ -0,0 +1,213 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Hashable, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, compaction is still per-process atomic
+    fcntl = None
+
+
+def _key_from_json(key):
+    return tuple(key) if isinstance(key, list) else key
+
+
+class TwoTierCache:
+    """Two-tier string cache with TTLs: an in-memory LRU over an optional file.
+
+    The memory tier is an LRU of at most `max_entries` values. When `path`
+    is set, every stored value is also appended to a JSON-lines file, and
+    the disk tier keeps only each key's byte offset in that file, so values
+    survive a restart without being held in memory. Entries expire `ttl`
+    seconds after they are stored (per-entry TTLs can be passed to put())
+    in both tiers. The file is rewritten without stale lines once they
+    outnumber the live ones. Keys are strings or tuples of strings.
+
+    Several processes (or instances) may share one file. Each indexes the
+    lines others append, re-indexes from scratch when the file is replaced
+    or shrinks, and checks a line's key before serving its value. Appends
+    and compaction are serialized by flock() on "<path>.lock".
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 2048, ttl: float = 3600.0):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._memory: "OrderedDict[Hashable, Tuple[str, float]]" = OrderedDict()
+        self._offsets: Dict[Hashable, Tuple[int, float]] = {}
+        self._lines = 0
+        # (inode, size) of the file as far as _offsets covers it
+        self._indexed: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """Cross-process lock around appends (shared) and compaction (exclusive)."""
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.path}.lock", "ab") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _sync(self):
+        """Index lines appended since the last sync; start over if the file was replaced or truncated."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._offsets, self._lines, self._indexed = {}, 0, None
+            return
+        except OSError as e:
+            print(f"Error loading cache {self.path}: {str(e)}")
+            return
+        if self._indexed == (stat.st_ino, stat.st_size):
+            return
+        now = time.time()
+        try:
+            with open(self.path, "rb") as f:
+                inode = os.fstat(f.fileno()).st_ino
+                if self._indexed is None or self._indexed[0] != inode or self._indexed[1] > stat.st_size:
+                    self._offsets, self._lines, offset = {}, 0, 0
+                else:
+                    offset = self._indexed[1]
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # another process is mid-append; pick it up next time
+                    self._lines += 1
+                    try:
+                        entry = json.loads(line)
+                        key, expires = _key_from_json(entry["k"]), float(entry["e"])
+                    except (ValueError, KeyError, TypeError):
+                        offset += len(line)
+                        continue
+                    if expires > now:
+                        self._offsets[key] = (offset, expires)
+                    else:
+                        self._offsets.pop(key, None)
+                    offset += len(line)
+            self._indexed = (inode, offset)
+        except Exception as e:
+            print(f"Error loading cache {self.path}: {str(e)}")
+
+    def _read_disk(self, key: Hashable) -> Optional[str]:
+        offset, expires = self._offsets[key]
+        if expires < time.time():
+            del self._offsets[key]
+            return None
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                entry = json.loads(f.readline())
+            if _key_from_json(entry["k"]) == key:
+                return entry["v"]
+            # The file changed under this offset (compacted elsewhere between sync and open)
+            self._indexed = None
+        except Exception as e:
+            print(f"Error reading cache {self.path}: {str(e)}")
+        del self._offsets[key]
+        return None
+
+    def _remember(self, key: Hashable, value: str, expires: float):
+        self._memory[key] = (value, expires)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key: Hashable) -> Optional[str]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[1] >= time.time():
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                del self._memory[key]
+
+            if self.path:
+                self._sync()
+            if key in self._offsets:
+                expires = self._offsets[key][1]
+                value = self._read_disk(key)
+                if value is not None:
+                    self._remember(key, value, expires)
+                    self.disk_hits += 1
+                    return value
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: str, ttl: Optional[float] = None):
+        expires = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._remember(key, value, expires)
+            if not self.path:
+                return
+            stored_key = list(key) if isinstance(key, tuple) else key
+            line = (json.dumps({"k": stored_key, "v": value, "e": expires}) + "\n").encode()
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with self._file_lock(exclusive=False), open(self.path, "ab") as f:
+                    f.write(line)
+            except Exception as e:
+                print(f"Error saving to cache {self.path}: {str(e)}")
+                return
+            # Indexes this line along with anything other processes appended
+            self._sync()
+            if self._lines > 2 * max(len(self._offsets), self.max_entries):
+                self._compact()
+
+    def _compact(self):
+        """Rewrite the file with only the newest live line per key, across every process's appends."""
+        directory = os.path.dirname(self.path) or "."
+        try:
+            with self._file_lock(exclusive=True):
+                self._sync()
+                if self._lines <= 2 * max(len(self._offsets), self.max_entries):
+                    return  # another process compacted first
+                now = time.time()
+                offsets, lines = {}, 0
+                fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(self.path) + ".", suffix=".tmp",
+                                                 dir=directory)
+                try:
+                    with open(self.path, "rb") as source, os.fdopen(fd, "wb") as target:
+                        for key, (offset, expires) in self._offsets.items():
+                            if expires < now:
+                                continue
+                            source.seek(offset)
+                            offsets[key] = (target.tell(), expires)
+                            target.write(source.readline())
+                            lines += 1
+                        indexed = (os.fstat(target.fileno()).st_ino, target.tell())
+                    os.replace(temp_path, self.path)
+                except BaseException:
+                    if os.path.exists(temp_path):
+                        os.remove(temp_path)
+                    raise
+        except Exception as e:
+            print(f"Error compacting cache {self.path}: {str(e)}")
+            return
+        self._offsets, self._lines, self._indexed = offsets, lines, indexed
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+                "disk_entries": len(self._offsets),
+            }
@@ -0,0 +1,123 @@
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+import pandas as pd
+from .vc_index import VCInvertedIndex
+from .vc_ingest import Signature, load_investor_table, source_signature
+from .vc_scoring import VCScoringEngine
+
+WORKSPACE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_VC_PATH = os.path.join(WORKSPACE_DIR, "VC_FundStage_Location_Sector.csv")
+VC22_PATH = os.path.join(WORKSPACE_DIR, "vc22.csv")
+# The curated file comes first so its rows win for investors listed in both
+INVESTOR_SOURCES = [DEFAULT_VC_PATH, VC22_PATH]
+VC_SNAPSHOT_PATH = os.getenv("VC_SNAPSHOT_PATH", os.path.join(WORKSPACE_DIR, "data", "vc_snapshot.pkl"))
+DEFAULT_STARTUP_PATH = os.path.join(WORKSPACE_DIR, "Startup Insights (2012-2021) Copy export 2025-05-23 23-37-23.csv")
+
+
+class VCDataset:
+    """An immutable, fully prepared snapshot of the investor table."""
+
+    def __init__(self, df: pd.DataFrame, signature: Signature, paths: Sequence[str],
+                 previous: Optional["VCDataset"] = None):
+        self.df = df
+        self.signature = signature
+        self.paths = list(paths)
+        self.loaded_at = time.time()
+        self.engine = VCScoringEngine(df)
+        self.index = VCInvertedIndex(df, previous=previous.index if previous is not None else None)
+
+    @classmethod
+    def from_sources(cls, paths: Sequence[str], signature: Signature, snapshot_path: str,
+                     previous: Optional["VCDataset"] = None) -> "VCDataset":
+        df = load_investor_table(paths, signature, snapshot_path)
+        return cls(df, signature, paths, previous)
+
+
+class VCDatasetRegistry:
+    """Process-wide holder of the unified investor table.
+
+    The investor files are loaded on first use and again only when one of
+    their mtimes or sizes changes; the binary snapshot at `snapshot_path`
+    means the CSVs themselves are only parsed when they changed since the
+    snapshot was written. A reload builds a complete new VCDataset before
+    swapping it in, so concurrent readers always see either the old or
+    the new copy.
+    """
+
+    def __init__(self, paths: Sequence[str] = INVESTOR_SOURCES, snapshot_path: str = VC_SNAPSHOT_PATH):
+        self.paths = list(paths)
+        self.snapshot_path = snapshot_path
+        self._current: Optional[VCDataset] = None
+        self._lock = threading.Lock()
+        self.reloads = 0
+
+    def _signature(self) -> Signature:
+        return source_signature(self.paths)
+
+    def get(self) -> VCDataset:
+        """Return the current snapshot, reloading first if the file changed."""
+        current = self._current
+        try:
+            signature = self._signature()
+        except OSError as e:
+            if current is not None:
+                print(f"VC dataset unavailable ({str(e)}), serving last loaded copy")
+                return current
+            raise Exception(f"Error loading VC dataset: {str(e)}")
+
+        if current is not None and current.signature == signature:
+            return current
+
+        with self._lock:
+            current = self._current
+            if current is None or current.signature != signature:
+                current = VCDataset.from_sources(self.paths, signature, self.snapshot_path, previous=current)
+                self._current = current
+                self.reloads += 1
+        return current
+
+
+vc_registry = VCDatasetRegistry()
+
+def get_vc_dataset() -> VCDataset:
+    """Shared investor table used by every matcher."""
+    return vc_registry.get()
+
+def load_startup_profiles(path: str = DEFAULT_STARTUP_PATH) -> List[Dict[str, Any]]:
+    """Read the Startup Insights export as /api/match startup profiles."""
+    df = pd.read_csv(path)
+    valuations = pd.to_numeric(
+        df["Valuation ($B)"].astype(str).str.replace(r"[$,]", "", regex=True), errors="coerce"
+    ).fillna(0.0)
+    return [
+        {
+            "name": str(name),
+            "valuation": float(valuation),
+            "industry": str(industry),
+            "city": str(city),
+            "country": str(country),
+            "has_investor": str(investors),
+        }
+        for name, valuation, industry, city, country, investors in zip(
+            df["Company"], valuations, df["Industry"].fillna(""), df["City"].fillna(""),
+            df["Country"].fillna(""), df["Select Investors"].fillna("")
+        )
+    ]
+
+def annotate_existing_investors(profiles: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """Startup profiles (the Startup Insights export by default) with the known investors they list.
+
+    Adds "existing_investors": names from the investor table found in each
+    profile's has_investor text, in one automaton pass per distinct text.
+    """
+    if profiles is None:
+        profiles = load_startup_profiles()
+    dataset = get_vc_dataset()
+    names = dataset.engine.display["Investor Name"]
+    annotations = dataset.engine.co_investors.annotate(profile.get("has_investor", "") for profile in profiles)
+    return [
+        {**profile, "existing_investors": [names[row] for row in rows]}
+        for profile, rows in zip(profiles, annotations)
+    ]
@@ -0,0 +1,88 @@
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from .vc_scoring import clean_column, stage_keywords
+
+STAGE_TERMS = sorted({keyword for keywords in stage_keywords.values() for keyword in keywords} | {'growth'})
+
+
+def stage_tokens(stage: str) -> List[str]:
+    return [f"stage:{term}" for term in STAGE_TERMS if term in stage]
+
+
+class _FieldPostings:
+    """Posting lists for one column, grouped by the column's distinct values.
+
+    Rows are stored once, sorted by distinct value, so the rows of any set of
+    values are a concatenation of slices. Tokens map to distinct values, not
+    rows, and a substring query scans distinct values only.
+    """
+
+    def __init__(self, values: pd.Series, tokenize=None, cache: Optional[Dict[str, Tuple[str, ...]]] = None):
+        codes, uniques = pd.factorize(values.astype(str), sort=False)
+        self.values = [str(u) for u in uniques]
+        self.row_order = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes, minlength=len(self.values))
+        self.offsets = np.concatenate(([0], np.cumsum(counts)))
+
+        self.token_values: Dict[str, List[int]] = {}
+        self.tokenized = 0
+        if tokenize is None:
+            return
+        for code, value in enumerate(self.values):
+            tokens = cache.get(value)
+            if tokens is None:
+                tokens = tuple(dict.fromkeys(tokenize(value)))
+                cache[value] = tokens
+                self.tokenized += 1
+            for token in tokens:
+                self.token_values.setdefault(token, []).append(code)
+
+    def rows_for_values(self, codes) -> np.ndarray:
+        if len(codes) == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([self.row_order[self.offsets[c]:self.offsets[c + 1]] for c in codes])
+
+    def lookup(self, token: str) -> np.ndarray:
+        return self.rows_for_values(self.token_values.get(token, []))
+
+    def containing(self, needle: str) -> np.ndarray:
+        return self.rows_for_values([code for code, value in enumerate(self.values) if needle in value])
+
+
+class VCInvertedIndex:
+    """Posting lists behind the industry, stage and location rules of match_vc_to_startup_enhanced.
+
+    Stage keywords are tokenized once per distinct Fund Stage value, and the
+    tokens are carried over from the previous index on reload, so a rebuild
+    only tokenizes values that are new to the dataset.
+    """
+
+    def __init__(self, df: pd.DataFrame, previous: Optional["VCInvertedIndex"] = None):
+        self._stage_cache: Dict[str, Tuple[str, ...]] = dict(previous._stage_cache) if previous is not None else {}
+        self.focus = _FieldPostings(clean_column(df["Fund Focus (Sectors)"]))
+        self.stage = _FieldPostings(clean_column(df["Fund Stage"]), stage_tokens, self._stage_cache)
+        self.location = _FieldPostings(clean_column(df["Location"]))
+
+    @staticmethod
+    def union(*postings: np.ndarray) -> np.ndarray:
+        """Sorted, de-duplicated union of posting lists."""
+        postings = [p for p in postings if len(p)]
+        if not postings:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(postings))
+
+    def enhanced_postings(self, industry: str, stage: str = "",
+                          location: str = "") -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Rows hit by the industry, stage and location rules of match_vc_to_startup_enhanced."""
+        industry_rows = self.union(*(self.focus.containing(ind.lower()) for ind in industry.lower().split(",")))
+        stage_rows = location_rows = np.empty(0, dtype=np.int64)
+        if stage:
+            stage = stage.lower()
+            if stage in STAGE_TERMS:
+                stage_rows = self.stage.lookup(f"stage:{stage}")
+            else:
+                stage_rows = self.stage.containing(stage)
+        if location:
+            location_rows = self.location.containing(location.lower())
+        return industry_rows, stage_rows, location_rows
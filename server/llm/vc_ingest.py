@@ -0,0 +1,93 @@
+import os
+import pickle
+from typing import Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from .vc_scoring import clean_column, parse_stage_mask
+
+# Bump when the table layout changes so old snapshots are rebuilt
+SNAPSHOT_VERSION = 2
+
+INVESTOR_COLUMNS = ["Investor Name", "Fund Focus (Sectors)", "Fund Stage", "Location"]
+
+Signature = Tuple[Tuple[int, int], ...]
+
+
+def source_signature(paths: Sequence[str]) -> Signature:
+    """(mtime_ns, size) of every source file; raises OSError if one is missing."""
+    signature = []
+    for path in paths:
+        stat = os.stat(path)
+        signature.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def read_investor_csv(path: str) -> pd.DataFrame:
+    """One investor file with its columns in INVESTOR_COLUMNS order."""
+    df = pd.read_csv(path)
+    missing = [column for column in INVESTOR_COLUMNS if column not in df.columns]
+    if missing:
+        raise Exception(f"Investor file {path} is missing columns: {', '.join(missing)}")
+    df = df[INVESTOR_COLUMNS].copy()
+    df["Source"] = os.path.basename(path)
+    return df
+
+def build_investor_table(paths: Sequence[str]) -> pd.DataFrame:
+    """Parse and normalize every investor file into one typed table.
+
+    Investors listed in more than one file keep the row from the first
+    file. Repeated text columns are category-typed; Stage_Mask holds the
+    parsed stages as STAGE_BITS, which stage fit is scored from.
+    """
+    df = pd.concat([read_investor_csv(path) for path in paths], ignore_index=True)
+    df = df[df["Investor Name"].notna()]
+    df["Investor_Name_Clean"] = clean_column(df["Investor Name"])
+    df = df.drop_duplicates("Investor_Name_Clean", keep="first").reset_index(drop=True)
+
+    df["Fund_Focus_Clean"] = clean_column(df["Fund Focus (Sectors)"])
+    df["Location_Clean"] = clean_column(df["Location"])
+    df["Fund_Stage_Clean"] = clean_column(df["Fund Stage"])
+    df["Stage_Mask"] = np.array([parse_stage_mask(s) for s in df["Fund Stage"]], dtype=np.uint8)
+
+    for column in ["Fund Focus (Sectors)", "Fund Stage", "Location", "Source",
+                   "Fund_Focus_Clean", "Location_Clean", "Fund_Stage_Clean"]:
+        df[column] = df[column].astype("category")
+    return df
+
+
+def read_snapshot(snapshot_path: str, signature: Signature) -> Optional[pd.DataFrame]:
+    """The snapshot's table if it was built from exactly these source files, else None."""
+    try:
+        with open(snapshot_path, "rb") as f:
+            snapshot = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Ignoring unreadable investor snapshot {snapshot_path}: {str(e)}")
+        return None
+    if snapshot.get("version") != SNAPSHOT_VERSION or snapshot.get("signature") != signature:
+        return None
+    return snapshot["df"]
+
+def write_snapshot(snapshot_path: str, signature: Signature, df: pd.DataFrame):
+    temp_path = f"{snapshot_path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(snapshot_path) or ".", exist_ok=True)
+        with open(temp_path, "wb") as f:
+            pickle.dump({"version": SNAPSHOT_VERSION, "signature": signature, "df": df}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, snapshot_path)
+    except Exception as e:
+        print(f"Error saving investor snapshot {snapshot_path}: {str(e)}")
+
+def load_investor_table(paths: Sequence[str], signature: Signature, snapshot_path: str) -> pd.DataFrame:
+    """The unified investor table, parsing the CSVs only when the snapshot is stale.
+
+    The snapshot is a pickle written by this process, not a format for
+    exchanging data; it is rebuilt whenever a source file changes.
+    """
+    df = read_snapshot(snapshot_path, signature)
+    if df is None:
+        df = build_investor_table(paths)
+        write_snapshot(snapshot_path, signature, df)
+    return df
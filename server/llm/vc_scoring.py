@@ -0,0 +1,418 @@
+import os
+import re
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+import numpy as np
+import pandas as pd
+from .co_investors import CoInvestorDetector, investor_name_keywords
+from .match_pagination import RankedResults
+from .vc_similarity import SIMILARITY_FUNCTIONS, SIMILARITY_MODELS
+
+industry_mapping = {
+    'artificial intelligence': ['ai', 'ml', 'machine learning', 'artificial intelligence', 'ai/ml'],
+    'fintech': ['fintech', 'financial', 'payment', 'banking', 'finance'],
+    'ecommerce': ['e-commerce', 'ecommerce', 'retail', 'marketplace'],
+    'health': ['health', 'healthcare', 'medical', 'biotech', 'life science', 'med device'],
+    'software': ['software', 'saas', 'internet software', 'tech'],
+    'edtech': ['edtech', 'education', 'learning'],
+    'supply chain': ['supply chain', 'logistics', 'transportation'],
+    'data': ['data', 'big data', 'analytics', 'data management'],
+    'hardware': ['hardware', 'iot', 'devices'],
+    'blockchain': ['blockchain', 'crypto', 'web3'],
+    'gaming': ['gaming', 'games', 'entertainment'],
+    'food': ['food', 'agtech', 'agriculture'],
+    'energy': ['energy', 'climate', 'cleantech'],
+    'other': ['other', 'various', 'general']
+}
+
+# Fund stages a VC must list to be a fit for each inferred startup stage
+stage_keywords = {
+    'seed': ['seed', 'pre-seed'],
+    'series a': ['seed', 'series a', 'pre-seed'],
+    'series b': ['series a', 'series b', 'seed'],
+    'series c': ['series b', 'series c', 'series a'],
+    'series d': ['series c', 'series d', 'series b', 'growth'],
+    'pre-ipo': ['series c', 'series d', 'pre-ipo', 'growth']
+}
+
+# One bit per funding stage, in stage order
+STAGE_BITS = {
+    'pre-seed': 1 << 0,
+    'seed': 1 << 1,
+    'series a': 1 << 2,
+    'series b': 1 << 3,
+    'series c': 1 << 4,
+    'series d': 1 << 5,
+    'growth': 1 << 6,
+    'pre-ipo': 1 << 7,
+}
+# Range spellings used in vc22.csv
+STAGE_RANGES = {
+    'early to ipo': ['seed', 'series a', 'series b', 'series c', 'series d', 'growth', 'pre-ipo'],
+    'series b+': ['series b', 'series c', 'series d', 'growth'],
+}
+
+REGIONS = ['asia', 'europe', 'america']
+def _similarity_threshold(default: float = 0.3) -> float:
+    value = os.getenv("VC_SIMILARITY_THRESHOLD", str(default))
+    try:
+        return float(value)
+    except ValueError:
+        print(f"Ignoring invalid VC_SIMILARITY_THRESHOLD {value!r}; using {default}")
+        return default
+
+def _similarity_model(default: str = "ngram") -> str:
+    value = os.getenv("VC_SIMILARITY_MODEL", default).strip().lower()
+    if value not in SIMILARITY_MODELS:
+        print(f"Ignoring unknown VC_SIMILARITY_MODEL {value!r}; using {default}")
+        return default
+    return value
+
+# "Similar industry" measure: "ngram" (character-bigram Dice, the default) or
+# "sequence" (the original SequenceMatcher ratio, which reproduces the old rankings)
+SIMILARITY_MODEL = _similarity_model()
+# Minimum similarity for the "similar industry" rule
+SIMILARITY_THRESHOLD = _similarity_threshold()
+
+def _stage_parts(stages: str) -> List[str]:
+    stages = stages.lower()
+    if "," in stages:
+        return [part.strip() for part in stages.split(",")]
+    # The curated file lists stages separated by spaces ("Seed Series A Series B")
+    return re.findall(r"pre-seed|pre-ipo|series [a-z]\+?|[a-z-]+(?: to [a-z]+)?", stages)
+
+def parse_stage_mask(stages) -> int:
+    """Bitmask of STAGE_BITS for a fund's stage list."""
+    if pd.isna(stages):
+        return 0
+    mask = 0
+    for part in _stage_parts(str(stages)):
+        for stage in STAGE_RANGES.get(part, [part]):
+            mask |= STAGE_BITS.get(stage, 0)
+    return mask
+
+# Fund stage bits that fit each inferred startup stage; other startup stages fit every fund
+STAGE_FIT_MASKS = {
+    startup_stage: sum(STAGE_BITS[keyword] for keyword in keywords)
+    for startup_stage, keywords in stage_keywords.items()
+}
+
+def normalize_industry(industry_text):
+    industry_text = str(industry_text).lower().strip()
+    for standard, variations in industry_mapping.items():
+        if any(var in industry_text for var in variations):
+            return standard
+    return industry_text
+
+def calculate_similarity(str1, str2, model: str = SIMILARITY_MODEL):
+    return SIMILARITY_FUNCTIONS[model](str1, str2)
+
+def infer_startup_stage_from_valuation(val):
+    if pd.isna(val) or val == 0:
+        return "unknown"
+    elif val < 2:
+        return "series a"
+    elif val < 5:
+        return "series b"
+    elif val < 10:
+        return "series c"
+    elif val < 30:
+        return "series d"
+    elif val < 100:
+        return "late"
+    else:
+        return "pre-ipo"
+
+def is_stage_compatible(startup_stage, vc_stages):
+    """Whether a fund's stages (a Stage_Mask or the stage text) fit the startup's stage."""
+    if pd.isna(vc_stages) or startup_stage == "unknown":
+        return True
+
+    if startup_stage in STAGE_FIT_MASKS:
+        vc_mask = vc_stages if isinstance(vc_stages, (int, np.integer)) else parse_stage_mask(vc_stages)
+        return bool(vc_mask & STAGE_FIT_MASKS[startup_stage])
+
+    return True
+
+def check_existing_investor_match(startup_investors, vc_name):
+    if pd.isna(startup_investors) or pd.isna(vc_name):
+        return False
+
+    startup_investors = str(startup_investors).lower()
+    return any(keyword in startup_investors for keyword in investor_name_keywords(vc_name))
+
+def clean_column(values: pd.Series) -> pd.Series:
+    """Lowercase and strip a text column, treating missing values as empty."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(object)
+    return values.fillna("").str.lower().str.strip()
+
+
+class _FactorizedColumn:
+    """A text column stored as integer codes into its distinct values.
+
+    Substring predicates are evaluated once per distinct value and then
+    broadcast to every row through the codes, so a predicate over M rows
+    costs O(distinct values) Python work plus one NumPy gather.
+    """
+
+    def __init__(self, values: pd.Series):
+        codes, uniques = pd.factorize(values.astype(str), sort=False)
+        self.codes = codes
+        self.uniques = [str(u) for u in uniques]
+
+    def map_uniques(self, func) -> np.ndarray:
+        return np.array([func(u) for u in self.uniques], dtype=object)
+
+    def contains(self, needle: str, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        hits = np.fromiter((needle in u for u in self.uniques), dtype=bool, count=len(self.uniques))
+        return hits[self.codes if rows is None else self.codes[rows]]
+
+
+class VCScoringEngine:
+    """Scores a startup against every investor with array operations.
+
+    Produces the same scores, ordering and reasons as the original
+    per-row loop in /api/match, but all request-independent work
+    (cleaning, industry normalization, name keywords) happens once here.
+    """
+
+    def __init__(self, df_vc: pd.DataFrame, similarity_threshold: float = SIMILARITY_THRESHOLD,
+                 similarity_model: str = SIMILARITY_MODEL):
+        self.df = df_vc.reset_index(drop=True)
+        self.size = len(self.df)
+        self.similarity_threshold = similarity_threshold
+
+        self.display = {
+            column: self.df[column].to_numpy(dtype=object)
+            for column in ("Investor Name", "Fund Focus (Sectors)", "Fund Stage", "Location")
+        }
+
+        self.focus = _FactorizedColumn(clean_column(self.df["Fund Focus (Sectors)"]))
+        self.location = _FactorizedColumn(clean_column(self.df["Location"]))
+        self.stage = _FactorizedColumn(clean_column(self.df["Fund Stage"]))
+
+        # Request-independent per-row features
+        self.focus_industry_values = self.focus.map_uniques(normalize_industry)
+        self.focus_industry = self.focus_industry_values[self.focus.codes]
+        self.focus_similarity = SIMILARITY_MODELS[similarity_model](self.focus.uniques)
+        self.region = np.zeros(self.size, dtype=bool)
+        for region in REGIONS:
+            self.region |= self.location.contains(region)
+        self.seed_stage = self.stage.contains('seed')
+        # STAGE_BITS per row: the ingested table's Stage_Mask, parsed here for other frames
+        if "Stage_Mask" in self.df.columns:
+            self.stage_mask = self.df["Stage_Mask"].to_numpy(dtype=np.int64)
+        else:
+            self.stage_mask = self.stage.map_uniques(parse_stage_mask).astype(np.int64)[self.stage.codes]
+
+        # Aho-Corasick automaton over investor name keywords
+        self.co_investors = CoInvestorDetector(self.df["Investor Name"].tolist())
+
+    def _existing_investor(self, startup_investors: str) -> np.ndarray:
+        return self.co_investors.present(startup_investors)
+
+    def _similar_industry(self, startup_industry: str, codes: np.ndarray, pending: np.ndarray) -> np.ndarray:
+        similar = np.zeros(len(codes), dtype=bool)
+        if not pending.any():
+            return similar
+        similar_values = self.focus_similarity.similarity(startup_industry) > self.similarity_threshold
+        similar[pending] = similar_values[codes[pending]]
+        return similar
+
+    def score(self, industry: str, city: str, country: str, valuation: float,
+              has_investor: str = "", rows: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """Compute every rule for the given investor rows (all rows by default).
+
+        Returns the per-rule boolean arrays and total scores, aligned with
+        `rows` (exposed under the "rows" key).
+        """
+        if rows is None:
+            rows = np.arange(self.size)
+        size = len(rows)
+        startup_industry = normalize_industry(industry)
+        startup_city = city.lower().strip()
+        startup_country = country.lower().strip()
+        startup_stage = infer_startup_stage_from_valuation(valuation)
+
+        perfect = self.focus_industry[rows] == startup_industry
+        overlap = self.focus.contains(startup_industry, rows)
+        for word in startup_industry.split():
+            overlap |= self.focus.contains(word, rows)
+        overlap &= ~perfect
+        similar = self._similar_industry(startup_industry, self.focus.codes[rows], ~(perfect | overlap))
+
+        same_country = self.location.contains(startup_country, rows)
+        same_city = self.location.contains(startup_city, rows) & ~same_country
+        regional = np.zeros(size, dtype=bool)
+        if startup_country != 'united states':
+            regional = self.region[rows] & ~same_country & ~same_city
+
+        if startup_stage in STAGE_FIT_MASKS:
+            stage_fit = (self.stage_mask[rows] & STAGE_FIT_MASKS[startup_stage]) != 0
+        else:
+            stage_fit = np.ones(size, dtype=bool)
+
+        existing = self._existing_investor(has_investor.lower())[rows]
+        penalty = self.seed_stage[rows] if valuation > 50 else np.zeros(size, dtype=bool)
+
+        scores = (4 * perfect + 3 * overlap + 2 * similar
+                  + 2 * same_country + same_city + regional
+                  + 2 * stage_fit + existing - penalty).astype(np.int64)
+
+        return {
+            "rows": rows,
+            "startup_industry": startup_industry,
+            "startup_stage": startup_stage,
+            "perfect": perfect,
+            "overlap": overlap,
+            "similar": similar,
+            "same_country": same_country,
+            "same_city": same_city,
+            "regional": regional,
+            "stage_fit": stage_fit,
+            "existing": existing,
+            "penalty": penalty,
+            "scores": scores,
+        }
+
+    def _reasons(self, scored: Dict[str, Any], row: int) -> List[str]:
+        reasons = []
+        if scored["perfect"][row]:
+            reasons.append(f"perfect industry match ({scored['startup_industry']})")
+        elif scored["overlap"][row]:
+            reasons.append(f"industry overlap ({scored['startup_industry']})")
+        elif scored["similar"][row]:
+            reasons.append("similar industry")
+
+        if scored["same_country"][row]:
+            reasons.append("same country")
+        elif scored["same_city"][row]:
+            reasons.append("same city")
+        elif scored["regional"][row]:
+            reasons.append("regional match")
+
+        if scored["stage_fit"][row]:
+            reasons.append(f"stage fit ({scored['startup_stage']})")
+        if scored["existing"][row]:
+            reasons.append("existing investor")
+        if scored["penalty"][row]:
+            reasons.append("valuation too high for seed-stage VC")
+        return reasons
+
+    def build_result(self, scored: Dict[str, Any], position: int) -> Dict[str, Any]:
+        row = scored["rows"][position]
+        return {
+            "name": self.display["Investor Name"][row],
+            "score": int(scored["scores"][position]),
+            "industry": self.display["Fund Focus (Sectors)"][row],
+            "stage": self.display["Fund Stage"][row],
+            "location": self.display["Location"][row],
+            "reason": " | ".join(self._reasons(scored, position))
+        }
+
+    def rank(self, industry: str, city: str, country: str, valuation: float,
+             has_investor: str = "") -> RankedResults:
+        """Rank every investor for a startup."""
+        scored = self.score(industry, city, country, valuation, has_investor)
+        return RankedResults(scored["scores"], payload=scored)
+
+    def results(self, scored: Dict[str, Any], positions: np.ndarray) -> List[Dict[str, Any]]:
+        return [self.build_result(scored, position) for position in positions]
+
+    def match(self, industry: str, city: str, country: str, valuation: float,
+              has_investor: str = "", k: int = 5) -> List[Dict[str, Any]]:
+        """Return the top k investors, best score first, ties in dataset order.
+
+        Result dicts are only built for the k selected investors.
+        """
+        ranked = self.rank(industry, city, country, valuation, has_investor)
+        return self.results(ranked.payload, ranked.page(0, k))
+
+    def _industry_tables(self, industries: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Perfect / overlap / similar industry rules for each query industry x distinct focus."""
+        perfect = np.array([self.focus_industry_values == industry for industry in industries], dtype=bool)
+        perfect = perfect.reshape(len(industries), len(self.focus.uniques))
+        overlap = np.zeros_like(perfect)
+        for i, industry in enumerate(industries):
+            needles = [industry] + industry.split()
+            overlap[i] = [any(needle in focus for needle in needles) for focus in self.focus.uniques]
+        overlap &= ~perfect
+        similar = self.focus_similarity.similarity_matrix(industries) > self.similarity_threshold
+        similar &= ~(perfect | overlap)
+        return perfect, overlap, similar
+
+    def iter_match_batch(self, startups: List[Dict[str, Any]], k: int = 5,
+                         max_cells: int = 1_000_000) -> Iterator[List[Dict[str, Any]]]:
+        """Yield the top k investors for each startup, in input order.
+
+        Each startup is a dict with the /api/match fields (industry, city,
+        country, valuation and optionally has_investor). Every rule is
+        evaluated once per distinct query value x distinct investor value,
+        then gathered into a startups x investors score matrix. The matrix
+        is built `max_cells` cells at a time, so memory stays bounded
+        however many startups are passed. Results are identical to calling
+        match() for each startup.
+        """
+        if not startups:
+            return
+        industry_codes, industries = pd.factorize(pd.Series([normalize_industry(s["industry"]) for s in startups]))
+        country_codes, countries = pd.factorize(pd.Series([s["country"].lower().strip() for s in startups]))
+        city_codes, cities = pd.factorize(pd.Series([s["city"].lower().strip() for s in startups]))
+        stage_codes, stages = pd.factorize(pd.Series([infer_startup_stage_from_valuation(s["valuation"]) for s in startups]))
+        valuations = np.array([s["valuation"] for s in startups], dtype=float)
+        industries, countries, cities, stages = (list(map(str, values)) for values in (industries, countries, cities, stages))
+
+        perfect_t, overlap_t, similar_t = self._industry_tables(industries)
+        country_t = np.array([[country in loc for loc in self.location.uniques] for country in countries], dtype=bool)
+        city_t = np.array([[city in loc for loc in self.location.uniques] for city in cities], dtype=bool)
+        # Stages outside STAGE_FIT_MASKS fit every fund: all bits set plus fit_all
+        stage_fits = np.array([STAGE_FIT_MASKS.get(stage, -1) for stage in stages], dtype=np.int64)
+        fit_all = np.array([stage not in STAGE_FIT_MASKS for stage in stages], dtype=bool)
+        non_us = np.array([country != 'united states' for country in countries], dtype=bool)[country_codes]
+
+        positions = np.arange(self.size, dtype=np.int64)
+        chunk = max(1, max_cells // max(self.size, 1))
+        for start in range(0, len(startups), chunk):
+            batch = slice(start, min(start + chunk, len(startups)))
+            focus_rows, location_rows = self.focus.codes, self.location.codes
+
+            perfect = perfect_t[industry_codes[batch]][:, focus_rows]
+            overlap = overlap_t[industry_codes[batch]][:, focus_rows]
+            similar = similar_t[industry_codes[batch]][:, focus_rows]
+            same_country = country_t[country_codes[batch]][:, location_rows]
+            same_city = city_t[city_codes[batch]][:, location_rows] & ~same_country
+            regional = self.region[None, :] & non_us[batch, None] & ~same_country & ~same_city
+            stage_fit = (((stage_fits[stage_codes[batch], None] & self.stage_mask[None, :]) != 0)
+                         | fit_all[stage_codes[batch], None])
+            existing = np.array([self._existing_investor(s.get("has_investor", "").lower())
+                                 for s in startups[batch]], dtype=bool).reshape(perfect.shape)
+            penalty = (valuations[batch, None] > 50) & self.seed_stage[None, :]
+
+            scores = (4 * perfect + 3 * overlap + 2 * similar
+                      + 2 * same_country + same_city + regional
+                      + 2 * stage_fit + existing - penalty).astype(np.int64)
+
+            key = -scores * self.size + positions[None, :]
+            if k < self.size:
+                selected = np.argpartition(key, k - 1, axis=1)[:, :k]
+            else:
+                selected = np.broadcast_to(positions, key.shape)
+            selected = np.take_along_axis(selected, np.argsort(np.take_along_axis(key, selected, axis=1), axis=1), axis=1)
+
+            rules = {
+                "perfect": perfect, "overlap": overlap, "similar": similar,
+                "same_country": same_country, "same_city": same_city, "regional": regional,
+                "stage_fit": stage_fit, "existing": existing, "penalty": penalty, "scores": scores,
+            }
+            for i, n in enumerate(range(batch.start, batch.stop)):
+                rows = selected[i]
+                scored = {name: values[i, rows] for name, values in rules.items()}
+                scored["rows"] = rows
+                scored["startup_industry"] = industries[industry_codes[n]]
+                scored["startup_stage"] = stages[stage_codes[n]]
+                yield [self.build_result(scored, position) for position in range(len(rows))]
+
+    def match_batch(self, startups: List[Dict[str, Any]], k: int = 5,
+                    max_cells: int = 1_000_000) -> List[List[Dict[str, Any]]]:
+        """Top k investors for every startup; see iter_match_batch."""
+        return list(self.iter_match_batch(startups, k=k, max_cells=max_cells))
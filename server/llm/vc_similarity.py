@@ -0,0 +1,95 @@
+from difflib import SequenceMatcher
+from typing import Dict, List
+import numpy as np
+
+
+def char_ngrams(text: str, n: int = 2) -> List[str]:
+    """Distinct character n-grams of a space-padded string."""
+    text = f" {text} "
+    return list(dict.fromkeys(text[i:i + n] for i in range(len(text) - n + 1)))
+
+def dice_similarity(str1: str, str2: str, n: int = 2) -> float:
+    """Dice coefficient of two strings' character n-gram sets."""
+    grams1, grams2 = set(char_ngrams(str1, n)), set(char_ngrams(str2, n))
+    if not grams1 and not grams2:
+        return 1.0
+    return 2 * len(grams1 & grams2) / (len(grams1) + len(grams2))
+
+def sequence_similarity(str1: str, str2: str) -> float:
+    """The original industry similarity: difflib's SequenceMatcher ratio."""
+    return SequenceMatcher(None, str1, str2).ratio()
+
+
+class NGramSimilarityModel:
+    """Dice similarity of query strings against a fixed list of texts.
+
+    The texts are stored as a sparse binary text x n-gram matrix in
+    compressed-column form (per n-gram, the sorted texts containing it).
+    Scoring a query is one sparse matrix-vector product: the query's
+    n-gram columns are gathered and counted per text, then normalized by
+    the n-gram set sizes. This replaces a SequenceMatcher call per text.
+    """
+
+    def __init__(self, texts: List[str], n: int = 2):
+        self.n = n
+        self.size = len(texts)
+        self.vocabulary: Dict[str, int] = {}
+        text_ids, gram_ids = [], []
+        for text_id, text in enumerate(texts):
+            for gram in char_ngrams(text, n):
+                text_ids.append(text_id)
+                gram_ids.append(self.vocabulary.setdefault(gram, len(self.vocabulary)))
+
+        text_ids = np.array(text_ids, dtype=np.int64)
+        gram_ids = np.array(gram_ids, dtype=np.int64)
+        order = np.argsort(gram_ids, kind="stable")
+        self.column_texts = text_ids[order]
+        self.column_offsets = np.concatenate(([0], np.cumsum(np.bincount(gram_ids, minlength=len(self.vocabulary)))))
+        self.text_sizes = np.bincount(text_ids, minlength=self.size)
+
+    def similarity(self, query: str) -> np.ndarray:
+        """Dice similarity of `query` to every text."""
+        grams = char_ngrams(query, self.n)
+        columns = [self.vocabulary[gram] for gram in grams if gram in self.vocabulary]
+        if columns:
+            hits = np.concatenate([
+                self.column_texts[self.column_offsets[c]:self.column_offsets[c + 1]] for c in columns
+            ])
+            shared = np.bincount(hits, minlength=self.size)
+        else:
+            shared = np.zeros(self.size, dtype=np.int64)
+        return 2 * shared / np.maximum(len(grams) + self.text_sizes, 1)
+
+    def similarity_matrix(self, queries: List[str]) -> np.ndarray:
+        """Dice similarity of each query (rows) to every text (columns)."""
+        matrix = np.zeros((len(queries), self.size))
+        for i, query in enumerate(queries):
+            matrix[i] = self.similarity(query)
+        return matrix
+
+
+class SequenceSimilarityModel:
+    """SequenceMatcher ratio of query strings against a fixed list of texts.
+
+    The original /api/match rule, one SequenceMatcher call per distinct
+    text. Slower than NGramSimilarityModel; kept so rankings can be
+    reproduced exactly.
+    """
+
+    def __init__(self, texts: List[str]):
+        self.texts = list(texts)
+        self.size = len(self.texts)
+
+    def similarity(self, query: str) -> np.ndarray:
+        return np.array([sequence_similarity(query, text) for text in self.texts], dtype=float)
+
+    def similarity_matrix(self, queries: List[str]) -> np.ndarray:
+        matrix = np.zeros((len(queries), self.size))
+        for i, query in enumerate(queries):
+            matrix[i] = self.similarity(query)
+        return matrix
+
+
+# VC_SIMILARITY_MODEL values
+SIMILARITY_MODELS = {"ngram": NGramSimilarityModel, "sequence": SequenceSimilarityModel}
+SIMILARITY_FUNCTIONS = {"ngram": dice_similarity, "sequence": sequence_similarity}
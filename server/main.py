@@ -4,8 +4,8 @@ import uvicorn
 from typing import Dict, Any
 import os
 import json
-import requests
 import random
+from server.llm.http_pool import get_pool
 
 app = FastAPI()
 
@@ -182,10 +182,10 @@ Respond ONLY with the improved section text, nothing else."""
             "messages": [{"role": "user", "content": prompt}]
         }
         
-        response = requests.post(
+        response = get_pool("anthropic").post(
             "https://api.anthropic.com/v1/messages",
             headers=headers,
-            data=json.dumps(payload)
+            content=json.dumps(payload)
         )
         
         if response.status_code == 200:
@@ -1,7 +1,15 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Dict, Any
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Dict, Any, Optional
 from server.llm.agent import PitchAgent
+from server.llm.circuit_breaker import breaker_stats
+from server.llm.clarifier import flatten_questions
+from server.llm.http_pool import pool_stats
+from server.llm.llm_router import hedge_stats, llm_cache, llm_flights, provider_readiness, warm_up_providers
+from server.llm.rate_limiter import limiter_stats
+from server.llm.match_pagination import InvalidCursorError
 from server.llm.simple_anthropic import SimpleAnthropicClient
 from server.routes.mock_data import (
     MOCK_QUESTIONS, 
@@ -9,10 +17,20 @@ from server.routes.mock_data import (
     MOCK_EMAIL_TEMPLATE,
     MOCK_PITCH_STATUS
 )
+import asyncio
+import json
 import os
 import random
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Health-check the LLM providers in the background so a slow provider
+    # delays neither startup nor the first request
+    warm_up = asyncio.create_task(warm_up_providers())
+    yield
+    warm_up.cancel()
+
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -33,6 +51,64 @@ anthropic_client = SimpleAnthropicClient()
 from server.routes import match_api
 app.include_router(match_api.router)
 
+def _improve_section_prompt(section_name: str, user_input: str) -> str:
+    prompt = f"""You are a world-class startup pitch writer. You're helping improve a startup pitch section with new information.
+
+Section name: {section_name}
+
+User feedback/information to incorporate: 
+{user_input}
+
+Rewrite the {section_name} section for the pitch, focusing on:
+1. Incorporating all the specific details from the user input
+2. Making the content compelling and persuasive for investors
+3. Adding relevant industry-specific language and credibility
+4. Keeping it concise (around 3-5 sentences)
+
+Respond ONLY with the improved section text, nothing else."""
+    return prompt
+
+IMPROVE_SECTION_SYSTEM_PROMPT = "You are an expert startup pitch writer helping to create compelling pitch content for investors."
+
+def _fallback_improved_section(section_name: str, user_input: str) -> Dict[str, Any]:
+    # Provide a fallback improved text
+    section_key = section_name.lower().replace(" ", "_")
+    return {
+        section_key: {
+            "text": f"Our {section_name} addresses critical needs in the market. {user_input} This provides significant advantages for our customers, resulting in measurable improvements in efficiency, accuracy, and cost-effectiveness. Our approach has been validated through extensive testing and early customer adoption.",
+            "original": user_input
+        }
+    }
+
+def _sse(event: str, data: Any) -> str:
+    """One server-sent event with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+# Stop proxies from buffering the event stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+@app.get("/api/ready")
+async def ready():
+    state = provider_readiness()
+    if not state["ready"]:
+        return JSONResponse(status_code=503, content=state)
+    return state
+
+@app.get("/api/llm/metrics")
+async def llm_metrics():
+    return {
+        "rate_limits": limiter_stats(),
+        "coalescing": llm_flights.stats(),
+        "hedging": hedge_stats.stats(),
+        "breakers": breaker_stats(),
+        "cache": llm_cache.stats(),
+        "connections": pool_stats(),
+    }
+
+@app.get("/api/llm/breakers")
+async def llm_breakers():
+    return breaker_stats()
+
 @app.post("/api/generate-pitch")
 async def generate_pitch(startup_info: Dict[str, Any]):
     try:
@@ -42,6 +118,21 @@ async def generate_pitch(startup_info: Dict[str, Any]):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/generate-pitch/stream")
+async def generate_pitch_stream(startup_info: Dict[str, Any]):
+    """generate-pitch as server-sent events: one "section" event per pitch
+    section as soon as it is generated, then "done" with the whole pitch"""
+    async def events():
+        try:
+            await agent.set_startup_info("test_startup", startup_info)
+            async for section, data in agent.stream_initial_pitch():
+                yield _sse("section", {"name": section, "data": data})
+            yield _sse("done", {"status": "success", "data": agent.pitch_data})
+        except Exception as e:
+            yield _sse("error", {"detail": str(e)})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
 @app.post("/api/improve-section")
 async def improve_section(data: Dict[str, Any]):
     try:
@@ -51,25 +142,10 @@ async def improve_section(data: Dict[str, Any]):
             raise HTTPException(status_code=400, detail="Missing section_name or user_input")
         
         # Create a prompt for Anthropic to improve the section
-        prompt = f"""You are a world-class startup pitch writer. You're helping improve a startup pitch section with new information.
-
-Section name: {section_name}
-
-User feedback/information to incorporate: 
-{user_input}
-
-Rewrite the {section_name} section for the pitch, focusing on:
-1. Incorporating all the specific details from the user input
-2. Making the content compelling and persuasive for investors
-3. Adding relevant industry-specific language and credibility
-4. Keeping it concise (around 3-5 sentences)
-
-Respond ONLY with the improved section text, nothing else."""
-
-        system_prompt = "You are an expert startup pitch writer helping to create compelling pitch content for investors."
+        prompt = _improve_section_prompt(section_name, user_input)
 
         # Use our simple Anthropic client
-        improved_text = anthropic_client.complete(prompt, system_prompt)
+        improved_text = await anthropic_client.complete_async(prompt, IMPROVE_SECTION_SYSTEM_PROMPT)
         
         # Create response with the improved section
         section_key = section_name.lower().replace(" ", "_")
@@ -83,33 +159,53 @@ Respond ONLY with the improved section text, nothing else."""
         return {"status": "success", "data": result}
     except Exception as e:
         print(f"Error in improve_section: {str(e)}")
-        # Provide a fallback improved text
-        section_key = section_name.lower().replace(" ", "_")
-        result = {
-            section_key: {
-                "text": f"Our {section_name} addresses critical needs in the market. {user_input} This provides significant advantages for our customers, resulting in measurable improvements in efficiency, accuracy, and cost-effectiveness. Our approach has been validated through extensive testing and early customer adoption.",
-                "original": user_input
-            }
-        }
-        return {"status": "success", "data": result}
+        return {"status": "success", "data": _fallback_improved_section(section_name, user_input)}
+
+@app.post("/api/improve-section/stream")
+async def improve_section_stream(data: Dict[str, Any]):
+    """improve-section as server-sent events: "delta" events with text as it
+    is generated, then "done" with the same payload improve-section returns"""
+    section_name = data.get("section_name")
+    user_input = data.get("user_input")
+    if not section_name or not user_input:
+        raise HTTPException(status_code=400, detail="Missing section_name or user_input")
+
+    async def events():
+        chunks = []
+        try:
+            async for chunk in anthropic_client.stream_async(_improve_section_prompt(section_name, user_input),
+                                                             IMPROVE_SECTION_SYSTEM_PROMPT):
+                chunks.append(chunk)
+                yield _sse("delta", {"text": chunk})
+            section_key = section_name.lower().replace(" ", "_")
+            result = {section_key: {"text": "".join(chunks), "original": user_input}}
+        except Exception as e:
+            print(f"Error in improve_section_stream: {str(e)}")
+            result = _fallback_improved_section(section_name, user_input)
+        yield _sse("done", {"status": "success", "data": result})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
 
 @app.get("/api/get-questions")
 async def get_questions():
     try:
         # Attempt to use the agent for questions
         questions = await agent.get_clarifying_questions()
-        return {"status": "success", "data": questions}
+        # The questions page lists plain strings
+        return {"status": "success", "data": flatten_questions(questions)}
     except Exception as e:
         print(f"Error in get_questions: {str(e)}")
         # Fall back to mock questions
         return {"status": "success", "data": MOCK_QUESTIONS}
 
 @app.get("/api/match-investors")
-async def match_investors():
+async def match_investors(limit: int = Query(5, ge=1, le=100), cursor: Optional[str] = None):
     try:
         # Attempt to use the agent for investor matching
-        matches = await agent.match_investors()
-        return {"status": "success", "data": matches}
+        page = await agent.match_investors_page(limit=limit, cursor=cursor)
+        return {"status": "success", "data": page["matches"], "next_cursor": page["next_cursor"]}
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"Error in match_investors: {str(e)}")
         # Fall back to mock investors
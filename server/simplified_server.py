@@ -4,8 +4,8 @@ import uvicorn
 from typing import Dict, Any
 import os
 import json
-import requests
 import random
+from server.llm.http_pool import get_pool
 
 app = FastAPI()
 
@@ -173,10 +173,10 @@ Make it compelling, specific, and focused on investors. Keep it to 3-5 sentences
                 "temperature": 0.7
             }
             
-            response = requests.post(
+            response = get_pool("openai").post(
                 "https://api.openai.com/v1/chat/completions",
                 headers=headers,
-                data=json.dumps(payload)
+                content=json.dumps(payload)
             )
             
             if response.status_code == 200:
@@ -205,10 +205,10 @@ Make it compelling, specific, and focused on investors. Keep it to 3-5 sentences
                 "messages": [{"role": "user", "content": prompt}]
             }
             
-            response = requests.post(
+            response = get_pool("anthropic").post(
                 "https://api.anthropic.com/v1/messages",
                 headers=headers,
-                data=json.dumps(payload)
+                content=json.dumps(payload)
             )
             
             if response.status_code == 200: